@@ -0,0 +1,40 @@
+"""Create products table
+
+Revision ID: 0001
+Revises:
+Create Date: 2026-10-16 09:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0001"
+down_revision = None
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "products",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("sku", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("description", sa.Text()),
+        sa.Column("price", sa.Float(), nullable=False),
+        sa.Column("weight", sa.Float()),
+        sa.Column("dimensions", sa.String()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("updated_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_products_id", "products", ["id"])
+    op.create_index("ix_products_sku", "products", ["sku"], unique=True)
+    op.create_index("ix_products_name", "products", ["name"])
+    op.create_index("ix_products_name_id", "products", ["name", "id"])
+
+
+def downgrade() -> None:
+    op.drop_table("products")
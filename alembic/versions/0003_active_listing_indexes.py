@@ -0,0 +1,44 @@
+"""Indexes for the is_active product listing
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-16 10:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0003"
+down_revision = "0002"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Build without blocking writes; CONCURRENTLY can't run inside a transaction
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_products_is_active_id",
+            "products",
+            ["is_active", "id"],
+            postgresql_concurrently=True,
+        )
+        op.create_index(
+            "ix_products_active_name_id",
+            "products",
+            ["name", "id"],
+            postgresql_where=sa.text("is_active"),
+            sqlite_where=sa.text("is_active = 1"),
+            postgresql_concurrently=True,
+        )
+        # Superseded by the partial index above; every listing filters on is_active
+        op.drop_index("ix_products_name_id", table_name="products", postgresql_concurrently=True)
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index("ix_products_name_id", "products", ["name", "id"], postgresql_concurrently=True)
+        op.drop_index("ix_products_active_name_id", table_name="products", postgresql_concurrently=True)
+        op.drop_index("ix_products_is_active_id", table_name="products", postgresql_concurrently=True)
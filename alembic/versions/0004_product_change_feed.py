@@ -0,0 +1,42 @@
+"""Change stamps for the product change feed
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-16 12:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0004"
+down_revision = "0003"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # A constant default fills existing rows without rewriting the table; they
+    # predate the feed and are all read by a client starting without a token.
+    # The application stamps every write from here on (app.changes).
+    op.add_column(
+        "products",
+        sa.Column("change_seq", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    with op.batch_alter_table("products") as batch_op:
+        batch_op.alter_column("change_seq", server_default=None)
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_products_change_seq_id",
+            "products",
+            ["change_seq", "id"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_products_change_seq_id", table_name="products", postgresql_concurrently=True)
+    op.drop_column("products", "change_seq")
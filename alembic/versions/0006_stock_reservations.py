@@ -0,0 +1,51 @@
+"""Stock reservations
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-16 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0006"
+down_revision = "0005"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    for table in ("inventory_levels", "inventory_totals"):
+        op.add_column(table, sa.Column("reserved", sa.Integer(), nullable=False, server_default="0"))
+    op.create_check_constraint("ck_inventory_levels_reserved", "inventory_levels", "reserved >= 0")
+
+    op.create_table(
+        "stock_reservations",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("reference", sa.String()),
+        sa.Column("status", sa.String(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+        sa.Column("released_at", sa.DateTime(timezone=True)),
+    )
+    op.create_index("ix_stock_reservations_id", "stock_reservations", ["id"])
+    op.create_index("ix_stock_reservations_reference", "stock_reservations", ["reference"])
+
+    op.create_table(
+        "stock_reservation_lines",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("reservation_id", sa.Integer(), sa.ForeignKey("stock_reservations.id"), nullable=False),
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), nullable=False),
+        sa.Column("warehouse_id", sa.Integer(), sa.ForeignKey("warehouses.id"), nullable=False),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+    )
+    op.create_index("ix_stock_reservation_lines_reservation_id", "stock_reservation_lines", ["reservation_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("stock_reservation_lines")
+    op.drop_table("stock_reservations")
+    op.drop_constraint("ck_inventory_levels_reserved", "inventory_levels", type_="check")
+    for table in ("inventory_totals", "inventory_levels"):
+        op.drop_column(table, "reserved")
@@ -0,0 +1,55 @@
+"""Stored demand forecasts
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-16 15:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0007"
+down_revision = "0006"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "demand_forecasts",
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), primary_key=True),
+        sa.Column("method", sa.String(), nullable=False),
+        sa.Column("start_date", sa.Date(), nullable=False),
+        sa.Column("daily", sa.LargeBinary(), nullable=False),
+        sa.Column("total", sa.Float(), nullable=False),
+        sa.Column("movement_watermark", sa.BigInteger(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+    op.create_table(
+        "forecast_runs",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("full", sa.Boolean(), nullable=False),
+        sa.Column("history_end", sa.Date(), nullable=False),
+        sa.Column("movement_watermark", sa.BigInteger(), nullable=False),
+        sa.Column("products", sa.Integer(), nullable=False),
+        sa.Column("started_at", sa.DateTime(timezone=True), nullable=False),
+        sa.Column("finished_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "ix_stock_movements_occurred_at",
+            "stock_movements",
+            ["occurred_at"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_stock_movements_occurred_at", table_name="stock_movements", postgresql_concurrently=True)
+    op.drop_table("forecast_runs")
+    op.drop_table("demand_forecasts")
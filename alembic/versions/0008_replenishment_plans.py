@@ -0,0 +1,37 @@
+"""Replenishment plans
+
+Revision ID: 0008
+Revises: 0007
+Create Date: 2026-10-16 16:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0008"
+down_revision = "0007"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "replenishment_plans",
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), primary_key=True),
+        sa.Column("warehouse_id", sa.Integer(), sa.ForeignKey("warehouses.id"), primary_key=True),
+        sa.Column("demand_rate", sa.Float(), nullable=False),
+        sa.Column("demand_std", sa.Float(), nullable=False),
+        sa.Column("lead_time_days", sa.Float(), nullable=False),
+        sa.Column("safety_stock", sa.Float(), nullable=False),
+        sa.Column("reorder_point", sa.Float(), nullable=False),
+        sa.Column("economic_order_quantity", sa.Float(), nullable=False),
+        sa.Column("available", sa.Integer(), nullable=False),
+        sa.Column("order_quantity", sa.Integer(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("replenishment_plans")
@@ -0,0 +1,61 @@
+"""Suppliers, lead-time statistics and sourcing allocations
+
+Revision ID: 0009
+Revises: 0008
+Create Date: 2026-10-16 17:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0009"
+down_revision = "0008"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "suppliers",
+        sa.Column("id", sa.Integer(), primary_key=True),
+        sa.Column("code", sa.String(), nullable=False),
+        sa.Column("name", sa.String(), nullable=False),
+        sa.Column("capacity", sa.Integer()),
+        sa.Column("is_active", sa.Boolean()),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_suppliers_id", "suppliers", ["id"])
+    op.create_index("ix_suppliers_code", "suppliers", ["code"], unique=True)
+
+    op.create_table(
+        "supplier_products",
+        sa.Column("supplier_id", sa.Integer(), sa.ForeignKey("suppliers.id"), primary_key=True),
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), primary_key=True),
+        sa.Column("unit_cost", sa.Float()),
+        sa.Column("capacity", sa.Integer()),
+        sa.Column("quoted_lead_time_days", sa.Float()),
+        sa.Column("lead_time_samples", sa.Integer(), nullable=False),
+        sa.Column("lead_time_mean", sa.Float(), nullable=False),
+        sa.Column("lead_time_m2", sa.Float(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(timezone=True), server_default=sa.func.now()),
+    )
+    op.create_index("ix_supplier_products_product_id", "supplier_products", ["product_id"])
+
+    op.create_table(
+        "sourcing_allocations",
+        sa.Column("product_id", sa.Integer(), sa.ForeignKey("products.id"), primary_key=True),
+        sa.Column("supplier_id", sa.Integer(), sa.ForeignKey("suppliers.id"), primary_key=True),
+        sa.Column("quantity", sa.Integer(), nullable=False),
+        sa.Column("unit_cost", sa.Float(), nullable=False),
+        sa.Column("lead_time_days", sa.Float(), nullable=False),
+        sa.Column("computed_at", sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index("ix_sourcing_allocations_supplier_id", "sourcing_allocations", ["supplier_id"])
+
+
+def downgrade() -> None:
+    op.drop_table("sourcing_allocations")
+    op.drop_table("supplier_products")
+    op.drop_table("suppliers")
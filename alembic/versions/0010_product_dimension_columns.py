@@ -0,0 +1,101 @@
+"""Numeric product dimension columns
+
+Revision ID: 0010
+Revises: 0009
+Create Date: 2026-10-16 18:00:00
+
+"""
+from alembic import op
+import orjson
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0010"
+down_revision = "0009"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+products = sa.table(
+    "products",
+    sa.column("id", sa.Integer),
+    sa.column("dimensions", sa.String),
+    sa.column("length", sa.Float),
+    sa.column("width", sa.Float),
+    sa.column("height", sa.Float),
+)
+
+
+def _parse(value):
+    """
+    Length, width and height of a dimensions string; None where missing or
+    unreadable. A copy of app.dimensions.parse_dimensions as of this
+    revision, frozen so later changes there don't change what this migration
+    wrote. It is the migrations' only parser: 0011 derives volume from the
+    columns filled here.
+    """
+    try:
+        parsed = orjson.loads(value) if value else None
+    except orjson.JSONDecodeError:
+        parsed = None
+    if not isinstance(parsed, dict):
+        parsed = {}
+    numbers = [parsed.get(name) for name in ("length", "width", "height")]
+    return [float(n) if isinstance(n, (int, float)) and not isinstance(n, bool) else None for n in numbers]
+
+
+def upgrade() -> None:
+    # Nullable without a default, so adding them doesn't rewrite the table.
+    op.add_column("products", sa.Column("length", sa.Float()))
+    op.add_column("products", sa.Column("width", sa.Float()))
+    op.add_column("products", sa.Column("height", sa.Float()))
+
+    # Fill them for existing rows, so shipping quotes use their dimensions
+    # right away, in short batches that each commit on their own, as 0011
+    # does. A row whose dimensions change between reading and updating a
+    # batch is left alone; the application has written its numbers.
+    connection = op.get_bind()
+    with op.get_context().autocommit_block():
+        last_id = 0
+        while True:
+            rows = connection.execute(
+                sa.select(products.c.id, products.c.dimensions)
+                .where(products.c.id > last_id, products.c.dimensions.is_not(None), products.c.length.is_(None))
+                .order_by(products.c.id)
+                .limit(BATCH_SIZE)
+            ).all()
+            if not rows:
+                break
+            last_id = rows[-1].id
+            values = [(row.id, row.dimensions, *_parse(row.dimensions)) for row in rows]
+            values = [value for value in values if any(number is not None for number in value[2:])]
+            if not values:
+                continue
+            if connection.dialect.name == "postgresql":
+                # One UPDATE ... FROM (VALUES ...) per batch
+                batch = sa.values(
+                    sa.column("id", sa.Integer), sa.column("dimensions", sa.String),
+                    sa.column("length", sa.Float), sa.column("width", sa.Float), sa.column("height", sa.Float),
+                    name="batch",
+                ).data(values)
+                connection.execute(
+                    products.update()
+                    .where(products.c.id == batch.c.id, products.c.dimensions == batch.c.dimensions)
+                    # An all-NULL VALUES column would otherwise be typed text
+                    .values({name: sa.cast(batch.c[name], sa.Float) for name in ("length", "width", "height")})
+                )
+            else:
+                connection.execute(
+                    products.update()
+                    .where(products.c.id == sa.bindparam("b_id"), products.c.dimensions == sa.bindparam("b_dimensions"))
+                    .values(length=sa.bindparam("b_length"), width=sa.bindparam("b_width"), height=sa.bindparam("b_height")),
+                    [dict(zip(("b_id", "b_dimensions", "b_length", "b_width", "b_height"), value)) for value in values],
+                )
+
+
+def downgrade() -> None:
+    op.drop_column("products", "height")
+    op.drop_column("products", "width")
+    op.drop_column("products", "length")
@@ -0,0 +1,80 @@
+"""Change stamps for stock movements
+
+Revision ID: 0012
+Revises: 0011
+Create Date: 2026-10-17 14:00:00
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "0012"
+down_revision = "0011"
+branch_labels = None
+depends_on = None
+
+BATCH_SIZE = 5000
+
+stock_movements = sa.table(
+    "stock_movements",
+    sa.column("id", sa.BigInteger),
+    sa.column("change_seq", sa.BigInteger),
+)
+demand_forecasts = sa.table("demand_forecasts", sa.column("movement_watermark", sa.BigInteger))
+forecast_runs = sa.table(
+    "forecast_runs",
+    sa.column("id", sa.Integer),
+    sa.column("movement_watermark", sa.BigInteger),
+)
+
+
+def upgrade() -> None:
+    # Forecast watermarks were movement ids and become change horizons
+    # (app.changes). Existing movements get stamp 0, below every horizon,
+    # except those after the latest refresh's id watermark, which get 1 so
+    # the next refresh still reads them. Every stored watermark becomes 1.
+    op.add_column(
+        "stock_movements",
+        sa.Column("change_seq", sa.BigInteger(), nullable=False, server_default="0"),
+    )
+    with op.batch_alter_table("stock_movements") as batch_op:
+        batch_op.alter_column("change_seq", server_default=None)
+
+    connection = op.get_bind()
+    watermark = connection.execute(
+        sa.select(forecast_runs.c.movement_watermark).order_by(forecast_runs.c.id.desc()).limit(1)
+    ).scalar()
+    op.execute(demand_forecasts.update().values(movement_watermark=1))
+    op.execute(forecast_runs.update().values(movement_watermark=1))
+
+    with op.get_context().autocommit_block():
+        # Without a refresh there is nothing to be stale against. Otherwise
+        # stamp the tail in short id ranges that each commit on their own,
+        # as 0010 does, so ingestion isn't held up behind a ledger-wide lock.
+        if watermark is not None:
+            last_id = connection.execute(sa.select(sa.func.max(stock_movements.c.id))).scalar() or 0
+            for start in range(watermark, last_id, BATCH_SIZE):
+                connection.execute(
+                    stock_movements.update()
+                    .where(
+                        stock_movements.c.id > start,
+                        stock_movements.c.id <= start + BATCH_SIZE,
+                        stock_movements.c.change_seq == 0,
+                    )
+                    .values(change_seq=1)
+                )
+
+        op.create_index(
+            "ix_stock_movements_change_seq",
+            "stock_movements",
+            ["change_seq"],
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.drop_index("ix_stock_movements_change_seq", table_name="stock_movements", postgresql_concurrently=True)
+    op.drop_column("stock_movements", "change_seq")
@@ -0,0 +1,49 @@
+# app/api/bodies.py
+from typing import Any, List
+
+import orjson
+from fastapi import HTTPException, Request, status
+
+NDJSON_MEDIA_TYPES = {"application/x-ndjson", "application/ndjson"}
+
+
+async def read_json_items(request: Request, max_items: int, noun: str = "items") -> List[Any]:
+    """
+    Read a bulk request body: a JSON array, or NDJSON with one item per line
+    (`Content-Type: application/x-ndjson`).
+
+    An NDJSON line that isn't valid JSON comes back as its exception, so the
+    endpoint can report that row without rejecting the rest.
+    """
+    body = await request.body()
+    content_type = request.headers.get("content-type", "").split(";")[0].strip()
+    
+    if content_type in NDJSON_MEDIA_TYPES:
+        items: List[Any] = []
+        for line in body.splitlines():
+            if not line.strip():
+                continue
+            try:
+                items.append(orjson.loads(line))
+            except ValueError as exc:
+                items.append(exc)
+    else:
+        try:
+            items = orjson.loads(body)
+        except ValueError as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Invalid JSON body: {exc}"
+            )
+        if not isinstance(items, list):
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Expected a JSON array of {noun}"
+            )
+    
+    if len(items) > max_items:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {max_items} {noun} per request"
+        )
+    return items
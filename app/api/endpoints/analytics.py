@@ -0,0 +1,176 @@
+# app/api/endpoints/analytics.py
+from datetime import date
+from typing import List, Optional
+import numpy as np
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from sqlalchemy import exists, func, or_, select, tuple_
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import get_db
+from app.models.forecast import DemandForecast, ForecastRun
+from app.models.inventory import StockMovement
+from app.models.product import Product
+from app.models.replenishment import ReplenishmentPlan
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.schemas import analytics as analytics_schemas
+
+router = APIRouter()
+
+def forecasts_statement(product_ids: List[int]):
+    """Stored forecasts of `product_ids`, each with whether it is stale."""
+    newer_demand = exists().where(
+        StockMovement.product_id == DemandForecast.product_id,
+        StockMovement.change_seq >= DemandForecast.movement_watermark,
+        StockMovement.movement_type == "shipment",
+    )
+    stale = or_(DemandForecast.start_date < date.today(), newer_demand)
+    return (
+        select(DemandForecast, stale.label("stale"))
+        .where(DemandForecast.product_id.in_(product_ids))
+        .order_by(DemandForecast.product_id)
+    )
+
+def forecast_payload(forecast: DemandForecast, stale: bool) -> analytics_schemas.ProductForecast:
+    return analytics_schemas.ProductForecast(
+        product_id=forecast.product_id,
+        method=forecast.method,
+        start_date=forecast.start_date,
+        horizon_days=forecast.horizon_days,
+        daily=np.round(forecast.values.astype(np.float64), 3).tolist(),
+        total=round(forecast.total, 3),
+        computed_at=forecast.computed_at,
+        stale=bool(stale),
+    )
+
+@router.get("/forecasts", response_model=List[analytics_schemas.ProductForecast])
+def get_forecasts(
+    product_id: List[int] = Query(...),
+    db: Session = Depends(get_db)
+):
+    """
+    Get the stored demand forecasts of several products.
+
+    - **product_id**: Repeat for each product; those without a forecast are left out
+    """
+    if len(product_id) > settings.LOOKUP_MAX_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.LOOKUP_MAX_KEYS} products per request"
+        )
+    rows = db.execute(forecasts_statement(product_id)).all()
+    return [forecast_payload(forecast, stale) for forecast, stale in rows]
+
+@router.get("/forecasts/{product_id}", response_model=analytics_schemas.ProductForecast)
+def get_forecast(
+    product_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get the stored daily demand forecast of a product.
+
+    Forecasts are precomputed by the refresh job, never on request. `stale`
+    is set when shipments were recorded after the forecast was computed, or
+    it hasn't been rolled forward to today yet.
+
+    - **product_id**: ID of the product
+    """
+    row = db.execute(forecasts_statement([product_id])).first()
+    if row is None:
+        if db.get(Product, product_id) is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Product not found"
+            )
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No forecast for this product"
+        )
+    return forecast_payload(*row)
+
+@router.get("/forecasts/runs/latest", response_model=analytics_schemas.ForecastRun)
+def get_latest_forecast_run(db: Session = Depends(get_db)):
+    """
+    Get the latest forecast refresh.
+
+    Forecasts are refreshed by the scheduled `scripts/refresh_forecasts.py`
+    job, never by the API.
+    """
+    run = db.execute(select(ForecastRun).order_by(ForecastRun.id.desc()).limit(1)).scalar_one_or_none()
+    if run is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No forecast refresh has run yet"
+        )
+    return run
+
+@router.get("/replenishment", response_model=analytics_schemas.ReplenishmentPage)
+def get_replenishment_plans(
+    product_id: Optional[int] = None,
+    warehouse_id: Optional[int] = None,
+    reorder_only: bool = False,
+    limit: int = Query(100, gt=0, le=1000),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """
+    List stored replenishment plans in (product, warehouse) order.
+
+    - **product_id**, **warehouse_id**: Only plans of this product or warehouse
+    - **reorder_only**: Only pairs at or below their reorder point
+    - **cursor**: `next_cursor` of the previous page
+    """
+    stmt = select(ReplenishmentPlan)
+    if product_id is not None:
+        stmt = stmt.where(ReplenishmentPlan.product_id == product_id)
+    if warehouse_id is not None:
+        stmt = stmt.where(ReplenishmentPlan.warehouse_id == warehouse_id)
+    if reorder_only:
+        stmt = stmt.where(ReplenishmentPlan.order_quantity > 0)
+    if cursor:
+        try:
+            position = decode_cursor(cursor, "replenishment")
+        except InvalidCursor as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+        if [type(value) for value in position] != [int, int]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Malformed cursor"
+            )
+        stmt = stmt.where(tuple_(ReplenishmentPlan.product_id, ReplenishmentPlan.warehouse_id) > tuple_(*position))
+    plans = db.execute(
+        stmt.order_by(ReplenishmentPlan.product_id, ReplenishmentPlan.warehouse_id).limit(limit + 1)
+    ).scalars().all()
+
+    next_cursor = None
+    if len(plans) > limit:
+        plans = plans[:limit]
+        next_cursor = encode_cursor("replenishment", [plans[-1].product_id, plans[-1].warehouse_id])
+    return analytics_schemas.ReplenishmentPage(
+        items=[analytics_schemas.ReplenishmentPlan.from_orm(plan) for plan in plans],
+        next_cursor=next_cursor,
+    )
+
+@router.get("/replenishment/runs/latest", response_model=analytics_schemas.ReplenishmentRun)
+def get_latest_replenishment_run(db: Session = Depends(get_db)):
+    """
+    Summarize the stored replenishment plans.
+
+    Plans are recomputed by the scheduled `scripts/refresh_replenishment.py`
+    job, after the forecasts, never by the API.
+    """
+    plans, reorders, computed_at = db.execute(
+        select(
+            func.count(),
+            func.count().filter(ReplenishmentPlan.order_quantity > 0),
+            func.max(ReplenishmentPlan.computed_at),
+        )
+    ).one()
+    if not plans:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No replenishment plans yet"
+        )
+    return analytics_schemas.ReplenishmentRun(plans=plans, reorders=reorders, computed_at=computed_at)
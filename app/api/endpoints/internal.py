@@ -0,0 +1,39 @@
+# app/api/endpoints/internal.py
+import secrets
+from typing import Any, Dict, Optional
+from fastapi import APIRouter, Depends, Header, HTTPException, status
+from app import database
+from app.cache import product_cache
+from app.config import settings
+
+def require_internal_token(x_internal_token: Optional[str] = Header(None)):
+    """Only serve operators holding INTERNAL_API_TOKEN; without one configured, the endpoints don't exist."""
+    if not settings.INTERNAL_API_TOKEN:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Not Found"
+        )
+    if x_internal_token is None or not secrets.compare_digest(x_internal_token, settings.INTERNAL_API_TOKEN):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Invalid internal token"
+        )
+
+router = APIRouter(dependencies=[Depends(require_internal_token)])
+
+@router.get("/cache")
+def get_cache_stats() -> Dict[str, Any]:
+    """
+    Hit/miss counters of the product cache for this worker process.
+    """
+    return product_cache.stats()
+
+@router.get("/pool")
+def get_pool_stats() -> Dict[str, Any]:
+    """
+    Connection pool occupancy and checkout wait times for this worker process.
+    """
+    stats = {"sync": database.pool_stats(database.engine.pool)}
+    if database.async_engine is not None:
+        stats["async"] = database.pool_stats(database.async_engine.pool)
+    return stats
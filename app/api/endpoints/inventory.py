@@ -0,0 +1,171 @@
+# app/api/endpoints/inventory.py
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, Request, status
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from app.api.bodies import read_json_items
+from app.cache import product_cache
+from app.config import settings
+from app.database import get_db
+from app.models import inventory as inventory_models
+from app.models import product as product_models
+from app.schemas import inventory as inventory_schemas
+from app.services.inventory import record_movements, release_reservation, reserve_stock
+
+router = APIRouter()
+
+@router.post("/warehouses", response_model=inventory_schemas.Warehouse, status_code=status.HTTP_201_CREATED)
+def create_warehouse(
+    warehouse: inventory_schemas.WarehouseCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create a new warehouse.
+
+    - **code**: Unique warehouse code, used by scanners to address it
+    - **name**: Warehouse name
+    - **is_active**: Whether the warehouse is active
+    """
+    existing = db.execute(
+        select(inventory_models.Warehouse.id).where(inventory_models.Warehouse.code == warehouse.code)
+    ).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Warehouse with code {warehouse.code} already exists"
+        )
+    db_warehouse = inventory_models.Warehouse(**warehouse.dict())
+    db.add(db_warehouse)
+    db.commit()
+    db.refresh(db_warehouse)
+    return db_warehouse
+
+@router.get("/warehouses", response_model=List[inventory_schemas.Warehouse])
+def get_warehouses(db: Session = Depends(get_db)):
+    """
+    List all warehouses.
+    """
+    return db.execute(
+        select(inventory_models.Warehouse).order_by(inventory_models.Warehouse.id)
+    ).scalars().all()
+
+@router.post("/movements", response_model=inventory_schemas.StockMovementBatchResult)
+async def record_stock_movements(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Record a batch of stock movements.
+
+    The body is a JSON array of movements, or NDJSON with one movement per
+    line (`Content-Type: application/x-ndjson`). Each movement names a
+    product (`product_id` or `sku`), a warehouse (`warehouse_id` or
+    `warehouse_code`), a signed `quantity` and a `movement_type`. Valid
+    movements are committed together and update on-hand stock; invalid ones
+    are reported in `errors` without failing the rest.
+    """
+    raw_items = await read_json_items(request, settings.INVENTORY_MAX_MOVEMENTS, "movements")
+    return await run_in_threadpool(record_movements, db, raw_items)
+
+@router.get("/products/{product_id}", response_model=inventory_schemas.ProductInventory)
+def get_product_inventory(
+    product_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get on-hand stock of a product, in total and per warehouse.
+
+    - **product_id**: ID of the product
+    """
+    db_product = db.get(product_models.Product, product_id)
+    if db_product is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+
+    Level = inventory_models.InventoryLevel
+    Warehouse = inventory_models.Warehouse
+    levels = db.execute(
+        select(Level.warehouse_id, Warehouse.code, Level.on_hand, Level.reserved, Level.updated_at)
+        .join(Warehouse, Warehouse.id == Level.warehouse_id)
+        .where(Level.product_id == product_id)
+        .order_by(Level.warehouse_id)
+    ).all()
+    return inventory_schemas.ProductInventory(
+        product_id=product_id,
+        total_inventory=db_product.total_inventory,
+        available_inventory=db_product.available_inventory,
+        stock_status=db_product.stock_status,
+        levels=[
+            inventory_schemas.InventoryLevel(
+                warehouse_id=warehouse_id, warehouse_code=code, on_hand=on_hand,
+                reserved=reserved, updated_at=updated_at,
+            )
+            for warehouse_id, code, on_hand, reserved, updated_at in levels
+        ],
+    )
+
+@router.post("/reservations", response_model=inventory_schemas.ReservationBatchResult)
+def create_reservations(
+    reservations: List[inventory_schemas.ReservationCreate],
+    db: Session = Depends(get_db)
+):
+    """
+    Hold stock for a batch of reservations, such as the orders in a checkout wave.
+
+    Each reservation lists products (`product_id` or `sku`) and quantities,
+    optionally pinned to a warehouse. A reservation is either held in full
+    or rejected with its `shortages`; other reservations in the batch are
+    unaffected. Held stock stays on hand but is no longer available.
+    """
+    if len(reservations) > settings.INVENTORY_MAX_RESERVATIONS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.INVENTORY_MAX_RESERVATIONS} reservations per request"
+        )
+    return reserve_stock(db, reservations)
+
+@router.get("/reservations/{reservation_id}", response_model=inventory_schemas.Reservation)
+def get_reservation(
+    reservation_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Get a reservation and the stock it holds.
+    """
+    db_reservation = db.get(inventory_models.StockReservation, reservation_id)
+    if db_reservation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation not found"
+        )
+    return db_reservation
+
+@router.delete("/reservations/{reservation_id}", response_model=inventory_schemas.Reservation)
+def delete_reservation(
+    reservation_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Release a reservation, making its stock available again.
+    """
+    # Lock the reservation so two concurrent releases can't both return its stock
+    db_reservation = db.get(inventory_models.StockReservation, reservation_id, with_for_update=True)
+    if db_reservation is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Reservation not found"
+        )
+    if db_reservation.status != "held":
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Reservation is already {db_reservation.status}"
+        )
+    
+    release_reservation(db, db_reservation)
+    db.commit()
+    db.refresh(db_reservation)
+    product_cache.invalidate_products({line.product_id for line in db_reservation.lines}, lists=False)
+    return db_reservation
@@ -1,20 +1,101 @@
 # app/api/endpoints/products.py
-from typing import List, Optional
-from fastapi import APIRouter, Depends, HTTPException, Query, status
-from sqlalchemy.orm import Session
-from app.database import get_db
+import csv
+import io
+import orjson
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import Response, StreamingResponse
+from pydantic import ValidationError
+from sqlalchemy import Boolean, Result, Select, func, literal_column, or_, select, text, tuple_
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session, joinedload, selectinload
+from app.api.bodies import read_json_items
+from app.cache import product_cache
+from app.changes import change_horizon, next_change_seq
+from app.conditional import check_if_match, conditional_response, detail_validators, version_etag
+from app.config import settings
+from app.database import dialect_insert, get_db
+from app.dimensions import parse_dimensions
+from app.pagination import InvalidCursor, decode_cursor, encode_cursor
+from app.search import contains_pattern, name_similarity
 from app.models import product as product_models
+from app.models.supplier import SupplierProduct
 from app.schemas import product as product_schemas
 
 router = APIRouter()
 
-@router.get("/", response_model=List[product_schemas.Product])
+# Relationships ProductDetail reads, loaded with the product so serializing it never lazy loads
+DETAIL_OPTIONS = (
+    joinedload(product_models.Product.inventory_total),
+    selectinload(product_models.Product.suppliers).joinedload(SupplierProduct.supplier),
+)
+
+# Fields a listing can be projected to with `fields=`
+LIST_FIELDS = tuple(product_schemas.Product.__fields__)
+
+class ProductListParams:
+    """Query parameters of the product listing, shared with the async endpoints."""
+
+    def __init__(
+        self,
+        skip: int = 0,
+        limit: int = 100,
+        name: Optional[str] = None,
+        is_active: bool = True,
+        cursor: Optional[str] = None,
+        order_by: str = Query("id", regex="^(id|name)$"),
+        search: Optional[str] = None,
+        include_total: bool = False,
+        fields: Optional[str] = None,
+        min_volume: Optional[float] = None,
+        max_volume: Optional[float] = None,
+        min_weight: Optional[float] = None,
+        max_weight: Optional[float] = None,
+    ):
+        self.skip = skip
+        self.limit = limit
+        self.name = name
+        self.is_active = is_active
+        self.cursor = cursor
+        self.order_by = order_by
+        self.search = search
+        self.include_total = include_total
+        self.fields: Optional[List[str]] = None
+        if fields:
+            self.fields = list(dict.fromkeys(field.strip() for field in fields.split(",") if field.strip()))
+            unknown = [field for field in self.fields if field not in LIST_FIELDS]
+            if unknown or not self.fields:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"Unknown fields {unknown}; choose from {list(LIST_FIELDS)}"
+                )
+        self.volume = (min_volume, max_volume)
+        self.weight = (min_weight, max_weight)
+        for name, (low, high) in (("volume", self.volume), ("weight", self.weight)):
+            if low is not None and high is not None and low > high:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail=f"min_{name} is greater than max_{name}"
+                )
+
+    @property
+    def filtered(self) -> bool:
+        """Whether the listing has filters beyond is_active; such listings aren't cached and get exact totals."""
+        return bool(self.name or self.search) or any(
+            bound is not None for bound in self.volume + self.weight
+        )
+
+    @property
+    def envelope(self) -> bool:
+        """Whether the response is a page envelope rather than a plain list."""
+        return self.cursor is not None or self.include_total
+
+@router.get("/", response_model=Union[List[product_schemas.Product], product_schemas.ProductPage])
 def get_products(
+    request: Request,
     db: Session = Depends(get_db),
-    skip: int = 0,
-    limit: int = 100,
-    name: Optional[str] = None,
-    is_active: bool = True
+    params: ProductListParams = Depends(),
 ):
     """
     Retrieve products with optional filtering.
@@ -23,15 +104,197 @@ def get_products(
     - **limit**: Maximum number of products to return
     - **name**: Optional filter by product name (partial match)
     - **is_active**: Filter by active status
+    - **cursor**: Keyset pagination cursor. Pass an empty value to fetch the first
+      page, then the `next_cursor` of the previous page. When set, `skip` is
+      ignored and the response is a page envelope instead of a plain list.
+    - **order_by**: Keyset ordering for cursor pagination, `id` or `name`
+    - **search**: Search term matched anywhere in the product name; results are
+      ranked by similarity to the term. Can't be combined with `cursor`.
+    - **include_total**: Return a page envelope with the total number of matching
+      products. Unfiltered totals may be planner estimates (`total_is_estimate`).
+    - **fields**: Comma-separated fields to return, e.g. `id,sku,name,price`.
+      Only those columns are read from the database.
+    - **min_volume**, **max_volume**: Inclusive range of length x width x height.
+      Products without dimensions are excluded when either is set.
+    - **min_weight**, **max_weight**: Inclusive range of weight. Products without
+      a weight are excluded when either is set.
+
+    Listings without a name filter, search term or range are served from the product cache.
+    Responses carry an ETag; send it back in `If-None-Match` to get a 304 when
+    the page hasn't changed.
     """
-    query = db.query(product_models.Product)
+    cache_params = list_cache_params(params)
+    if cache_params is not None:
+        cached = product_cache.get_list(cache_params)
+        if cached is not None:
+            return conditional_response(request, cached)
     
-    if name:
-        query = query.filter(product_models.Product.name.ilike(f"%{name}%"))
-    if is_active is not None:
-        query = query.filter(product_models.Product.is_active == is_active)
+    rows = list_rows(db.execute(products_statement(params)), params)
+    total = products_total(db, params) if params.include_total else None
+    payload = products_payload(rows, params, total)
+    
+    if cache_params is not None:
+        product_cache.set_list(cache_params, payload)
+    return conditional_response(request, payload)
+
+# Listing helpers, shared with the async endpoints in products_async
+
+def list_cache_params(params: ProductListParams) -> Optional[dict]:
+    """Cache key parameters for a listing, or None if it should not be cached."""
+    if params.filtered:
+        return None
+    return {
+        "skip": params.skip, "limit": params.limit, "is_active": params.is_active,
+        "cursor": params.cursor, "order_by": params.order_by,
+        "include_total": params.include_total, "fields": params.fields,
+    }
+
+def _keyset_columns(order_by: str) -> list:
+    Product = product_models.Product
+    return [Product.id] if order_by == "id" else [Product.name, Product.id]
+
+def _filtered(stmt: Select, params: ProductListParams) -> Select:
+    Product = product_models.Product
+    if params.name:
+        stmt = stmt.where(Product.name.ilike(contains_pattern(params.name), escape="\\"))
+    if params.search:
+        stmt = stmt.where(Product.name.ilike(contains_pattern(params.search), escape="\\"))
+    if params.is_active is not None:
+        stmt = stmt.where(Product.is_active == params.is_active)
+    for column, (low, high) in ((Product.volume, params.volume), (Product.weight, params.weight)):
+        if low is not None:
+            stmt = stmt.where(column >= low)
+        if high is not None:
+            stmt = stmt.where(column <= high)
+    return stmt
+
+def _selection(params: ProductListParams) -> list:
+    """The entity to select, or just the projected columns plus any keyset columns."""
+    if params.fields is None:
+        return [product_models.Product]
+    columns = [getattr(product_models.Product, field) for field in params.fields]
+    if params.cursor is not None:
+        columns += [key for key in _keyset_columns(params.order_by) if key.key not in params.fields]
+    return columns
+
+def list_rows(result: Result, params: ProductListParams) -> list:
+    """ORM instances for full listings, plain rows for projected ones."""
+    return result.all() if params.fields else result.scalars().all()
+
+def products_statement(params: ProductListParams) -> Select:
+    """
+    Build the listing SELECT.
+
+    In cursor mode the query seeks past the cursor position instead of
+    scanning skipped rows with OFFSET, and fetches one extra row to learn
+    whether another page exists. In search mode rows are ranked by name
+    similarity; the substring match is served by the trigram index.
+    """
+    Product = product_models.Product
+    stmt = _filtered(select(*_selection(params)), params)
+    
+    if params.search:
+        if params.cursor is not None:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="search can't be combined with cursor pagination"
+            )
+        return stmt.order_by(
+            name_similarity(Product.name, params.search).desc(), Product.id
+        ).offset(params.skip).limit(params.limit)
+    
+    if params.cursor is None:
+        # A stable order keeps OFFSET pages consistent and lets the planner walk an index
+        return stmt.order_by(Product.id).offset(params.skip).limit(params.limit)
+    
+    keys = _keyset_columns(params.order_by)
+    if params.cursor:
+        try:
+            position = decode_cursor(params.cursor, params.order_by)
+        except InvalidCursor as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+        expected = [int] if params.order_by == "id" else [str, int]
+        if [type(value) for value in position] != expected:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Malformed cursor"
+            )
+        stmt = stmt.where(tuple_(*keys) > tuple_(*position))
+    return stmt.order_by(*keys).limit(params.limit + 1)
+
+def count_cache_params(params: ProductListParams) -> dict:
+    return {
+        "name": params.name, "search": params.search, "is_active": params.is_active,
+        "volume": params.volume, "weight": params.weight,
+    }
+
+def count_products(db: Session, params: ProductListParams) -> Tuple[int, bool]:
+    """
+    Count the products matching a listing's filters, as `(total, is_estimate)`.
+
+    Without name, search or range filters, PostgreSQL's planner estimate for the
+    is_active filter (pg_class.reltuples scaled by column statistics) is
+    used once the table is large enough for COUNT(*) to hurt. Filtered
+    listings always get an exact count.
+    """
+    Product = product_models.Product
+    stmt = _filtered(select(Product.id), params)
+    if not params.filtered and db.get_bind().dialect.name == "postgresql":
+        sql = stmt.compile(db.get_bind(), compile_kwargs={"literal_binds": True})
+        plan = db.execute(text(f"EXPLAIN (FORMAT JSON) {sql}")).scalar()
+        estimate = int(plan[0]["Plan"]["Plan Rows"])
+        if estimate >= settings.COUNT_ESTIMATE_MIN_ROWS:
+            return estimate, True
+    total = db.execute(select(func.count()).select_from(stmt.subquery())).scalar()
+    return total, False
+
+def products_total(db: Session, params: ProductListParams) -> Tuple[int, bool]:
+    """`count_products`, read through the count cache."""
+    key = count_cache_params(params)
+    cached = product_cache.get_count(key)
+    if cached is not None:
+        return cached
+    total, is_estimate = count_products(db, params)
+    product_cache.set_count(key, total, is_estimate, filtered=params.filtered)
+    return total, is_estimate
+
+def products_payload(
+    rows: List[product_models.Product],
+    params: ProductListParams,
+    total: Optional[Tuple[int, bool]] = None,
+) -> str:
+    """
+    Serialize listing rows as a plain list, or as a page envelope.
+
+    Projected rows are dumped straight to JSON without building models.
+    """
+    if not params.envelope:
+        if params.fields:
+            return orjson.dumps(_projected(rows, params)).decode()
+        return "[" + ",".join(product_schemas.Product.from_orm(row).json() for row in rows) + "]"
     
-    return query.offset(skip).limit(limit).all()
+    next_cursor = None
+    if params.cursor is not None and 0 < params.limit < len(rows):
+        rows = rows[:params.limit]
+        last = rows[-1]
+        next_cursor = encode_cursor(
+            params.order_by, [getattr(last, key.key) for key in _keyset_columns(params.order_by)]
+        )
+    if params.fields:
+        page = {"items": _projected(rows, params), "next_cursor": next_cursor, "total": None, "total_is_estimate": False}
+        if total is not None:
+            page["total"], page["total_is_estimate"] = total
+        return orjson.dumps(page).decode()
+    page = product_schemas.ProductPage(items=rows, next_cursor=next_cursor)
+    if total is not None:
+        page.total, page.total_is_estimate = total
+    return page.json()
+
+def _projected(rows: list, params: ProductListParams) -> List[dict]:
+    return [{field: getattr(row, field) for field in params.fields} for row in rows]
 
 @router.post("/", response_model=product_schemas.Product, status_code=status.HTTP_201_CREATED)
 def create_product(
@@ -47,7 +310,8 @@ def create_product(
     - **description**: Optional product description
     - **price**: Product price
     - **weight**: Optional product weight
-    - **dimensions**: Optional product dimensions as JSON string
+    - **dimensions**: Optional JSON string with positive `length`, `width` and `height`,
+      also returned parsed into `length`, `width`, `height` and `volume`
     - **is_active**: Whether the product is active (default: true)
     """
     # Check if product with same SKU already exists
@@ -64,19 +328,305 @@ def create_product(
     db.add(db_product)
     db.commit()
     db.refresh(db_product)
+    product_cache.invalidate_products()
     return db_product
 
+@router.post("/bulk", response_model=product_schemas.ProductBulkResult)
+async def bulk_upsert_products(
+    request: Request,
+    db: Session = Depends(get_db)
+):
+    """
+    Create or update many products in one request, matched on SKU.
+
+    The body is either a JSON array of products or NDJSON with one product per
+    line (`Content-Type: application/x-ndjson`). Each product takes the same
+    fields as a single create. Rows are upserted in chunks with one commit per
+    chunk; invalid rows are reported in `results` without failing the rest.
+    """
+    raw_items = await read_json_items(request, settings.BULK_MAX_ITEMS, "products")
+    return await run_in_threadpool(_bulk_upsert, db, raw_items)
+
+def _upsert_inserted(db: Session):
+    """A RETURNING column that is true for rows the upsert inserted rather than updated."""
+    if db.get_bind().dialect.name == "sqlite":
+        # No xmax; only the ON CONFLICT branch sets updated_at. SQLite
+        # reports IS NULL as false in an upsert's RETURNING clause, hence coalesce
+        return func.coalesce(product_models.Product.updated_at, "") == ""
+    # Rows the statement inserted haven't been locked by anyone yet
+    return literal_column("xmax = 0", Boolean)
+
+def _bulk_upsert(db: Session, raw_items: List[Any]) -> product_schemas.ProductBulkResult:
+    """Validate rows, then upsert them with one multi-row INSERT ... ON CONFLICT per chunk."""
+    Product = product_models.Product
+    results: List[Optional[product_schemas.ProductBulkItemResult]] = [None] * len(raw_items)
+    
+    # Validate every row up front; when a SKU repeats, the last row wins
+    pending = {}
+    for index, raw in enumerate(raw_items):
+        try:
+            if isinstance(raw, Exception):
+                raise ValueError(f"Invalid JSON: {raw}")
+            values = product_schemas.ProductCreate.parse_obj(raw).dict()
+            # Core inserts skip the model's validators, so parse dimensions here
+            values.update(parse_dimensions(values["dimensions"]))
+        except (ValidationError, ValueError) as exc:
+            sku = raw.get("sku") if isinstance(raw, dict) else None
+            results[index] = product_schemas.ProductBulkItemResult(
+                index=index, sku=sku, status="error", error=str(exc)
+            )
+            continue
+        if values["sku"] in pending:
+            earlier = pending[values["sku"]][0]
+            results[earlier] = product_schemas.ProductBulkItemResult(
+                index=earlier, sku=values["sku"], status="error",
+                error=f"Superseded by row {index} with the same SKU"
+            )
+        pending[values["sku"]] = (index, values)
+    
+    rows = list(pending.values())
+    chunk_size = settings.BULK_UPSERT_CHUNK_SIZE
+    for start in range(0, len(rows), chunk_size):
+        chunk = rows[start:start + chunk_size]
+        try:
+            stmt = dialect_insert(db, Product.__table__).values([values for _, values in chunk])
+            update_columns = {
+                key: stmt.excluded[key] for key in chunk[0][1] if key != "sku"
+            }
+            update_columns["updated_at"] = func.now()
+            update_columns["change_seq"] = next_change_seq()  # onupdate doesn't apply to ON CONFLICT
+            stmt = stmt.on_conflict_do_update(
+                index_elements=[Product.sku], set_=update_columns
+            ).returning(Product.sku, Product.id, _upsert_inserted(db).label("inserted"))
+            returned = {sku: (product_id, inserted) for sku, product_id, inserted in db.execute(stmt).all()}
+            db.commit()
+        except SQLAlchemyError as exc:
+            db.rollback()
+            for index, values in chunk:
+                results[index] = product_schemas.ProductBulkItemResult(
+                    index=index, sku=values["sku"], status="error",
+                    error=f"Database error: {exc.__class__.__name__}"
+                )
+            continue
+        for index, values in chunk:
+            product_id, inserted = returned[values["sku"]]
+            results[index] = product_schemas.ProductBulkItemResult(
+                index=index,
+                sku=values["sku"],
+                status="created" if inserted else "updated",
+                id=product_id,
+            )
+    
+    # Every id the upserts returned, so a row created by a concurrent writer
+    # between validation and the upsert can't keep a stale cache entry
+    product_cache.invalidate_products(
+        [item.id for item in results if item.status in ("created", "updated")]
+    )
+    summary = product_schemas.ProductBulkResult(results=results)
+    for item in results:
+        if item.status == "created":
+            summary.created += 1
+        elif item.status == "updated":
+            summary.updated += 1
+        else:
+            summary.failed += 1
+    return summary
+
+@router.get("/export", response_class=StreamingResponse)
+def export_products(
+    db: Session = Depends(get_db),
+    format: str = Query("ndjson", regex="^(ndjson|csv)$"),
+    is_active: Optional[bool] = None
+):
+    """
+    Stream the full product catalog as NDJSON or CSV.
+
+    Rows are read through a server-side cursor and written straight from
+    result tuples, so memory use does not grow with the catalog size.
+    
+    - **format**: `ndjson` (one JSON object per line) or `csv` (with a header row)
+    - **is_active**: Optional filter by active status; exports everything when omitted
+    """
+    columns = list(product_models.Product.__table__.columns)
+    stmt = select(*columns).order_by(product_models.Product.id)
+    if is_active is not None:
+        stmt = stmt.where(product_models.Product.is_active == is_active)
+    
+    keys = [column.key for column in columns]
+    if format == "csv":
+        body = _export_csv(db, stmt, keys)
+        media_type = "text/csv"
+    else:
+        body = _export_ndjson(db, stmt, keys)
+        media_type = "application/x-ndjson"
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="products.{format}"'}
+    )
+
+def _export_partitions(db: Session, stmt) -> Iterator[list]:
+    result = db.execute(stmt, execution_options={"yield_per": settings.EXPORT_BATCH_SIZE})
+    yield from result.partitions()
+
+def _export_ndjson(db: Session, stmt, keys: List[str]) -> Iterator[bytes]:
+    for rows in _export_partitions(db, stmt):
+        yield b"".join(orjson.dumps(dict(zip(keys, row))) + b"\n" for row in rows)
+
+def _export_csv(db: Session, stmt, keys: List[str]) -> Iterator[str]:
+    buffer = io.StringIO()
+    writer = csv.writer(buffer)
+    writer.writerow(keys)
+    for rows in _export_partitions(db, stmt):
+        writer.writerows(rows)
+        yield buffer.getvalue()
+        buffer.seek(0)
+        buffer.truncate()
+    if buffer.tell():
+        yield buffer.getvalue()
+
+@router.get("/changes", response_model=product_schemas.ProductChanges)
+def get_product_changes(
+    db: Session = Depends(get_db),
+    since: Optional[str] = None,
+    limit: int = Query(1000, gt=0, le=10_000)
+):
+    """
+    Products created, updated or soft-deleted since a change token.
+
+    Start without `since` to read every product, then pass the returned
+    `next_since` to fetch only what changed after that. Keep polling with
+    the same token while `items` is empty; `has_more` means another page is
+    ready right away. Soft-deleted products appear with `is_active: false`.
+    """
+    rows = db.execute(changes_statement(since, limit)).scalars().all()
+    return Response(content=changes_payload(rows, since, limit), media_type="application/json")
+
+# Change feed helpers, shared with the async endpoints in products_async
+
+def changes_statement(since: Optional[str], limit: int) -> Select:
+    Product = product_models.Product
+    stmt = select(Product).where(Product.change_seq < change_horizon())
+    if since:
+        try:
+            position = decode_cursor(since, "changes")
+        except InvalidCursor as exc:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=str(exc)
+            )
+        if [type(value) for value in position] != [int, int]:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail="Malformed change token"
+            )
+        stmt = stmt.where(tuple_(Product.change_seq, Product.id) > tuple_(*position))
+    return stmt.order_by(Product.change_seq, Product.id).limit(limit + 1)
+
+def changes_payload(rows: List[product_models.Product], since: Optional[str], limit: int) -> str:
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    next_since = encode_cursor("changes", [rows[-1].change_seq, rows[-1].id]) if rows else since
+    return product_schemas.ProductChanges(items=rows, next_since=next_since, has_more=has_more).json()
+
+@router.post("/lookup", response_model=product_schemas.ProductLookupResult)
+def lookup_products(
+    lookup: product_schemas.ProductLookup,
+    db: Session = Depends(get_db)
+):
+    """
+    Fetch many products by id and/or SKU in one request.
+
+    SKUs whose product details are in this worker's cache are served from
+    it, and the other keys are resolved with a single query. Found products
+    are keyed by id and SKU in the order they were requested; unknown keys
+    are listed in `missing_ids` and `missing_skus`.
+
+    Cached SKUs can lag the database: writes made outside the API, or an
+    invalidation this worker missed while Redis was unreachable, show up
+    only once the entry expires, after at most CACHE_LOCAL_TTL_SECONDS.
+    Products resolved by id always come from the database.
+    """
+    check_lookup_size(lookup)
+    cached, remaining = cached_lookup(lookup)
+    rows = db.execute(lookup_statement(remaining)).scalars().all() if remaining.ids or remaining.skus else []
+    return Response(content=lookup_payload(rows, lookup, cached), media_type="application/json")
+
+# Lookup helpers, shared with the async endpoints in products_async
+
+def check_lookup_size(lookup: product_schemas.ProductLookup):
+    if len(lookup.ids) + len(lookup.skus) > settings.LOOKUP_MAX_KEYS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.LOOKUP_MAX_KEYS} ids and SKUs per lookup"
+        )
+
+def cached_lookup(
+    lookup: product_schemas.ProductLookup,
+) -> Tuple[Dict[str, product_schemas.Product], product_schemas.ProductLookup]:
+    """
+    Products of `lookup.skus` in the local product cache, and the lookup left
+    for the database. Only the local tier is keyed by SKU, so cached entries
+    are at most CACHE_LOCAL_TTL_SECONDS older than the last invalidation
+    this worker received.
+    """
+    cached = {}
+    for sku in dict.fromkeys(lookup.skus):
+        payload = product_cache.get_product_by_sku(sku)
+        if payload is not None:
+            # A cached detail body; the fields it adds to Product are dropped
+            cached[sku] = product_schemas.Product.parse_raw(payload)
+    remaining = product_schemas.ProductLookup(
+        ids=lookup.ids, skus=[sku for sku in lookup.skus if sku not in cached]
+    )
+    return cached, remaining
+
+def lookup_statement(lookup: product_schemas.ProductLookup) -> Select:
+    Product = product_models.Product
+    clauses = []
+    if lookup.ids:
+        clauses.append(Product.id.in_(set(lookup.ids)))
+    if lookup.skus:
+        clauses.append(Product.sku.in_(set(lookup.skus)))
+    return select(Product).where(or_(*clauses))
+
+def lookup_payload(
+    rows: List[product_models.Product],
+    lookup: product_schemas.ProductLookup,
+    cached: Optional[Dict[str, product_schemas.Product]] = None,
+) -> str:
+    by_id = {row.id: product_schemas.Product.from_orm(row) for row in rows}
+    by_sku = {product.sku: product for product in by_id.values()}
+    by_sku.update(cached or {})
+    result = product_schemas.ProductLookupResult(
+        by_id={key: by_id[key] for key in lookup.ids if key in by_id},
+        by_sku={key: by_sku[key] for key in lookup.skus if key in by_sku},
+        missing_ids=[key for key in dict.fromkeys(lookup.ids) if key not in by_id],
+        missing_skus=[key for key in dict.fromkeys(lookup.skus) if key not in by_sku],
+    )
+    return result.json()
+
 @router.get("/{product_id}", response_model=product_schemas.ProductDetail)
 def get_product(
     product_id: int,
+    request: Request,
     db: Session = Depends(get_db)
 ):
     """
     Get detailed information about a specific product including inventory levels.
     
     - **product_id**: ID of the product to retrieve
+
+    Supports `If-None-Match` and `If-Modified-Since`; a cached product is
+    revalidated without querying the database. Validators change with stock
+    levels and supplier terms as well as the product itself.
     """
-    db_product = db.query(product_models.Product).filter(
+    cached = product_cache.get_product(product_id)
+    if cached is not None:
+        etag, last_modified = detail_validators(cached)
+        return conditional_response(request, cached, last_modified, etag)
+    
+    db_product = db.query(product_models.Product).options(*DETAIL_OPTIONS).filter(
         product_models.Product.id == product_id
     ).first()
     if db_product is None:
@@ -85,12 +635,17 @@ def get_product(
             detail="Product not found"
         )
 
-    return db_product
+    payload = product_schemas.ProductDetail.from_orm(db_product).json()
+    product_cache.set_product(product_id, payload, sku=db_product.sku)
+    etag, last_modified = detail_validators(payload)
+    return conditional_response(request, payload, last_modified, etag)
 
 @router.put("/{product_id}", response_model=product_schemas.Product)
 def update_product(
     product_id: int,
     product_update: product_schemas.ProductUpdate,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db)
 ):
     """
@@ -98,6 +653,11 @@ def update_product(
 
     - **product_id**: ID of the product to update
     
+    Send the product's ETag in `If-Match` to only apply the update if nobody
+    changed the product since you fetched it (412 otherwise); changes to its
+    stock or supplier terms don't count. The response carries the ETag of the
+    new row version, which If-Match accepts too.
+    
     The request body may contain any of these fields:
     - **name**: New product name
     - **description**: New product description
@@ -106,14 +666,17 @@ def update_product(
     - **dimensions**: New product dimensions
     - **is_active**: New active status
     """
-    db_product = db.query(product_models.Product).filter(
-        product_models.Product.id == product_id
-    ).first()
+    query = db.query(product_models.Product).options(*DETAIL_OPTIONS).filter(product_models.Product.id == product_id)
+    if "if-match" in request.headers:
+        # Hold the row until commit so nobody can change it between the check and the update
+        query = query.with_for_update(of=product_models.Product)
+    db_product = query.first()
     if db_product is None:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Product not found"
         )
+    check_if_match(request, version_etag(db_product.id, db_product.change_seq))
     
     # Update product fields
     for key, value in product_update.dict(exclude_unset=True).items():
@@ -121,6 +684,8 @@ def update_product(
     
     db.commit()
     db.refresh(db_product)
+    product_cache.invalidate_products([product_id])
+    response.headers["ETag"] = version_etag(db_product.id, db_product.change_seq)
     return db_product
 
 @router.delete("/{product_id}", status_code=status.HTTP_204_NO_CONTENT)
@@ -145,4 +710,5 @@ def delete_product(
     # Soft delete
     db_product.is_active = False
     db.commit()
+    product_cache.invalidate_products([product_id])
     return None
\ No newline at end of file
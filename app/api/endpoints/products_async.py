@@ -0,0 +1,200 @@
+# app/api/endpoints/products_async.py
+"""
+Async versions of the core product endpoints.
+
+Mounted in front of the sync router when `settings.DATABASE_ASYNC` is on,
+so these requests run on the event loop against the asyncpg engine rather
+than in FastAPI's threadpool. Endpoints not defined here (bulk, export)
+fall through to the sync router; `product_id` routes use the `int`
+convertor so paths like `/export` are not captured here.
+"""
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import Response
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.api.endpoints.products import (
+    DETAIL_OPTIONS,
+    ProductListParams,
+    cached_lookup,
+    changes_payload,
+    changes_statement,
+    check_lookup_size,
+    count_cache_params,
+    count_products,
+    list_cache_params,
+    list_rows,
+    lookup_payload,
+    lookup_statement,
+    products_payload,
+    products_statement,
+)
+from app.cache import product_cache
+from app.conditional import check_if_match, conditional_response, detail_validators, version_etag
+from app.database import get_async_db
+from app.models import product as product_models
+from app.schemas import product as product_schemas
+
+router = APIRouter()
+
+@router.get("/", response_model=Union[List[product_schemas.Product], product_schemas.ProductPage])
+async def get_products_async(
+    request: Request,
+    db: AsyncSession = Depends(get_async_db),
+    params: ProductListParams = Depends(),
+):
+    """
+    Retrieve products with optional filtering. See `products.get_products`.
+    """
+    cache_params = list_cache_params(params)
+    if cache_params is not None:
+        cached = await product_cache.aget_list(cache_params)
+        if cached is not None:
+            return conditional_response(request, cached)
+
+    rows = list_rows(await db.execute(products_statement(params)), params)
+    total = None
+    if params.include_total:
+        count_params = count_cache_params(params)
+        total = await product_cache.aget_count(count_params)
+        if total is None:
+            total = await db.run_sync(count_products, params)
+            await product_cache.aset_count(
+                count_params, *total, filtered=params.filtered
+            )
+    payload = products_payload(rows, params, total)
+
+    if cache_params is not None:
+        await product_cache.aset_list(cache_params, payload)
+    return conditional_response(request, payload)
+
+@router.post("/", response_model=product_schemas.Product, status_code=status.HTTP_201_CREATED)
+async def create_product_async(
+    product: product_schemas.ProductCreate,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Create a new product. See `products.create_product`.
+    """
+    existing_product = (await db.execute(
+        select(product_models.Product.id).where(product_models.Product.sku == product.sku)
+    )).first()
+    if existing_product:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Product with SKU {product.sku} already exists"
+        )
+    db_product = product_models.Product(**product.dict())
+    db.add(db_product)
+    await db.commit()
+    await db.refresh(db_product)
+    await product_cache.ainvalidate_products()
+    return db_product
+
+@router.get("/changes", response_model=product_schemas.ProductChanges)
+async def get_product_changes_async(
+    db: AsyncSession = Depends(get_async_db),
+    since: Optional[str] = None,
+    limit: int = Query(1000, gt=0, le=10_000)
+):
+    """
+    Products created, updated or soft-deleted since a change token. See `products.get_product_changes`.
+    """
+    rows = (await db.execute(changes_statement(since, limit))).scalars().all()
+    return Response(content=changes_payload(rows, since, limit), media_type="application/json")
+
+@router.post("/lookup", response_model=product_schemas.ProductLookupResult)
+async def lookup_products_async(
+    lookup: product_schemas.ProductLookup,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Fetch many products by id and/or SKU in one request. See `products.lookup_products`.
+    """
+    check_lookup_size(lookup)
+    cached, remaining = cached_lookup(lookup)
+    rows = []
+    if remaining.ids or remaining.skus:
+        rows = (await db.execute(lookup_statement(remaining))).scalars().all()
+    return Response(content=lookup_payload(rows, lookup, cached), media_type="application/json")
+
+@router.get("/{product_id:int}", response_model=product_schemas.ProductDetail)
+async def get_product_async(
+    product_id: int,
+    request: Request,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get detailed information about a specific product. See `products.get_product`.
+    """
+    cached = await product_cache.aget_product(product_id)
+    if cached is not None:
+        etag, last_modified = detail_validators(cached)
+        return conditional_response(request, cached, last_modified, etag)
+
+    db_product = await db.get(
+        product_models.Product, product_id, options=list(DETAIL_OPTIONS)
+    )
+    if db_product is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+
+    payload = product_schemas.ProductDetail.from_orm(db_product).json()
+    await product_cache.aset_product(product_id, payload, sku=db_product.sku)
+    etag, last_modified = detail_validators(payload)
+    return conditional_response(request, payload, last_modified, etag)
+
+@router.put("/{product_id:int}", response_model=product_schemas.Product)
+async def update_product_async(
+    product_id: int,
+    product_update: product_schemas.ProductUpdate,
+    request: Request,
+    response: Response,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Update a product. See `products.update_product`.
+    """
+    db_product = await db.get(
+        product_models.Product,
+        product_id,
+        options=list(DETAIL_OPTIONS),
+        with_for_update={"of": product_models.Product} if "if-match" in request.headers else None,
+    )
+    if db_product is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    check_if_match(request, version_etag(db_product.id, db_product.change_seq))
+
+    for key, value in product_update.dict(exclude_unset=True).items():
+        setattr(db_product, key, value)
+
+    await db.commit()
+    await db.refresh(db_product)
+    await product_cache.ainvalidate_products([product_id])
+    response.headers["ETag"] = version_etag(db_product.id, db_product.change_seq)
+    return db_product
+
+@router.delete("/{product_id:int}", status_code=status.HTTP_204_NO_CONTENT)
+async def delete_product_async(
+    product_id: int,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Delete a product (soft delete). See `products.delete_product`.
+    """
+    db_product = await db.get(product_models.Product, product_id)
+    if db_product is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+
+    db_product.is_active = False
+    await db.commit()
+    await product_cache.ainvalidate_products([product_id])
+    return None
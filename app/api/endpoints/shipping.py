@@ -0,0 +1,30 @@
+# app/api/endpoints/shipping.py
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy.orm import Session
+from app.config import settings
+from app.database import get_db
+from app.schemas import shipping as shipping_schemas
+from app.services.shipping import quote_orders
+
+router = APIRouter()
+
+@router.post("/quotes", response_model=shipping_schemas.ShippingQuoteBatchResult)
+def create_quotes(
+    orders: List[shipping_schemas.ShippingOrder],
+    db: Session = Depends(get_db)
+):
+    """
+    Pack a batch of orders into cartons and quote their shipping cost.
+
+    Each order lists products (`product_id` or `sku`) and quantities. Its
+    units are packed into the configured cartons, and every package is rated
+    on the greater of its actual and dimensional weight. Orders naming
+    unknown products are reported in `error` without failing the rest.
+    """
+    if len(orders) > settings.SHIPPING_MAX_ORDERS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.SHIPPING_MAX_ORDERS} orders per request"
+        )
+    return quote_orders(db, orders)
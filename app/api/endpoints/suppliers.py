@@ -0,0 +1,163 @@
+# app/api/endpoints/suppliers.py
+from typing import List
+from fastapi import APIRouter, Depends, HTTPException, status
+from sqlalchemy import distinct, func, select
+from sqlalchemy.orm import Session
+from app.cache import product_cache
+from app.config import settings
+from app.database import get_db
+from app.models import product as product_models
+from app.models import supplier as supplier_models
+from app.schemas import supplier as supplier_schemas
+from app.services.suppliers import record_receipts
+
+router = APIRouter()
+
+def _get_supplier(db: Session, supplier_id: int) -> supplier_models.Supplier:
+    db_supplier = db.get(supplier_models.Supplier, supplier_id)
+    if db_supplier is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Supplier not found"
+        )
+    return db_supplier
+
+@router.post("/", response_model=supplier_schemas.Supplier, status_code=status.HTTP_201_CREATED)
+def create_supplier(
+    supplier: supplier_schemas.SupplierCreate,
+    db: Session = Depends(get_db)
+):
+    """
+    Create a new supplier.
+
+    - **code**: Unique supplier code
+    - **name**: Supplier name
+    - **capacity**: Units it can supply per sourcing run, across products; unlimited if omitted
+    - **is_active**: Whether the supplier is active
+    """
+    existing = db.execute(
+        select(supplier_models.Supplier.id).where(supplier_models.Supplier.code == supplier.code)
+    ).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"Supplier with code {supplier.code} already exists"
+        )
+    db_supplier = supplier_models.Supplier(**supplier.dict())
+    db.add(db_supplier)
+    db.commit()
+    db.refresh(db_supplier)
+    return db_supplier
+
+@router.get("/", response_model=List[supplier_schemas.Supplier])
+def get_suppliers(db: Session = Depends(get_db)):
+    """
+    List all suppliers.
+    """
+    return db.execute(
+        select(supplier_models.Supplier).order_by(supplier_models.Supplier.id)
+    ).scalars().all()
+
+@router.put("/{supplier_id}/products/{product_id}", response_model=supplier_schemas.SupplierProduct)
+def update_supplier_product(
+    supplier_id: int,
+    product_id: int,
+    terms: supplier_schemas.SupplierProductUpdate,
+    db: Session = Depends(get_db)
+):
+    """
+    Set the terms a supplier offers for a product, adding the product to the
+    supplier if needed. Observed lead times are kept.
+
+    - **unit_cost**: Cost per unit
+    - **capacity**: Units the supplier can deliver per sourcing run
+    - **quoted_lead_time_days**: Lead time to assume until receipts are recorded
+    """
+    _get_supplier(db, supplier_id)
+    if db.get(product_models.Product, product_id) is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Product not found"
+        )
+    db_link = db.get(supplier_models.SupplierProduct, (supplier_id, product_id))
+    if db_link is None:
+        db_link = supplier_models.SupplierProduct(supplier_id=supplier_id, product_id=product_id)
+        db.add(db_link)
+    for key, value in terms.dict(exclude_unset=True).items():
+        setattr(db_link, key, value)
+    db.commit()
+    db.refresh(db_link)
+    product_cache.invalidate_products([product_id], lists=False)
+    return db_link
+
+@router.get("/{supplier_id}/products", response_model=List[supplier_schemas.SupplierProduct])
+def get_supplier_products(
+    supplier_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    List the products a supplier delivers, with terms and observed lead times.
+    """
+    _get_supplier(db, supplier_id)
+    return db.execute(
+        select(supplier_models.SupplierProduct)
+        .where(supplier_models.SupplierProduct.supplier_id == supplier_id)
+        .order_by(supplier_models.SupplierProduct.product_id)
+    ).scalars().all()
+
+@router.post("/receipts", response_model=supplier_schemas.SupplierReceiptBatchResult)
+def create_receipts(
+    receipts: List[supplier_schemas.SupplierReceiptCreate],
+    db: Session = Depends(get_db)
+):
+    """
+    Record goods received from suppliers.
+
+    Each receipt adds stock at a warehouse and a lead-time observation (from
+    `ordered_at` to `received_at`) for the supplier and product. Receipts
+    naming unknown suppliers, products or warehouses are reported in
+    `errors`; the rest are committed together.
+    """
+    if len(receipts) > settings.SUPPLIERS_MAX_RECEIPTS:
+        raise HTTPException(
+            status_code=status.HTTP_413_REQUEST_ENTITY_TOO_LARGE,
+            detail=f"At most {settings.SUPPLIERS_MAX_RECEIPTS} receipts per request"
+        )
+    return record_receipts(db, receipts)
+
+@router.get("/sourcing/runs/latest", response_model=supplier_schemas.SourcingSummary)
+def get_latest_sourcing_run(db: Session = Depends(get_db)):
+    """
+    Summarize the stored supplier allocations.
+
+    Allocations are recomputed by the scheduled `scripts/plan_sourcing.py`
+    job, after the replenishment plans, never by the API.
+    """
+    products, allocated, computed_at = db.execute(
+        select(
+            func.count(distinct(supplier_models.SourcingAllocation.product_id)),
+            func.coalesce(func.sum(supplier_models.SourcingAllocation.quantity), 0),
+            func.max(supplier_models.SourcingAllocation.computed_at),
+        )
+    ).one()
+    if computed_at is None:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="No sourcing run yet"
+        )
+    return supplier_schemas.SourcingSummary(products=products, allocated=allocated, computed_at=computed_at)
+
+@router.get("/{supplier_id}/allocations", response_model=List[supplier_schemas.SourcingAllocation])
+def get_supplier_allocations(
+    supplier_id: int,
+    db: Session = Depends(get_db)
+):
+    """
+    Units of each product to order from a supplier, from the latest sourcing run.
+    """
+    _get_supplier(db, supplier_id)
+    return db.execute(
+        select(supplier_models.SourcingAllocation)
+        .where(supplier_models.SourcingAllocation.supplier_id == supplier_id)
+        .order_by(supplier_models.SourcingAllocation.product_id)
+    ).scalars().all()
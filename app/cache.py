@@ -0,0 +1,456 @@
+# app/cache.py
+import hashlib
+import json
+import logging
+import sys
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import redis
+import redis.asyncio
+
+from app.config import settings
+
+logger = logging.getLogger(__name__)
+
+# Versioned with the detail body, whose change_seq and last_modified the validators read
+PRODUCT_KEY = "products:detail:v3:{}"
+LIST_KEY = "products:list:{}:{}"
+LIST_GENERATION_KEY = "products:list:generation"
+COUNT_KEY = "products:count:{}"
+INVALIDATION_CHANNEL = "products:invalidate"
+
+
+class LocalCache:
+    """
+    Bounded per-process LRU of serialized responses with a TTL.
+
+    Entries are keyed by product id and can carry a SKU alias. The byte
+    budget counts the size of the stored payloads; least recently used
+    entries are evicted to stay under it.
+    """
+
+    def __init__(self, max_bytes: int, ttl: float):
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self._entries: "OrderedDict[int, Tuple[bytes, float, Optional[str]]]" = OrderedDict()
+        self._aliases: Dict[str, int] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "expirations": 0}
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 and self.ttl > 0
+
+    def get(self, key: int) -> Optional[bytes]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            value, expires_at, _ = entry
+            if expires_at <= time.monotonic():
+                self._remove(key)
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return value
+
+    def get_by_alias(self, alias: str) -> Optional[bytes]:
+        with self._lock:
+            key = self._aliases.get(alias)
+        if key is None:
+            with self._lock:
+                self._stats["misses"] += 1
+            return None
+        return self.get(key)
+
+    def set(self, key: int, value: bytes, alias: Optional[str] = None):
+        size = sys.getsizeof(value)
+        if not self.enabled or size > self.max_bytes:
+            return
+        with self._lock:
+            self._remove(key)
+            self._entries[key] = (value, time.monotonic() + self.ttl, alias)
+            self._bytes += size
+            if alias is not None:
+                self._aliases[alias] = key
+            while self._bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def evict(self, keys: Iterable[int]):
+        with self._lock:
+            for key in keys:
+                self._remove(key)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._aliases.clear()
+            self._bytes = 0
+
+    def _remove(self, key: int):
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        value, _, alias = entry
+        self._bytes -= sys.getsizeof(value)
+        if alias is not None and self._aliases.get(alias) == key:
+            del self._aliases[alias]
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+            stats["bytes"] = self._bytes
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["max_bytes"] = self.max_bytes
+        return stats
+
+
+class ProductCache:
+    """
+    Read-through Redis cache for product detail and list responses.
+
+    Values are serialized JSON response bodies. Detail entries are deleted
+    when a product changes; list entries are namespaced by a generation
+    counter that every write bumps, so stale pages simply stop being read
+    and age out through their TTL.
+
+    Product details are also kept in a per-worker `LocalCache` in front of
+    Redis. Invalidations are published on a Redis channel so every worker
+    evicts its local copy, not just the one that handled the write.
+
+    Redis is an optimization, never a dependency: if it is unreachable the
+    cache reports a miss and stays out of the way for `retry_seconds`
+    before trying again.
+
+    Listing totals are cached by filter for a short TTL and are not
+    invalidated by writes; a total that lags by a few seconds is fine.
+
+    The `a`-prefixed methods are the same operations for async endpoints,
+    using a `redis.asyncio` client so lookups never block the event loop.
+    """
+
+    def __init__(
+        self,
+        url: Optional[str],
+        enabled: bool = True,
+        product_ttl: int = 300,
+        list_ttl: int = 30,
+        timeout: float = 0.25,
+        retry_seconds: float = 30.0,
+        local_max_bytes: int = 0,
+        local_ttl: float = 0,
+        count_ttl: int = 300,
+        count_filtered_ttl: int = 15,
+    ):
+        self.url = url
+        self.enabled = enabled
+        self.product_ttl = product_ttl
+        self.list_ttl = list_ttl
+        self.count_ttl = count_ttl
+        self.count_filtered_ttl = count_filtered_ttl
+        self.timeout = timeout
+        self.retry_seconds = retry_seconds
+        self._client: Optional[redis.Redis] = None
+        self._async_client: Optional[redis.asyncio.Redis] = None
+        self._unavailable_until = 0.0
+        self.local = LocalCache(local_max_bytes, local_ttl)
+        self._listener: Optional[threading.Thread] = None
+        self._stop_listening = threading.Event()
+        self._lock = threading.Lock()
+        self._stats = {
+            "product_hits": 0,
+            "product_misses": 0,
+            "list_hits": 0,
+            "list_misses": 0,
+            "count_hits": 0,
+            "count_misses": 0,
+            "errors": 0,
+        }
+
+    @property
+    def client(self) -> redis.Redis:
+        if self._client is None:
+            self._client = redis.Redis.from_url(
+                self.url,
+                socket_timeout=self.timeout,
+                socket_connect_timeout=self.timeout,
+            )
+        return self._client
+
+    @client.setter
+    def client(self, value: redis.Redis):
+        self._client = value
+
+    @property
+    def async_client(self) -> redis.asyncio.Redis:
+        if self._async_client is None:
+            self._async_client = redis.asyncio.Redis.from_url(
+                self.url,
+                socket_timeout=self.timeout,
+                socket_connect_timeout=self.timeout,
+            )
+        return self._async_client
+
+    def _available(self) -> bool:
+        return self.enabled and time.monotonic() >= self._unavailable_until
+
+    def _mark_unavailable(self, exc: Exception):
+        logger.warning("Product cache unavailable, bypassing for %ss: %s", self.retry_seconds, exc)
+        self._unavailable_until = time.monotonic() + self.retry_seconds
+        self._count("errors")
+
+    def _call(self, operation) -> Any:
+        """Run a Redis operation, degrading to None while Redis is unavailable."""
+        if not self._available():
+            return None
+        try:
+            return operation()
+        except redis.RedisError as exc:
+            self._mark_unavailable(exc)
+            return None
+
+    async def _acall(self, operation) -> Any:
+        if not self._available():
+            return None
+        try:
+            return await operation()
+        except redis.RedisError as exc:
+            self._mark_unavailable(exc)
+            return None
+
+    def _count(self, stat: str):
+        with self._lock:
+            self._stats[stat] += 1
+
+    @staticmethod
+    def _params_digest(params: Dict[str, Any]) -> str:
+        encoded = json.dumps(params, sort_keys=True, default=str)
+        return hashlib.sha1(encoded.encode()).hexdigest()
+
+    def get_product(self, product_id: int) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        value = self.local.get(product_id)
+        if value is not None:
+            return value
+        value = self._call(lambda: self.client.get(PRODUCT_KEY.format(product_id)))
+        self._count("product_hits" if value is not None else "product_misses")
+        if value is not None:
+            self.local.set(product_id, value)
+        return value
+
+    def get_product_by_sku(self, sku: str) -> Optional[bytes]:
+        """Look a product detail up by SKU; only the local tier is keyed by SKU."""
+        if not self.enabled:
+            return None
+        return self.local.get_by_alias(sku)
+
+    def set_product(self, product_id: int, payload: str, sku: Optional[str] = None):
+        if not self.enabled:
+            return
+        self.local.set(product_id, payload.encode(), alias=sku)
+        self._call(lambda: self.client.set(PRODUCT_KEY.format(product_id), payload, ex=self.product_ttl))
+
+    def _list_key(self, params: Dict[str, Any], generation: Optional[bytes]) -> Optional[str]:
+        if generation is None and not self._available():
+            return None
+        return LIST_KEY.format(int(generation or 0), self._params_digest(params))
+
+    def get_list(self, params: Dict[str, Any]) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        key = self._list_key(params, self._call(lambda: self.client.get(LIST_GENERATION_KEY)))
+        value = self._call(lambda: self.client.get(key)) if key else None
+        self._count("list_hits" if value is not None else "list_misses")
+        return value
+
+    def set_list(self, params: Dict[str, Any], payload: str):
+        if not self.enabled:
+            return
+        key = self._list_key(params, self._call(lambda: self.client.get(LIST_GENERATION_KEY)))
+        if key:
+            self._call(lambda: self.client.set(key, payload, ex=self.list_ttl))
+
+    @staticmethod
+    def _decode_count(value: Optional[bytes]) -> Optional[Tuple[int, bool]]:
+        if value is None:
+            return None
+        total, is_estimate = json.loads(value)
+        return total, is_estimate
+
+    def get_count(self, params: Dict[str, Any]) -> Optional[Tuple[int, bool]]:
+        if not self.enabled:
+            return None
+        value = self._call(lambda: self.client.get(COUNT_KEY.format(self._params_digest(params))))
+        self._count("count_hits" if value is not None else "count_misses")
+        return self._decode_count(value)
+
+    def set_count(self, params: Dict[str, Any], total: int, is_estimate: bool, filtered: bool = False):
+        if not self.enabled:
+            return
+        key = COUNT_KEY.format(self._params_digest(params))
+        ttl = self.count_filtered_ttl if filtered else self.count_ttl
+        self._call(lambda: self.client.set(key, json.dumps([total, is_estimate]), ex=ttl))
+
+    def invalidate_products(self, product_ids: Iterable[int] = (), lists: bool = True):
+        """
+        Drop cached details for the given products and retire every cached list page.
+
+        Pass `lists=False` for changes that only show in product details
+        (such as stock levels), so list pages stay cached.
+        """
+        product_ids = list(product_ids)
+        self.local.evict(product_ids)
+
+        def invalidate():
+            pipeline = self.client.pipeline(transaction=False)
+            for product_id in product_ids:
+                pipeline.delete(PRODUCT_KEY.format(product_id))
+            if lists:
+                pipeline.incr(LIST_GENERATION_KEY)
+            if product_ids:
+                pipeline.publish(INVALIDATION_CHANNEL, json.dumps(product_ids))
+            pipeline.execute()
+        self._call(invalidate)
+
+    async def aget_product(self, product_id: int) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        value = self.local.get(product_id)
+        if value is not None:
+            return value
+        value = await self._acall(lambda: self.async_client.get(PRODUCT_KEY.format(product_id)))
+        self._count("product_hits" if value is not None else "product_misses")
+        if value is not None:
+            self.local.set(product_id, value)
+        return value
+
+    async def aset_product(self, product_id: int, payload: str, sku: Optional[str] = None):
+        if not self.enabled:
+            return
+        self.local.set(product_id, payload.encode(), alias=sku)
+        await self._acall(
+            lambda: self.async_client.set(PRODUCT_KEY.format(product_id), payload, ex=self.product_ttl)
+        )
+
+    async def aget_list(self, params: Dict[str, Any]) -> Optional[bytes]:
+        if not self.enabled:
+            return None
+        generation = await self._acall(lambda: self.async_client.get(LIST_GENERATION_KEY))
+        key = self._list_key(params, generation)
+        value = await self._acall(lambda: self.async_client.get(key)) if key else None
+        self._count("list_hits" if value is not None else "list_misses")
+        return value
+
+    async def aset_list(self, params: Dict[str, Any], payload: str):
+        if not self.enabled:
+            return
+        generation = await self._acall(lambda: self.async_client.get(LIST_GENERATION_KEY))
+        key = self._list_key(params, generation)
+        if key:
+            await self._acall(lambda: self.async_client.set(key, payload, ex=self.list_ttl))
+
+    async def aget_count(self, params: Dict[str, Any]) -> Optional[Tuple[int, bool]]:
+        if not self.enabled:
+            return None
+        key = COUNT_KEY.format(self._params_digest(params))
+        value = await self._acall(lambda: self.async_client.get(key))
+        self._count("count_hits" if value is not None else "count_misses")
+        return self._decode_count(value)
+
+    async def aset_count(self, params: Dict[str, Any], total: int, is_estimate: bool, filtered: bool = False):
+        if not self.enabled:
+            return
+        key = COUNT_KEY.format(self._params_digest(params))
+        ttl = self.count_filtered_ttl if filtered else self.count_ttl
+        await self._acall(lambda: self.async_client.set(key, json.dumps([total, is_estimate]), ex=ttl))
+
+    async def ainvalidate_products(self, product_ids: Iterable[int] = (), lists: bool = True):
+        product_ids = list(product_ids)
+        self.local.evict(product_ids)
+
+        async def invalidate():
+            pipeline = self.async_client.pipeline(transaction=False)
+            for product_id in product_ids:
+                pipeline.delete(PRODUCT_KEY.format(product_id))
+            if lists:
+                pipeline.incr(LIST_GENERATION_KEY)
+            if product_ids:
+                pipeline.publish(INVALIDATION_CHANNEL, json.dumps(product_ids))
+            return await pipeline.execute()
+        await self._acall(invalidate)
+
+    def start_listener(self):
+        """Start evicting local entries on invalidations published by other workers."""
+        if not self.enabled or not self.local.enabled or self._listener is not None:
+            return
+        self._stop_listening.clear()
+        self._listener = threading.Thread(
+            target=self._listen, name="product-cache-invalidation", daemon=True
+        )
+        self._listener.start()
+
+    def stop_listener(self):
+        self._stop_listening.set()
+        if self._listener is not None:
+            self._listener.join(timeout=5)
+            self._listener = None
+
+    def _listen(self):
+        while not self._stop_listening.is_set():
+            pubsub = None
+            try:
+                # A dedicated connection without the short read timeout used for lookups
+                pubsub = redis.Redis.from_url(
+                    self.url, socket_connect_timeout=self.timeout
+                ).pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(INVALIDATION_CHANNEL)
+                # Invalidations may have been missed while we were not subscribed
+                self.local.clear()
+                while not self._stop_listening.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message is not None:
+                        self.local.evict(json.loads(message["data"]))
+            except (redis.RedisError, ValueError) as exc:
+                logger.warning("Product cache invalidation listener disconnected: %s", exc)
+                self.local.clear()
+                self._stop_listening.wait(self.retry_seconds)
+            finally:
+                if pubsub is not None:
+                    pubsub.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+        for kind in ("product", "list", "count"):
+            lookups = stats[f"{kind}_hits"] + stats[f"{kind}_misses"]
+            stats[f"{kind}_hit_rate"] = stats[f"{kind}_hits"] / lookups if lookups else 0.0
+        stats["enabled"] = self.enabled
+        stats["available"] = time.monotonic() >= self._unavailable_until
+        stats["local"] = self.local.stats()
+        return stats
+
+
+product_cache = ProductCache(
+    settings.REDIS_URL,
+    enabled=settings.CACHE_ENABLED,
+    product_ttl=settings.CACHE_PRODUCT_TTL_SECONDS,
+    list_ttl=settings.CACHE_LIST_TTL_SECONDS,
+    timeout=settings.CACHE_REDIS_TIMEOUT_SECONDS,
+    retry_seconds=settings.CACHE_REDIS_RETRY_SECONDS,
+    local_max_bytes=settings.CACHE_LOCAL_MAX_BYTES,
+    local_ttl=settings.CACHE_LOCAL_TTL_SECONDS,
+    count_ttl=settings.COUNT_CACHE_TTL_SECONDS,
+    count_filtered_ttl=settings.COUNT_FILTERED_CACHE_TTL_SECONDS,
+)
@@ -0,0 +1,74 @@
+# app/changes.py
+"""
+Change stamps for the product change feed and the stock ledger.
+
+Every insert and update stamps `products.change_seq`, and the feed pages
+through rows in (change_seq, id) order. Stamps are handed out when a row is
+written, but transactions commit in any order, so a feed reader could see a
+later stamp before an earlier one becomes visible and skip it for good.
+The feed therefore stops at a horizon below which every writer has finished.
+
+On PostgreSQL the stamp is the writing transaction's id and the horizon is
+the oldest transaction still running (`txid_snapshot_xmin`). A long-running
+transaction holds the feed back until it ends, but no change is lost. SQLite
+(the test fallback) serializes writers, so a max + 1 counter is enough and
+every row is below the horizon.
+
+Stock movements are stamped the same way, so forecast refreshes can tell
+which demand they have already read (app.services.forecasting).
+"""
+from sqlalchemy import BigInteger
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+_NEXT_COUNTER = "(SELECT coalesce(max(change_seq), 0) + 1 FROM {})"
+
+
+class next_change_seq(FunctionElement):
+    """The stamp for a product row being written now."""
+    type = BigInteger()
+    inherit_cache = True
+    name = "next_change_seq"
+    table = "products"  # Counted on SQLite
+
+
+class next_movement_seq(next_change_seq):
+    """The stamp for a stock movement being written now."""
+    inherit_cache = True
+    name = "next_movement_seq"
+    table = "stock_movements"
+
+
+class change_horizon(FunctionElement):
+    """Stamps below this value belong to finished transactions."""
+    type = BigInteger()
+    inherit_cache = True
+    name = "change_horizon"
+    table = "products"
+
+
+class movement_horizon(change_horizon):
+    """Movement stamps below this value belong to finished transactions."""
+    inherit_cache = True
+    name = "movement_horizon"
+    table = "stock_movements"
+
+
+@compiles(next_change_seq, "postgresql")
+def _pg_next_change_seq(element, compiler, **kw):
+    return "txid_current()"
+
+
+@compiles(next_change_seq)
+def _default_next_change_seq(element, compiler, **kw):
+    return _NEXT_COUNTER.format(element.table)
+
+
+@compiles(change_horizon, "postgresql")
+def _pg_change_horizon(element, compiler, **kw):
+    return "txid_snapshot_xmin(txid_current_snapshot())"
+
+
+@compiles(change_horizon)
+def _default_change_horizon(element, compiler, **kw):
+    return _NEXT_COUNTER.format(element.table)
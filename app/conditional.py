@@ -0,0 +1,127 @@
+# app/conditional.py
+"""
+HTTP validators and conditional requests (RFC 7232).
+
+Listing pages are tagged with a digest of their serialized body; the
+product endpoints already build bodies as JSON text for the cache, so a
+cached page can be revalidated without touching the database.
+
+A single product's tag pairs its row version, its id and `change_seq`
+(see app.changes), with a digest of the detail body, which also carries
+stock levels and supplier terms. If-None-Match therefore sees every
+change to the representation, while If-Match only compares the row
+version, so stock movements and reservations don't fail an update of the
+product itself. Last-Modified is the latest of the product's, its stock
+summary's and its supplier terms' update times. Both validators can be
+read back from a cached detail body.
+"""
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Optional, Tuple, Union
+
+import orjson
+from fastapi import HTTPException, Request, status
+from fastapi.responses import Response
+
+from app.middleware import decoded_etag
+
+
+def etag_for(payload: Union[str, bytes]) -> str:
+    """A strong entity tag for a response body."""
+    if isinstance(payload, str):
+        payload = payload.encode()
+    return '"' + hashlib.sha1(payload).hexdigest() + '"'
+
+
+def version_etag(product_id: int, change_seq: int) -> str:
+    """A strong entity tag for one version of a products row, as If-Match compares it."""
+    return f'"{product_id}.{change_seq}"'
+
+
+def _version_part(etag: str) -> str:
+    """The row version a product entity tag starts with."""
+    return '"' + ".".join(etag.strip('"').split(".")[:2]) + '"' if etag.startswith('"') else etag
+
+
+def detail_validators(payload: Union[str, bytes]) -> Tuple[str, Optional[datetime]]:
+    """ETag and Last-Modified of a serialized product detail."""
+    if isinstance(payload, str):
+        payload = payload.encode()
+    document = orjson.loads(payload)
+    digest = hashlib.sha1(payload).hexdigest()[:16]
+    stamp = document.get("last_modified") or document.get("updated_at") or document.get("created_at")
+    last_modified = _as_utc(datetime.fromisoformat(stamp)) if stamp else None
+    return f'"{document["id"]}.{document["change_seq"]}.{digest}"', last_modified
+
+
+def _entity_tags(header: str):
+    # Tags of compressed responses carry the coding (app.middleware); the entity is the same
+    return [decoded_etag(tag.strip()) for tag in header.split(",") if tag.strip()]
+
+
+def _as_utc(value: datetime) -> datetime:
+    # SQLite hands back naive timestamps; the database clock is UTC
+    return value.replace(tzinfo=timezone.utc) if value.tzinfo is None else value.astimezone(timezone.utc)
+
+
+def not_modified(request: Request, etag: str, last_modified: Optional[datetime] = None) -> bool:
+    """
+    Whether a GET can be answered with 304 Not Modified.
+
+    If-None-Match uses weak comparison and takes precedence; If-Modified-Since
+    is only consulted when the client sent no entity tags.
+    """
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        tags = _entity_tags(if_none_match)
+        return "*" in tags or etag in [tag[2:] if tag.startswith("W/") else tag for tag in tags]
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since is None or last_modified is None:
+        return False
+    try:
+        since = _as_utc(parsedate_to_datetime(if_modified_since))
+    except (TypeError, ValueError):
+        return False
+    # HTTP dates have one-second resolution
+    return _as_utc(last_modified).replace(microsecond=0) <= since
+
+
+def conditional_response(
+    request: Request,
+    payload: Union[str, bytes],
+    last_modified: Optional[datetime] = None,
+    etag: Optional[str] = None,
+) -> Response:
+    """
+    A JSON response carrying validators, or a bodiless 304 if the client's copy is current.
+
+    The ETag defaults to a digest of the body.
+    """
+    etag = etag or etag_for(payload)
+    headers = {"ETag": etag}
+    if last_modified is not None:
+        headers["Last-Modified"] = format_datetime(_as_utc(last_modified), usegmt=True)
+    if not_modified(request, etag, last_modified):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=payload, media_type="application/json", headers=headers)
+
+
+def check_if_match(request: Request, current_version: str):
+    """
+    Enforce If-Match with strong comparison against the current row version,
+    a `version_etag`. Tags of the full detail representation are compared by
+    the version they start with.
+
+    Raises 412 Precondition Failed when the client's copy is out of date.
+    """
+    if_match = request.headers.get("if-match")
+    if if_match is None:
+        return
+    tags = _entity_tags(if_match)
+    if "*" not in tags and current_version not in [_version_part(tag) for tag in tags]:
+        raise HTTPException(
+            status_code=status.HTTP_412_PRECONDITION_FAILED,
+            detail="Product was modified since it was fetched"
+        )
@@ -28,6 +28,7 @@ class Settings(BaseSettings):
     # Security settings
     SECRET_KEY: str = secrets.token_urlsafe(32)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 60 * 24 * 8  # 8 days
+    INTERNAL_API_TOKEN: Optional[str] = None  # Sent as X-Internal-Token to /internal; unset disables it
     
     # CORS settings
     BACKEND_CORS_ORIGINS: List[AnyHttpUrl] = []
@@ -50,6 +51,14 @@ class Settings(BaseSettings):
     DATABASE_URL: Optional[PostgresDsn] = None
     SQL_ECHO: bool = False
     
+    # Connection pool settings
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 10
+    DB_POOL_TIMEOUT: float = 30.0  # Seconds to wait for a connection before failing
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced; -1 disables
+    DB_POOL_PRE_PING: bool = True  # Costs a round trip on every checkout
+    DB_PGBOUNCER_MODE: bool = False  # No app-side pooling or prepared statements, for PgBouncer
+    
     @validator("DATABASE_URL", pre=True)
     def assemble_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
         """Build database URL from components."""
@@ -64,6 +73,37 @@ class Settings(BaseSettings):
             path=f"/{values.get('POSTGRES_DB') or ''}",
         )
     
+    # Serve the core product endpoints from an asyncpg-backed AsyncEngine
+    DATABASE_ASYNC: bool = False
+    ASYNC_DATABASE_URL: Optional[str] = None
+    
+    @validator("ASYNC_DATABASE_URL", pre=True)
+    def assemble_async_db_connection(cls, v: Optional[str], values: Dict[str, Any]) -> Any:
+        """Derive the asyncpg URL from the database URL."""
+        if isinstance(v, str):
+            return v
+        url = str(values.get("DATABASE_URL") or "")
+        _, _, rest = url.partition("://")
+        return f"postgresql+asyncpg://{rest}" if rest else None
+    
+    # Bulk ingestion settings
+    BULK_UPSERT_CHUNK_SIZE: int = 1000  # Rows per INSERT ... ON CONFLICT statement and commit
+    BULK_MAX_ITEMS: int = 100_000
+    EXPORT_BATCH_SIZE: int = 5000  # Rows fetched per server-side cursor round trip
+    LOOKUP_MAX_KEYS: int = 1000  # Ids plus SKUs per batch lookup
+    
+    # Inventory settings
+    INVENTORY_MAX_MOVEMENTS: int = 50_000  # Movements per ingestion request
+    INVENTORY_MAX_RESERVATIONS: int = 1000  # Reservations per request
+    INVENTORY_LOW_STOCK_THRESHOLD: int = 10  # At or below this, products report "Low Stock"
+    SUPPLIERS_MAX_RECEIPTS: int = 10_000  # Supplier receipts per request
+    
+    # Response compression settings
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_BYTES: int = 1024  # Smaller bodies aren't worth the CPU
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4  # Fast enough for dynamic responses
+    
     # Redis settings
     REDIS_HOST: str
     REDIS_PORT: int = 6379
@@ -80,6 +120,18 @@ class Settings(BaseSettings):
         )
         return f"redis://{password_part}{values.get('REDIS_HOST')}:{values.get('REDIS_PORT')}"
     
+    # Cache settings
+    CACHE_ENABLED: bool = True
+    CACHE_PRODUCT_TTL_SECONDS: int = 300
+    CACHE_LIST_TTL_SECONDS: int = 30
+    CACHE_REDIS_TIMEOUT_SECONDS: float = 0.25
+    CACHE_REDIS_RETRY_SECONDS: float = 30.0  # Back-off after Redis errors before trying again
+    CACHE_LOCAL_MAX_BYTES: int = 64 * 1024 * 1024  # Per-worker in-process tier; 0 disables it
+    CACHE_LOCAL_TTL_SECONDS: float = 30.0  # Bounds how stale local copies get when an invalidation is missed
+    COUNT_CACHE_TTL_SECONDS: int = 300  # Unfiltered listing totals
+    COUNT_FILTERED_CACHE_TTL_SECONDS: int = 15  # Exact totals of name/search filtered listings
+    COUNT_ESTIMATE_MIN_ROWS: int = 100_000  # Below this an exact COUNT(*) is cheap enough
+    
     # Email settings
     SMTP_TLS: bool = True
     SMTP_PORT: Optional[int] = None
@@ -102,6 +154,30 @@ class Settings(BaseSettings):
     
     # Analytics settings
     FORECASTING_HORIZON_DAYS: int = 90  # Predict inventory needs for the next 90 days
+    FORECAST_HISTORY_DAYS: int = 365  # Days of demand history the models see
+    FORECAST_SEASONAL_PERIOD: int = 7  # Weekly seasonality for Holt-Winters
+    FORECAST_SEASONAL_MIN_DAYS: int = 56  # Less history than this gets SES instead of Holt-Winters
+    FORECAST_WORKERS: int = 0  # Processes for statsmodels fits; 0 uses every CPU
+    FORECAST_CHUNK_SIZE: int = 500  # SKUs per process pool task
+    REPLENISHMENT_SERVICE_LEVEL: float = 0.95  # Chance of not running out during a lead time
+    REPLENISHMENT_LEAD_TIME_DAYS: float = 14.0  # Used where no supplier lead time is known
+    REPLENISHMENT_LEAD_TIME_STD_DAYS: float = 0.0
+    REPLENISHMENT_ORDER_COST: float = 50.0  # Fixed cost of placing one order
+    REPLENISHMENT_HOLDING_RATE: float = 0.25  # Yearly holding cost as a fraction of price
+    
+    # Shipping settings; lengths in cm, weights in kg
+    SHIPPING_CARTONS: List[Dict[str, Any]] = [  # Inner dimensions, gross weight limit and empty weight
+        {"name": "S", "length": 25, "width": 20, "height": 10, "max_weight": 5, "tare": 0.15},
+        {"name": "M", "length": 40, "width": 30, "height": 20, "max_weight": 15, "tare": 0.35},
+        {"name": "L", "length": 60, "width": 40, "height": 40, "max_weight": 25, "tare": 0.7},
+        {"name": "XL", "length": 80, "width": 60, "height": 50, "max_weight": 30, "tare": 1.2},
+    ]
+    SHIPPING_FILL_FACTOR: float = 0.8  # Share of a carton's volume contents can fill
+    SHIPPING_DIM_DIVISOR: float = 5000.0  # cm³ per kg of dimensional weight
+    SHIPPING_BASE_RATE: float = 5.0  # Per package
+    SHIPPING_RATE_PER_KG: float = 1.2  # Per kg of billable weight
+    SHIPPING_MAX_ORDERS: int = 10_000  # Orders per quote request
+    SHIPPING_MAX_ORDER_UNITS: int = 1000  # Units per order
     
     # User registration
     USERS_OPEN_REGISTRATION: bool = False
@@ -1,18 +1,95 @@
 # app/database.py
+import time
+from typing import Any, Dict
+from uuid import uuid4
+
 from sqlalchemy import create_engine
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, QueuePool
 from app.config import settings
+from app.metrics import Counter, Histogram
 
 SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
 
+# Upper bounds (seconds) of the connection checkout wait histogram
+POOL_WAIT_BUCKETS = (0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 30.0)
+
+
+class _CheckoutTimingMixin:
+    """Record how long each checkout waits for a connection, and how many time out."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.wait_time = Histogram(POOL_WAIT_BUCKETS)
+        self.timeouts = Counter()
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            self.timeouts.inc()
+            raise
+        finally:
+            self.wait_time.observe(time.perf_counter() - start)
+
+
+class InstrumentedQueuePool(_CheckoutTimingMixin, QueuePool):
+    pass
+
+
+class InstrumentedAsyncQueuePool(_CheckoutTimingMixin, AsyncAdaptedQueuePool):
+    pass
+
+
+def _engine_options(pool_class) -> Dict[str, Any]:
+    """Pool options shared by the sync and async engines."""
+    if settings.DB_PGBOUNCER_MODE:
+        # PgBouncer owns the pool; holding idle connections here would pin server slots
+        return {"poolclass": NullPool}
+    return {
+        "poolclass": pool_class,
+        "pool_size": settings.DB_POOL_SIZE,
+        "max_overflow": settings.DB_MAX_OVERFLOW,
+        "pool_timeout": settings.DB_POOL_TIMEOUT,
+        "pool_recycle": settings.DB_POOL_RECYCLE,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,  # Test connections before using them
+    }
+
+
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     echo=settings.SQL_ECHO,  # Print SQL queries (useful for debugging)
-    pool_pre_ping=True,      # Test connections before using them
+    **_engine_options(InstrumentedQueuePool),
 )
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+# The async engine is only built when enabled, so asyncpg stays optional
+async_engine = None
+AsyncSessionLocal = None
+if settings.DATABASE_ASYNC:
+    connect_args = {}
+    if settings.DB_PGBOUNCER_MODE:
+        # Transaction-mode PgBouncer can't route asyncpg's named prepared statements:
+        # don't cache them, and name each one uniquely so names never collide on a
+        # server connection another client prepared statements on
+        connect_args = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": lambda: f"__asyncpg_{uuid4()}__",
+        }
+    async_engine = create_async_engine(
+        settings.ASYNC_DATABASE_URL,
+        echo=settings.SQL_ECHO,
+        connect_args=connect_args,
+        **_engine_options(InstrumentedAsyncQueuePool),
+    )
+    AsyncSessionLocal = async_sessionmaker(async_engine, expire_on_commit=False)
+
 Base = declarative_base()
 
 
@@ -23,3 +100,37 @@ def get_db():
         yield db
     finally:
         db.close()
+
+
+# Dependency to get an async DB session
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
+
+
+def dialect_insert(db, table):
+    """
+    Build an INSERT for the session's dialect that supports ON CONFLICT.
+
+    PostgreSQL in production, SQLite when the test suite falls back to it.
+    """
+    if db.get_bind().dialect.name == "sqlite":
+        return sqlite.insert(table)
+    return postgresql.insert(table)
+
+
+def pool_stats(pool) -> Dict[str, Any]:
+    """Live occupancy and checkout wait statistics for a connection pool."""
+    stats: Dict[str, Any] = {"pool_class": type(pool).__name__}
+    if isinstance(pool, QueuePool):
+        stats.update(
+            size=pool.size(),
+            checked_in=pool.checkedin(),
+            checked_out=pool.checkedout(),
+            # QueuePool counts unused base capacity as negative overflow
+            overflow=max(pool.overflow(), 0),
+        )
+    if isinstance(pool, _CheckoutTimingMixin):
+        stats["timeouts"] = pool.timeouts.value
+        stats["wait_seconds"] = pool.wait_time.snapshot()
+    return stats
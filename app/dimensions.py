@@ -0,0 +1,43 @@
+# app/dimensions.py
+"""
+Product dimensions.
+
+`products.dimensions` keeps the JSON string clients have always sent,
+`{"length": 10, "width": 5, "height": 2}`. Its numbers are also stored in
+the length, width, height and volume columns, which listings filter on and
+shipping quotes read. The two are written together: the model parses the
+string whenever it is set, and Core writers call `parse_dimensions`
+themselves.
+"""
+from typing import Dict, Optional
+
+import orjson
+
+DIMENSION_COLUMNS = ("length", "width", "height", "volume")
+
+
+def parse_dimensions(value: Optional[str]) -> Dict[str, Optional[float]]:
+    """Length, width, height and volume of a dimensions string; None where missing or unreadable."""
+    try:
+        parsed = orjson.loads(value) if value else None
+    except orjson.JSONDecodeError:
+        parsed = None
+    if not isinstance(parsed, dict):
+        parsed = {}
+    numbers = {}
+    for name in DIMENSION_COLUMNS[:3]:
+        number = parsed.get(name)
+        numbers[name] = float(number) if isinstance(number, (int, float)) and not isinstance(number, bool) else None
+    known = [number for number in numbers.values() if number is not None]
+    numbers["volume"] = known[0] * known[1] * known[2] if len(known) == 3 else None
+    return numbers
+
+
+def validate_dimensions(value: Optional[str]) -> Optional[str]:
+    """Pydantic validator: a dimensions string needs positive numeric length, width and height."""
+    if value is None:
+        return value
+    numbers = parse_dimensions(value)
+    if any(numbers[name] is None or numbers[name] <= 0 for name in DIMENSION_COLUMNS[:3]):
+        raise ValueError('dimensions must be a JSON object with positive numeric "length", "width" and "height"')
+    return value
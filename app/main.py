@@ -1,15 +1,28 @@
 # app/main.py
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.api.endpoints import products
+from fastapi.responses import ORJSONResponse
+from app.api.endpoints import analytics, internal, inventory, products, products_async, shipping, suppliers
+from app.cache import product_cache
 from app.config import settings
+from app.middleware import CompressionMiddleware
 
 # Initialize the FastAPI app
 app = FastAPI(
     title=settings.PROJECT_NAME,
-    openapi_url=f"{settings.API_V1_STR}/openapi.json"
+    openapi_url=f"{settings.API_V1_STR}/openapi.json",
+    default_response_class=ORJSONResponse,
 )
 
+# Compress large responses (gzip, or brotli when available and accepted)
+if settings.COMPRESSION_ENABLED:
+    app.add_middleware(
+        CompressionMiddleware,
+        minimum_size=settings.COMPRESSION_MIN_BYTES,
+        gzip_level=settings.COMPRESSION_GZIP_LEVEL,
+        brotli_quality=settings.COMPRESSION_BROTLI_QUALITY,
+    )
+
 # Configure CORS
 if settings.BACKEND_CORS_ORIGINS:
     app.add_middleware(
@@ -21,11 +34,24 @@ if settings.BACKEND_CORS_ORIGINS:
     )
 
 # Include API routers
+if settings.DATABASE_ASYNC:
+    # Registered first so its routes take precedence over their sync counterparts
+    app.include_router(products_async.router, prefix=f"{settings.API_V1_STR}/products", tags=["products"])
 app.include_router(products.router, prefix=f"{settings.API_V1_STR}/products", tags=["products"])
-# app.include_router(inventory.router, prefix=f"{settings.API_V1_STR}/inventory", tags=["inventory"])
-# app.include_router(suppliers.router, prefix=f"{settings.API_V1_STR}/suppliers", tags=["suppliers"])
-# app.include_router(analytics.router, prefix=f"{settings.API_V1_STR}/analytics", tags=["analytics"])
+app.include_router(inventory.router, prefix=f"{settings.API_V1_STR}/inventory", tags=["inventory"])
+app.include_router(suppliers.router, prefix=f"{settings.API_V1_STR}/suppliers", tags=["suppliers"])
+app.include_router(analytics.router, prefix=f"{settings.API_V1_STR}/analytics", tags=["analytics"])
+app.include_router(shipping.router, prefix=f"{settings.API_V1_STR}/shipping", tags=["shipping"])
 # app.include_router(orders.router, prefix=f"{settings.API_V1_STR}/orders", tags=["orders"])
+app.include_router(internal.router, prefix=f"{settings.API_V1_STR}/internal", tags=["internal"])
+
+@app.on_event("startup")
+def start_cache_listener():
+    product_cache.start_listener()
+
+@app.on_event("shutdown")
+def stop_cache_listener():
+    product_cache.stop_listener()
 
 @app.get("/")
 def root():
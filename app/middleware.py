@@ -0,0 +1,189 @@
+# app/middleware.py
+"""
+Negotiated response compression.
+
+Starlette's GZipMiddleware only speaks gzip. `CompressionMiddleware` picks
+brotli when the client accepts it and the optional `brotli` package is
+installed, and gzip otherwise. Streamed responses (such as the catalog
+export) are compressed chunk by chunk and flushed as they go, so clients
+still receive rows while the export runs.
+
+Every response that isn't already encoded varies on Accept-Encoding, so
+shared caches keep identity and compressed copies apart. A compressed
+response's entity tag gets the coding as a suffix ("abc" becomes
+"abc-gzip"), since its bytes differ from the identity representation's,
+and a 304 confirming a compressed copy (its If-None-Match carries the
+suffix of the coding negotiated now) repeats the suffixed tag;
+`decoded_etag` strips it again where tags sent back by clients are compared.
+"""
+import zlib
+from typing import Dict, Optional
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+try:
+    import brotli
+except ImportError:  # brotli is optional; without it only gzip is offered
+    brotli = None
+
+
+ENCODINGS = ("br", "gzip")
+
+
+def encoded_etag(etag: str, encoding: str) -> str:
+    """The entity tag of a representation compressed with `encoding`."""
+    if not etag.endswith('"'):
+        return etag
+    return f'{etag[:-1]}-{encoding}"'
+
+
+def decoded_etag(etag: str) -> str:
+    """An entity tag with any content-coding suffix from `encoded_etag` removed."""
+    for encoding in ENCODINGS:
+        suffix = f'-{encoding}"'
+        if etag.endswith(suffix):
+            return etag[:-len(suffix)] + '"'
+    return etag
+
+
+class _GzipEncoder:
+    def __init__(self, level: int):
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, 16 + zlib.MAX_WBITS)
+
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.compress(data) + self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def finish(self) -> bytes:
+        return self._compressor.flush()
+
+
+class _BrotliEncoder:
+    def __init__(self, quality: int):
+        self._compressor = brotli.Compressor(quality=quality)
+
+    def process(self, data: bytes) -> bytes:
+        return self._compressor.process(data) + self._compressor.flush()
+
+    def finish(self) -> bytes:
+        return self._compressor.finish()
+
+
+def negotiate_encoding(accept_encoding: str) -> Optional[str]:
+    """
+    The best supported content coding for an Accept-Encoding header, or None.
+
+    Codings are ranked by q-value; on a tie brotli wins over gzip.
+    """
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.lower().split(","):
+        coding, _, params = part.strip().partition(";")
+        weight = 1.0
+        for param in params.split(";"):
+            key, _, value = param.strip().partition("=")
+            if key == "q":
+                try:
+                    weight = float(value)
+                except ValueError:
+                    weight = 0.0
+        if coding:
+            weights[coding.strip()] = weight
+
+    available = ["br", "gzip"] if brotli is not None else ["gzip"]
+    best, best_weight = None, 0.0
+    for coding in available:
+        weight = weights.get(coding, weights.get("*", 0.0))
+        if weight > best_weight:
+            best, best_weight = coding, weight
+    return best
+
+
+class CompressionMiddleware:
+    """Compress responses of at least `minimum_size` bytes with gzip or brotli."""
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        gzip_level: int = 6,
+        brotli_quality: int = 4,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.gzip_level = gzip_level
+        self.brotli_quality = brotli_quality
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        request_headers = Headers(scope=scope)
+        encoding = negotiate_encoding(request_headers.get("accept-encoding", ""))
+        responder = _CompressionResponder(self, encoding, send, request_headers.get("if-none-match", ""))
+        await self.app(scope, receive, responder.send)
+
+
+class _CompressionResponder:
+    """Buffers the response start until the first body chunk decides whether to compress."""
+
+    def __init__(self, middleware: CompressionMiddleware, encoding: Optional[str], send: Send, if_none_match: str = ""):
+        self.middleware = middleware
+        self.encoding = encoding
+        # Whether the client's cached copy is one this coding compressed
+        self._holds_encoded = encoding is not None and f'-{encoding}"' in if_none_match
+        self._send = send
+        self._start: Optional[Message] = None
+        self._encoder = None
+        self._passthrough = False
+
+    def _make_encoder(self):
+        if self.encoding == "br":
+            return _BrotliEncoder(self.middleware.brotli_quality)
+        return _GzipEncoder(self.middleware.gzip_level)
+
+    async def send(self, message: Message):
+        if message["type"] == "http.response.start":
+            self._start = message
+            headers = MutableHeaders(raw=message["headers"])
+            if "content-encoding" not in headers:
+                headers.add_vary_header("Accept-Encoding")
+                if message["status"] == 304 and self._holds_encoded and "etag" in headers:
+                    # The client revalidated its compressed copy; confirm that copy's tag
+                    headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+            if self.encoding is None:
+                # The client takes no coding we offer; nothing to decide
+                self._passthrough = True
+                await self._send(message)
+            return
+        if message["type"] != "http.response.body" or self._passthrough:
+            await self._send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+        if self._encoder is None:
+            headers = MutableHeaders(raw=self._start["headers"])
+            if "content-encoding" in headers or (not more_body and len(body) < self.middleware.minimum_size):
+                self._passthrough = True
+                await self._send(self._start)
+                await self._send(message)
+                return
+
+            self._encoder = self._make_encoder()
+            headers["Content-Encoding"] = self.encoding
+            if "etag" in headers:
+                headers["ETag"] = encoded_etag(headers["etag"], self.encoding)
+            if more_body:
+                del headers["Content-Length"]
+            else:
+                body = self._encoder.process(body) + self._encoder.finish()
+                headers["Content-Length"] = str(len(body))
+                await self._send(self._start)
+                await self._send({"type": "http.response.body", "body": body})
+                return
+            await self._send(self._start)
+
+        body = self._encoder.process(body)
+        if not more_body:
+            body += self._encoder.finish()
+        await self._send({"type": "http.response.body", "body": body, "more_body": more_body})
@@ -0,0 +1,44 @@
+import numpy as np
+from sqlalchemy import BigInteger, Boolean, Column, Date, DateTime, Float, ForeignKey, Integer, LargeBinary, String
+from app.database import Base
+
+class DemandForecast(Base):
+    """
+    Latest daily demand forecast of a product, precomputed by
+    `app.services.forecasting.refresh_forecasts` so reads never fit models.
+    """
+    __tablename__ = "demand_forecasts"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    method = Column(String, nullable=False)  # ses, croston or holt_winters
+    start_date = Column(Date, nullable=False)  # Day of the first forecast value
+    daily = Column(LargeBinary, nullable=False)  # Little-endian float32 per day of the horizon
+    total = Column(Float, nullable=False)  # Units over the whole horizon
+    movement_watermark = Column(BigInteger, nullable=False)  # Ledger horizon when the history was read
+    computed_at = Column(DateTime(timezone=True), nullable=False)
+
+    @property
+    def values(self) -> np.ndarray:
+        return np.frombuffer(self.daily, dtype="<f4")
+
+    @property
+    def horizon_days(self) -> int:
+        return len(self.daily) // 4
+
+class ForecastRun(Base):
+    """
+    One forecast refresh; the latest run's watermark marks where the next one starts.
+
+    Watermarks are movement change horizons (app.changes): every movement
+    stamped below one was committed before the history was read, and those
+    stamped at or above it may not have been.
+    """
+    __tablename__ = "forecast_runs"
+
+    id = Column(Integer, primary_key=True)
+    full = Column(Boolean, nullable=False)  # Every product, rather than those with new demand
+    history_end = Column(Date, nullable=False)  # Demand before this day was read
+    movement_watermark = Column(BigInteger, nullable=False)
+    products = Column(Integer, nullable=False)  # Forecasts written
+    started_at = Column(DateTime(timezone=True), nullable=False)
+    finished_at = Column(DateTime(timezone=True), nullable=False)
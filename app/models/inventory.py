@@ -0,0 +1,103 @@
+from typing import Optional
+from sqlalchemy import BigInteger, CheckConstraint, Column, Integer, String, Boolean, ForeignKey, DateTime, Index
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.changes import next_movement_seq
+from app.config import settings
+from app.database import Base
+
+MOVEMENT_TYPES = ("receipt", "shipment", "adjustment", "return")
+RESERVATION_STATUSES = ("held", "released")
+
+def stock_status(available: Optional[int]) -> str:
+    """Customer-facing stock status for an available (unreserved) quantity, None if never stocked."""
+    if available is None:
+        return "Unknown"
+    if available <= 0:
+        return "Out of Stock"
+    if available <= settings.INVENTORY_LOW_STOCK_THRESHOLD:
+        return "Low Stock"
+    return "In Stock"
+
+class Warehouse(Base):
+    __tablename__ = "warehouses"
+
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String, unique=True, index=True, nullable=False)
+    name = Column(String, nullable=False)
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class StockMovement(Base):
+    """
+    Append-only ledger of stock changes. Rows are never updated; the current
+    position lives in `InventoryLevel` and `InventoryTotal`.
+    """
+    __tablename__ = "stock_movements"
+    __table_args__ = (
+        # Per-product history, newest last
+        Index("ix_stock_movements_product_id_id", "product_id", "id"),
+        # Demand history windows for forecasting
+        Index("ix_stock_movements_occurred_at", "occurred_at"),
+        # Demand recorded since a forecast refresh
+        Index("ix_stock_movements_change_seq", "change_seq"),
+    )
+
+    id = Column(BigInteger().with_variant(Integer, "sqlite"), primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False)
+    quantity = Column(Integer, nullable=False)  # Signed: receipts add stock, shipments remove it
+    movement_type = Column(String, nullable=False)  # receipt, shipment, adjustment or return
+    reference = Column(String)  # Order, ASN or count sheet the movement came from
+    occurred_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Stamped on insert, see app.changes
+    change_seq = Column(BigInteger, nullable=False, default=next_movement_seq())
+
+class InventoryLevel(Base):
+    """On-hand and reserved stock per product and warehouse, maintained from the ledger."""
+    __tablename__ = "inventory_levels"
+    __table_args__ = (
+        CheckConstraint("reserved >= 0", name="ck_inventory_levels_reserved"),
+    )
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id"), primary_key=True)
+    on_hand = Column(Integer, nullable=False, default=0)
+    reserved = Column(Integer, nullable=False, default=0)  # Held for orders, still on hand
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+class InventoryTotal(Base):
+    """On-hand stock per product across warehouses, so reads never SUM() the levels."""
+    __tablename__ = "inventory_totals"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    on_hand = Column(Integer, nullable=False, default=0)
+    reserved = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    @property
+    def available(self) -> int:
+        return self.on_hand - self.reserved
+
+class StockReservation(Base):
+    """Stock held for an order until it ships or the hold is released."""
+    __tablename__ = "stock_reservations"
+
+    id = Column(Integer, primary_key=True, index=True)
+    reference = Column(String, index=True)  # Order or cart the stock is held for
+    status = Column(String, nullable=False, default="held")  # held or released
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    released_at = Column(DateTime(timezone=True))
+
+    lines = relationship("StockReservationLine", order_by="StockReservationLine.id")
+
+class StockReservationLine(Base):
+    """Quantity of one product held at one warehouse for a reservation."""
+    __tablename__ = "stock_reservation_lines"
+
+    id = Column(Integer, primary_key=True)
+    reservation_id = Column(Integer, ForeignKey("stock_reservations.id"), nullable=False, index=True)
+    product_id = Column(Integer, ForeignKey("products.id"), nullable=False)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id"), nullable=False)
+    quantity = Column(Integer, nullable=False)
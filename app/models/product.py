@@ -1,11 +1,36 @@
-from sqlalchemy import Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Text
-from sqlalchemy.orm import relationship
+from datetime import datetime
+from typing import Optional
+from sqlalchemy import BigInteger, Column, Integer, String, Float, Boolean, ForeignKey, DateTime, Text, Index, DDL, event, text
+from sqlalchemy.orm import relationship, validates
 from sqlalchemy.sql import func
+from app.changes import next_change_seq
 from app.database import Base
+from app.dimensions import parse_dimensions
+from app.models.inventory import InventoryTotal, stock_status
+from app.models.supplier import SupplierProduct
 
 #     category_id = Column(Integer, ForeignKey("categories.id"))
 class Product(Base):
     __tablename__ = "products"
+    __table_args__ = (
+        # Listings filter on is_active and page in id order
+        Index("ix_products_is_active_id", "is_active", "id"),
+        # Name-ordered keyset pages over active products, the storefront hot path
+        Index(
+            "ix_products_active_name_id", "name", "id",
+            postgresql_where=text("is_active"), sqlite_where=text("is_active = 1"),
+        ),
+        # Substring and similarity search on name (PostgreSQL only, needs pg_trgm)
+        Index(
+            "ix_products_name_trgm", "name",
+            postgresql_using="gin", postgresql_ops={"name": "gin_trgm_ops"},
+        ).ddl_if(dialect="postgresql"),
+        # Change feed pages in (change_seq, id) order
+        Index("ix_products_change_seq_id", "change_seq", "id"),
+        # Size and weight range filters of the listing
+        Index("ix_products_volume", "volume"),
+        Index("ix_products_weight", "weight"),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     sku = Column(String, unique=True, index=True, nullable=False)
@@ -14,6 +39,51 @@ class Product(Base):
     price = Column(Float, nullable=False)
     weight = Column(Float)  # For shipping calculations
     dimensions = Column(String)  # Stored as JSON string "{"length": 10, "width": 5, "height": 2}"
+    # Parsed from dimensions on every write, so queries and shipping quotes never parse JSON (app.dimensions)
+    length = Column(Float)
+    width = Column(Float)
+    height = Column(Float)
+    volume = Column(Float)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
\ No newline at end of file
+    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
+    # Stamped on every insert and update, see app.changes
+    change_seq = Column(BigInteger, nullable=False, default=next_change_seq(), onupdate=next_change_seq())
+
+    # Summary kept up to date by the inventory ledger; detail reads load it eagerly
+    inventory_total = relationship(InventoryTotal, uselist=False, viewonly=True)
+    # Suppliers of the product and their terms; detail reads load them eagerly
+    suppliers = relationship(SupplierProduct, viewonly=True, order_by=SupplierProduct.supplier_id)
+
+    @validates("dimensions")
+    def _sync_dimensions(self, key, value):
+        for name, number in parse_dimensions(value).items():
+            setattr(self, name, number)
+        return value
+
+    @property
+    def last_modified(self) -> Optional[datetime]:
+        """Latest change to the product, its stock summary or its supplier terms."""
+        stamps = [self.updated_at or self.created_at]
+        if self.inventory_total is not None:
+            stamps.append(self.inventory_total.updated_at)
+        stamps.extend(supplier.updated_at for supplier in self.suppliers)
+        return max((stamp for stamp in stamps if stamp is not None), default=None)
+
+    @property
+    def total_inventory(self) -> int:
+        return self.inventory_total.on_hand if self.inventory_total is not None else 0
+
+    @property
+    def available_inventory(self) -> int:
+        return self.inventory_total.available if self.inventory_total is not None else 0
+
+    @property
+    def stock_status(self) -> str:
+        return stock_status(self.inventory_total.available if self.inventory_total is not None else None)
+
+event.listen(
+    Product.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -0,0 +1,22 @@
+from sqlalchemy import Column, DateTime, Float, ForeignKey, Integer
+from app.database import Base
+
+class ReplenishmentPlan(Base):
+    """
+    Reorder point, safety stock and order quantity of a product at a
+    warehouse, recomputed for the whole catalog by
+    `app.services.replenishment.refresh_replenishment`.
+    """
+    __tablename__ = "replenishment_plans"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    warehouse_id = Column(Integer, ForeignKey("warehouses.id"), primary_key=True)
+    demand_rate = Column(Float, nullable=False)  # Expected units per day
+    demand_std = Column(Float, nullable=False)  # Standard deviation of daily demand
+    lead_time_days = Column(Float, nullable=False)
+    safety_stock = Column(Float, nullable=False)
+    reorder_point = Column(Float, nullable=False)  # Order when available stock falls to this
+    economic_order_quantity = Column(Float, nullable=False)
+    available = Column(Integer, nullable=False)  # On hand less reserved when planned
+    order_quantity = Column(Integer, nullable=False)  # Suggested order now; 0 above the reorder point
+    computed_at = Column(DateTime(timezone=True), nullable=False)
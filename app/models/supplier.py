@@ -0,0 +1,71 @@
+import math
+from sqlalchemy import Boolean, Column, DateTime, Float, ForeignKey, Integer, String
+from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
+from app.config import settings
+from app.database import Base
+
+class Supplier(Base):
+    __tablename__ = "suppliers"
+
+    id = Column(Integer, primary_key=True, index=True)
+    code = Column(String, unique=True, index=True, nullable=False)
+    name = Column(String, nullable=False)
+    capacity = Column(Integer)  # Units it can supply per sourcing run across products; NULL is unlimited
+    is_active = Column(Boolean, default=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+class SupplierProduct(Base):
+    """
+    A product a supplier can deliver, with its terms and observed lead times.
+
+    Lead-time statistics are kept with Welford's running mean and sum of
+    squared deviations (`lead_time_m2`), merged in per receipt batch, so they
+    never need a rescan of past receipts.
+    """
+    __tablename__ = "supplier_products"
+
+    supplier_id = Column(Integer, ForeignKey("suppliers.id"), primary_key=True)
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True, index=True)
+    unit_cost = Column(Float)  # NULL until quoted; sourcing skips unpriced products
+    capacity = Column(Integer)  # Units per sourcing run; NULL is unlimited
+    quoted_lead_time_days = Column(Float)  # Used until receipts have been observed
+    lead_time_samples = Column(Integer, nullable=False, default=0)
+    lead_time_mean = Column(Float, nullable=False, default=0.0)  # Days
+    lead_time_m2 = Column(Float, nullable=False, default=0.0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    supplier = relationship(Supplier, lazy="joined", innerjoin=True)
+
+    @property
+    def supplier_code(self) -> str:
+        return self.supplier.code
+
+    @property
+    def supplier_name(self) -> str:
+        return self.supplier.name
+
+    @property
+    def lead_time_days(self) -> float:
+        if self.lead_time_samples:
+            return self.lead_time_mean
+        if self.quoted_lead_time_days is not None:
+            return self.quoted_lead_time_days
+        return settings.REPLENISHMENT_LEAD_TIME_DAYS
+
+    @property
+    def lead_time_std_days(self) -> float:
+        if self.lead_time_samples > 1:
+            return math.sqrt(self.lead_time_m2 / (self.lead_time_samples - 1))
+        return settings.REPLENISHMENT_LEAD_TIME_STD_DAYS
+
+class SourcingAllocation(Base):
+    """Units of a product to order from a supplier, from the latest sourcing run."""
+    __tablename__ = "sourcing_allocations"
+
+    product_id = Column(Integer, ForeignKey("products.id"), primary_key=True)
+    supplier_id = Column(Integer, ForeignKey("suppliers.id"), primary_key=True, index=True)
+    quantity = Column(Integer, nullable=False)
+    unit_cost = Column(Float, nullable=False)
+    lead_time_days = Column(Float, nullable=False)
+    computed_at = Column(DateTime(timezone=True), nullable=False)
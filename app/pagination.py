@@ -0,0 +1,30 @@
+# app/pagination.py
+import base64
+import binascii
+import json
+from typing import Any, List
+
+
+class InvalidCursor(ValueError):
+    """Raised when a client supplies a cursor we did not issue."""
+
+
+def encode_cursor(kind: str, values: List[Any]) -> str:
+    """Encode a keyset position as an opaque, URL-safe token."""
+    payload = json.dumps({"k": kind, "v": values}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(token: str, kind: str) -> List[Any]:
+    """Decode a token produced by `encode_cursor` for the given keyset kind."""
+    try:
+        padded = token + "=" * (-len(token) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (binascii.Error, UnicodeDecodeError, ValueError) as exc:
+        raise InvalidCursor("Malformed cursor") from exc
+    if not isinstance(payload, dict) or payload.get("k") != kind:
+        raise InvalidCursor(f"Cursor was not issued for '{kind}' ordering")
+    values = payload.get("v")
+    if not isinstance(values, list):
+        raise InvalidCursor("Malformed cursor")
+    return values
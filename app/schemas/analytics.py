@@ -0,0 +1,54 @@
+# app/schemas/analytics.py
+from typing import List, Optional
+from pydantic import BaseModel
+from datetime import date, datetime
+
+class ProductForecast(BaseModel):
+    """Stored daily demand forecast of a product, starting on `start_date`."""
+    product_id: int
+    method: str
+    start_date: date
+    horizon_days: int
+    daily: List[float]
+    total: float  # Units over the whole horizon
+    computed_at: datetime
+    stale: bool  # Newer demand has been recorded, or the forecast is from an earlier day
+
+class ForecastRun(BaseModel):
+    id: int
+    full: bool
+    history_end: date
+    movement_watermark: int
+    products: int  # Forecasts written
+    started_at: datetime
+    finished_at: datetime
+
+    class Config:
+        orm_mode = True  # For Pydantic v1
+        from_attributes = True  # For Pydantic v2
+
+class ReplenishmentPlan(BaseModel):
+    product_id: int
+    warehouse_id: int
+    demand_rate: float  # Expected units per day
+    demand_std: float
+    lead_time_days: float
+    safety_stock: float
+    reorder_point: float
+    economic_order_quantity: float
+    available: int
+    order_quantity: int  # Suggested order now; 0 above the reorder point
+    computed_at: datetime
+
+    class Config:
+        orm_mode = True  # For Pydantic v1
+        from_attributes = True  # For Pydantic v2
+
+class ReplenishmentPage(BaseModel):
+    items: List[ReplenishmentPlan]
+    next_cursor: Optional[str] = None
+
+class ReplenishmentRun(BaseModel):
+    plans: int  # (product, warehouse) pairs planned
+    reorders: int  # Pairs at or below their reorder point
+    computed_at: datetime
@@ -0,0 +1,136 @@
+# app/schemas/inventory.py
+from typing import Optional, List
+from pydantic import BaseModel, Field, root_validator, validator
+from datetime import datetime
+from app.models.inventory import MOVEMENT_TYPES
+
+class WarehouseBase(BaseModel):
+    code: str
+    name: str
+    is_active: bool = True
+
+class WarehouseCreate(WarehouseBase):
+    pass
+
+class Warehouse(WarehouseBase):
+    id: int
+    created_at: datetime
+    
+    class Config:
+        orm_mode = True  # For Pydantic v1
+        from_attributes = True  # For Pydantic v2
+
+class StockMovementCreate(BaseModel):
+    """One ledger entry. Products are given by id or SKU, warehouses by id or code."""
+    product_id: Optional[int] = None
+    sku: Optional[str] = None
+    warehouse_id: Optional[int] = None
+    warehouse_code: Optional[str] = None
+    quantity: int  # Signed change in on-hand stock
+    movement_type: str
+    reference: Optional[str] = None
+    occurred_at: Optional[datetime] = None
+    
+    @validator("quantity")
+    def quantity_not_zero(cls, v):
+        if v == 0:
+            raise ValueError("quantity must not be zero")
+        return v
+    
+    @validator("movement_type")
+    def known_movement_type(cls, v):
+        if v not in MOVEMENT_TYPES:
+            raise ValueError(f"movement_type must be one of {', '.join(MOVEMENT_TYPES)}")
+        return v
+    
+    @root_validator(skip_on_failure=True)
+    def product_and_warehouse_given(cls, values):
+        if values.get("product_id") is None and not values.get("sku"):
+            raise ValueError("product_id or sku is required")
+        if values.get("warehouse_id") is None and not values.get("warehouse_code"):
+            raise ValueError("warehouse_id or warehouse_code is required")
+        return values
+
+class StockMovementError(BaseModel):
+    index: int
+    error: str
+
+class StockMovementBatchResult(BaseModel):
+    """Summary of a movement batch. Accepted movements are committed together."""
+    accepted: int = 0
+    failed: int = 0
+    errors: List[StockMovementError] = []
+
+class InventoryLevel(BaseModel):
+    warehouse_id: int
+    warehouse_code: str
+    on_hand: int
+    reserved: int = 0
+    updated_at: Optional[datetime] = None
+
+class ProductInventory(BaseModel):
+    product_id: int
+    total_inventory: int = 0
+    available_inventory: int = 0
+    stock_status: str = "Unknown"
+    levels: List[InventoryLevel] = []
+
+class ReservationLine(BaseModel):
+    """Stock to hold for one product, at a given warehouse or wherever it's available."""
+    product_id: Optional[int] = None
+    sku: Optional[str] = None
+    quantity: int = Field(..., gt=0)
+    warehouse_id: Optional[int] = None
+    warehouse_code: Optional[str] = None
+    
+    @root_validator(skip_on_failure=True)
+    def product_given(cls, values):
+        if values.get("product_id") is None and not values.get("sku"):
+            raise ValueError("product_id or sku is required")
+        return values
+
+class ReservationCreate(BaseModel):
+    reference: Optional[str] = None
+    lines: List[ReservationLine] = Field(..., min_items=1)
+
+class ReservationAllocation(BaseModel):
+    product_id: int
+    warehouse_id: int
+    quantity: int
+    
+    class Config:
+        orm_mode = True  # For Pydantic v1
+        from_attributes = True  # For Pydantic v2
+
+class ReservationShortage(BaseModel):
+    line: int
+    product_id: Optional[int] = None
+    requested: int
+    available: int
+
+class ReservationResult(BaseModel):
+    """Outcome of one reservation; either every line is held or none is."""
+    index: int
+    reference: Optional[str] = None
+    status: str  # held or rejected
+    id: Optional[int] = None
+    allocations: List[ReservationAllocation] = []
+    shortages: List[ReservationShortage] = []
+    error: Optional[str] = None
+
+class ReservationBatchResult(BaseModel):
+    held: int = 0
+    rejected: int = 0
+    results: List[ReservationResult] = []
+
+class Reservation(BaseModel):
+    id: int
+    reference: Optional[str] = None
+    status: str
+    created_at: datetime
+    released_at: Optional[datetime] = None
+    lines: List[ReservationAllocation] = []
+    
+    class Config:
+        orm_mode = True  # For Pydantic v1
+        from_attributes = True  # For Pydantic v2
@@ -1,7 +1,14 @@
 # app/schemas/product.py
 from typing import Optional, List, Dict, Any
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, Field, validator
 from datetime import datetime
+import orjson
+from app.dimensions import validate_dimensions
+from app.schemas.supplier import SupplierProduct
+
+def orjson_dumps(value: Any, *, default) -> str:
+    # Pydantic v1 hook for fast .json(); integer dict keys are written as strings like json.dumps
+    return orjson.dumps(value, default=default, option=orjson.OPT_NON_STR_KEYS).decode()
 
 class ProductBase(BaseModel):
     sku: str
@@ -9,7 +16,7 @@ class ProductBase(BaseModel):
     description: Optional[str] = None
     price: float = Field(..., gt=0)
     weight: Optional[float] = None
-    dimensions: Optional[str] = None  # JSON string
+    dimensions: Optional[str] = None  # JSON string, e.g. '{"length": 10, "width": 5, "height": 2}'
     is_active: bool = True
 
 class ProductUpdate(BaseModel):
@@ -19,23 +26,85 @@ class ProductUpdate(BaseModel):
     weight: Optional[float] = None
     dimensions: Optional[str] = None
     is_active: Optional[bool] = None
+    
+    _check_dimensions = validator("dimensions", allow_reuse=True)(validate_dimensions)
 
 class ProductCreate(ProductBase):
-    pass
+    # Only input is checked, so rows stored before validation still read back
+    _check_dimensions = validator("dimensions", allow_reuse=True)(validate_dimensions)
 
 class Product(ProductBase):
     id: int
+    # Parsed from dimensions, read only
+    length: Optional[float] = None
+    width: Optional[float] = None
+    height: Optional[float] = None
+    volume: Optional[float] = None
     created_at: datetime
     updated_at: Optional[datetime] = None
     
     class Config:
         orm_mode = True  # For Pydantic v1
         from_attributes = True  # For Pydantic v2
+        json_loads = orjson.loads
+        json_dumps = orjson_dumps
+
+class ProductPage(BaseModel):
+    """A page of products, for cursor pagination or when a total is requested."""
+    items: List[Product]
+    next_cursor: Optional[str] = None
+    total: Optional[int] = None
+    total_is_estimate: bool = False
+    
+    class Config:
+        json_dumps = orjson_dumps
+
+class ProductBulkItemResult(BaseModel):
+    """Outcome of a single row of a bulk upsert."""
+    index: int
+    sku: Optional[str] = None
+    status: str  # created, updated or error
+    id: Optional[int] = None
+    error: Optional[str] = None
+
+class ProductBulkResult(BaseModel):
+    """Summary of a bulk upsert."""
+    created: int = 0
+    updated: int = 0
+    failed: int = 0
+    results: List[ProductBulkItemResult] = []
+
+class ProductChanges(BaseModel):
+    """A page of the product change feed."""
+    items: List[Product]
+    next_since: Optional[str] = None  # Token for the next poll
+    has_more: bool = False
+    
+    class Config:
+        json_dumps = orjson_dumps
+
+class ProductLookup(BaseModel):
+    """Keys of a batch product lookup."""
+    ids: List[int] = []
+    skus: List[str] = []
+
+class ProductLookupResult(BaseModel):
+    """Products found by a batch lookup, keyed in request order."""
+    by_id: Dict[int, Product] = {}
+    by_sku: Dict[str, Product] = {}
+    missing_ids: List[int] = []
+    missing_skus: List[str] = []
+    
+    class Config:
+        json_dumps = orjson_dumps
 
 class ProductDetail(Product):
-    # total_inventory: int = 0
-    # stock_status: str = "Unknown"
-    # suppliers: Optional[List[Dict[str, Any]]] = None
+    change_seq: int  # Row version, what If-Match compares (app.conditional)
+    total_inventory: int = 0
+    available_inventory: int = 0  # On hand less reserved
+    stock_status: str = "Unknown"
+    suppliers: List[SupplierProduct] = []
+    last_modified: Optional[datetime] = None  # Latest change to the product, its stock or supplier terms
     
     class Config:
         orm_mode = True  # For Pydantic v1
@@ -0,0 +1,46 @@
+# app/schemas/shipping.py
+from typing import Optional, List
+from pydantic import BaseModel, Field, root_validator
+
+class ShippingOrderLine(BaseModel):
+    product_id: Optional[int] = None
+    sku: Optional[str] = None
+    quantity: int = Field(..., gt=0)
+
+    @root_validator(skip_on_failure=True)
+    def product_given(cls, values):
+        if values.get("product_id") is None and not values.get("sku"):
+            raise ValueError("product_id or sku is required")
+        return values
+
+class ShippingOrder(BaseModel):
+    reference: Optional[str] = None
+    lines: List[ShippingOrderLine] = Field(..., min_items=1)
+
+class ShippingPackageItem(BaseModel):
+    product_id: int
+    quantity: int
+
+class ShippingPackage(BaseModel):
+    """One box of a quote, rated on the greater of its actual and dimensional weight."""
+    carton: Optional[str] = None  # None for an item too large for any carton, shipped as is
+    length: float
+    width: float
+    height: float
+    weight: float  # Contents plus the empty carton
+    dimensional_weight: float
+    billable_weight: float
+    cost: float
+    items: List[ShippingPackageItem] = []
+
+class ShippingQuote(BaseModel):
+    index: int
+    reference: Optional[str] = None
+    cost: Optional[float] = None
+    packages: List[ShippingPackage] = []
+    error: Optional[str] = None
+
+class ShippingQuoteBatchResult(BaseModel):
+    quoted: int = 0
+    failed: int = 0
+    results: List[ShippingQuote] = []
@@ -0,0 +1,107 @@
+# app/schemas/supplier.py
+from typing import Optional, List
+from pydantic import BaseModel, Field, root_validator, validator
+from datetime import datetime, timezone
+from app.schemas.inventory import StockMovementError
+
+class SupplierBase(BaseModel):
+    code: str
+    name: str
+    capacity: Optional[int] = Field(None, ge=0)  # Units per sourcing run across products
+    is_active: bool = True
+
+class SupplierCreate(SupplierBase):
+    pass
+
+class Supplier(SupplierBase):
+    id: int
+    created_at: datetime
+    
+    class Config:
+        orm_mode = True  # For Pydantic v1
+        from_attributes = True  # For Pydantic v2
+
+class SupplierProductUpdate(BaseModel):
+    """Terms a supplier offers for a product."""
+    unit_cost: Optional[float] = Field(None, gt=0)
+    capacity: Optional[int] = Field(None, ge=0)  # Units per sourcing run
+    quoted_lead_time_days: Optional[float] = Field(None, ge=0)
+
+class SupplierProduct(BaseModel):
+    """A supplier's terms for a product, with lead times observed from receipts."""
+    supplier_id: int
+    supplier_code: str
+    supplier_name: str
+    product_id: int
+    unit_cost: Optional[float] = None
+    capacity: Optional[int] = None
+    lead_time_days: float  # Observed mean, or the quote until receipts arrive
+    lead_time_std_days: float
+    lead_time_samples: int
+    
+    class Config:
+        orm_mode = True  # For Pydantic v1
+        from_attributes = True  # For Pydantic v2
+
+class SupplierReceiptCreate(BaseModel):
+    """Goods received against a purchase order placed at `ordered_at`."""
+    supplier_id: Optional[int] = None
+    supplier_code: Optional[str] = None
+    product_id: Optional[int] = None
+    sku: Optional[str] = None
+    warehouse_id: Optional[int] = None
+    warehouse_code: Optional[str] = None
+    quantity: int = Field(..., gt=0)
+    unit_cost: Optional[float] = Field(None, gt=0)  # Updates the supplier's cost for the product
+    ordered_at: datetime
+    received_at: Optional[datetime] = None  # Defaults to now
+    reference: Optional[str] = None  # Purchase order number
+    
+    @validator("ordered_at", "received_at")
+    def to_utc(cls, v):
+        # Timestamps without an offset are taken to be UTC
+        if v is None:
+            return v
+        return v.replace(tzinfo=timezone.utc) if v.tzinfo is None else v.astimezone(timezone.utc)
+    
+    @root_validator(skip_on_failure=True)
+    def references_given(cls, values):
+        if values.get("supplier_id") is None and not values.get("supplier_code"):
+            raise ValueError("supplier_id or supplier_code is required")
+        if values.get("product_id") is None and not values.get("sku"):
+            raise ValueError("product_id or sku is required")
+        if values.get("warehouse_id") is None and not values.get("warehouse_code"):
+            raise ValueError("warehouse_id or warehouse_code is required")
+        if values["ordered_at"] > (values.get("received_at") or datetime.now(timezone.utc)):
+            raise ValueError("ordered_at must not be after received_at, or now if not given")
+        return values
+
+class SupplierReceiptBatchResult(BaseModel):
+    """Summary of a receipt batch. Accepted receipts are committed together."""
+    accepted: int = 0
+    failed: int = 0
+    errors: List[StockMovementError] = []
+
+class SourcingAllocation(BaseModel):
+    product_id: int
+    supplier_id: int
+    quantity: int
+    unit_cost: float
+    lead_time_days: float
+    computed_at: datetime
+    
+    class Config:
+        orm_mode = True  # For Pydantic v1
+        from_attributes = True  # For Pydantic v2
+
+class SourcingRun(BaseModel):
+    products: int  # Products with quantities to source
+    allocated: int  # Units assigned to suppliers
+    unallocated: int  # Units no active, priced supplier had capacity for
+    solver: str  # greedy, or highs when supplier capacities couple products
+    computed_at: datetime
+
+class SourcingSummary(BaseModel):
+    products: int  # Products with allocations
+    allocated: int  # Units assigned to suppliers
+    computed_at: datetime
@@ -0,0 +1,34 @@
+# app/search.py
+from sqlalchemy import Float
+from sqlalchemy.ext.compiler import compiles
+from sqlalchemy.sql.functions import FunctionElement
+
+
+def contains_pattern(term: str) -> str:
+    """LIKE pattern matching `term` anywhere, with LIKE wildcards in it escaped."""
+    escaped = term.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+class name_similarity(FunctionElement):
+    """
+    Relevance of a column to a search term, higher is better.
+
+    PostgreSQL uses pg_trgm's `similarity()`, which the trigram GIN index on
+    products.name makes cheap to filter on. Other databases (the SQLite test
+    fallback) get a coarse score that ranks prefix matches first.
+    """
+    type = Float()
+    inherit_cache = True
+    name = "name_similarity"
+
+
+@compiles(name_similarity, "postgresql")
+def _pg_name_similarity(element, compiler, **kw):
+    return "similarity(%s)" % compiler.process(element.clauses, **kw)
+
+
+@compiles(name_similarity)
+def _default_name_similarity(element, compiler, **kw):
+    column, term = (compiler.process(clause, **kw) for clause in element.clauses)
+    return f"CASE WHEN substr(lower({column}), 1, length({term})) = lower({term}) THEN 1.0 ELSE 0.5 END"
@@ -0,0 +1,379 @@
+# app/services/forecasting.py
+"""
+Demand forecasting across the whole catalog at once.
+
+Daily demand (units shipped) for every SKU is loaded with one aggregate
+query into a dense (skus x days) NumPy matrix. The simple methods run on
+the matrix as a whole: each step of the smoothing recursion is a vector
+operation over all SKUs, so the Python loop runs once per day of history,
+not once per SKU and day.
+
+- Simple exponential smoothing (SES) for steady demand, with the smoothing
+  constant picked per SKU from a grid by in-sample one-step error.
+- Croston's method, with the Syntetos-Boylan bias correction, for
+  intermittent demand where most days sell nothing.
+- Holt-Winters with weekly seasonality for steady SKUs with enough history.
+  These are fitted one SKU at a time by statsmodels, so they run in a
+  process pool, a chunk of SKUs per task. Whole-catalog refreshes belong
+  in a scheduled job (scripts/refresh_forecasts.py), not a web worker.
+
+`forecast()` with method "auto" classifies each SKU by its average demand
+interval and picks one of the above.
+
+`refresh_forecasts()` stores the results in `demand_forecasts` for the API
+to read. The first refresh of a day is full; later ones only refit the
+products whose demand changed since the previous run.
+"""
+import multiprocessing
+import os
+import warnings
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, NamedTuple, Optional
+
+import numpy as np
+from sqlalchemy import delete, func, or_, select
+from sqlalchemy.orm import Session
+
+from app.changes import movement_horizon
+from app.config import settings
+from app.database import dialect_insert
+from app.models.forecast import DemandForecast, ForecastRun
+from app.models.inventory import StockMovement
+
+METHODS = ("auto", "ses", "croston", "holt_winters")
+SES_ALPHAS = np.array([0.05, 0.1, 0.2, 0.3, 0.5])
+CROSTON_ALPHA = 0.1
+# Syntetos-Boylan cut-off: SKUs selling on fewer than 1 in 1.32 days are intermittent
+INTERMITTENT_ADI = 1.32
+
+
+class DemandHistory(NamedTuple):
+    """Daily demand per SKU: row i of `demand` belongs to `product_ids[i]`."""
+    product_ids: np.ndarray  # (skus,) int64
+    start: date  # Day of column 0
+    demand: np.ndarray  # (skus, days) float64
+
+
+class Forecast(NamedTuple):
+    """Daily forecasts per SKU for the days after the history ends."""
+    product_ids: np.ndarray  # (skus,) int64
+    start: date  # Day of column 0
+    methods: np.ndarray  # (skus,) method used for each SKU
+    daily: np.ndarray  # (skus, horizon) float64
+
+
+def load_demand_history(
+    db: Session,
+    product_ids: Optional[Iterable[int]] = None,
+    days: Optional[int] = None,
+    end: Optional[date] = None,
+) -> DemandHistory:
+    """
+    Load daily shipped units per product for the `days` days before `end`.
+
+    Shipments are aggregated per product and day in the database, so only
+    days with sales cross the wire; the rest of the matrix is zeros. Rows
+    are sorted by product id. Restrict to `product_ids` to refresh a subset;
+    products that never shipped get an all-zero row.
+    """
+    days = days or settings.FORECAST_HISTORY_DAYS
+    end = end or date.today()
+    start = end - timedelta(days=days)
+    day = func.date(StockMovement.occurred_at)
+    stmt = (
+        select(StockMovement.product_id, day, func.sum(-StockMovement.quantity))
+        .where(
+            StockMovement.movement_type == "shipment",
+            StockMovement.occurred_at >= start,
+            StockMovement.occurred_at < end,
+        )
+        .group_by(StockMovement.product_id, day)
+    )
+    if product_ids is not None:
+        product_ids = np.unique(np.fromiter(product_ids, dtype=np.int64))
+        stmt = stmt.where(StockMovement.product_id.in_(product_ids.tolist()))
+    rows = db.execute(stmt).all()
+
+    if rows:
+        row_products, row_days, row_units = zip(*rows)
+        row_products = np.array(row_products, dtype=np.int64)
+        # date() is a date on PostgreSQL and an ISO string on SQLite; both parse
+        offsets = (np.array(row_days, dtype="datetime64[D]") - np.datetime64(start, "D")).astype(np.int64)
+        row_units = np.array(row_units, dtype=np.float64)
+    else:
+        row_products = np.empty(0, dtype=np.int64)
+        offsets = np.empty(0, dtype=np.int64)
+        row_units = np.empty(0, dtype=np.float64)
+
+    if product_ids is None:
+        product_ids = np.unique(row_products)
+    demand = np.zeros((len(product_ids), days))
+    demand[np.searchsorted(product_ids, row_products), offsets] = row_units
+    # Returns and corrections can net a day below zero; that isn't negative demand
+    np.maximum(demand, 0, out=demand)
+    return DemandHistory(product_ids=product_ids, start=start, demand=demand)
+
+
+def first_sale(demand: np.ndarray) -> np.ndarray:
+    """Column of each SKU's first day with demand, or the number of days if it never sold."""
+    selling = demand > 0
+    return np.where(selling.any(axis=1), selling.argmax(axis=1), demand.shape[1])
+
+
+def average_demand_interval(demand: np.ndarray) -> np.ndarray:
+    """
+    Days per day with demand since each SKU's first sale; inf if it never sold.
+
+    Rows are zero padded to the full window, so counting from the first
+    sale keeps new SKUs from looking intermittent.
+    """
+    selling_days = np.count_nonzero(demand > 0, axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return (demand.shape[1] - first_sale(demand)) / selling_days
+
+
+def ses(demand: np.ndarray, alphas: np.ndarray = SES_ALPHAS):
+    """
+    Simple exponential smoothing of every SKU for every alpha in `alphas`.
+
+    Returns the final level per SKU, which is the flat forecast, and the
+    alpha that gave the lowest in-sample one-step squared error.
+    """
+    skus, days = demand.shape
+    if not days:
+        return np.zeros(skus), np.full(skus, alphas[0])
+    level = np.repeat(demand[:, :1], len(alphas), axis=1)  # (skus, alphas)
+    sse = np.zeros_like(level)
+    for t in range(1, days):
+        observed = demand[:, t:t + 1]
+        error = observed - level
+        sse += error * error
+        level += alphas * error
+    best = np.argmin(sse, axis=1)
+    rows = np.arange(skus)
+    return level[rows, best], alphas[best]
+
+
+def croston(demand: np.ndarray, alpha: float = CROSTON_ALPHA) -> np.ndarray:
+    """
+    Croston's method with the Syntetos-Boylan correction for every SKU.
+
+    Demand sizes and the intervals between demands are smoothed separately,
+    updating only on days with demand. Both start from their means over the
+    history rather than the first observation, which a small alpha would
+    take most of the history to forget. Returns the daily demand rate per SKU.
+    """
+    skus, days = demand.shape
+    selling = demand > 0
+    seen = selling.any(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        size = np.where(seen, demand.sum(axis=1) / selling.sum(axis=1), 0.0)
+        interval = np.where(seen, average_demand_interval(demand), 1.0)
+    since = np.ones(skus)  # Days since the last demand, counting today
+    started = np.zeros(skus, dtype=bool)
+    for t in range(days):
+        observed = demand[:, t]
+        hit = selling[:, t]
+        update = hit & started
+        size[update] += alpha * (observed[update] - size[update])
+        interval[update] += alpha * (since[update] - interval[update])
+        started |= hit
+        since = np.where(hit, 1, since + 1)
+    return size / interval * (1 - alpha / 2)
+
+
+def _holt_winters_chunk(demand: np.ndarray, horizon: int, period: int) -> np.ndarray:
+    """Fit additive Holt-Winters to each row; runs in a worker process."""
+    # Imported here so the API processes never pay for statsmodels
+    from statsmodels.tools.sm_exceptions import ConvergenceWarning
+    from statsmodels.tsa.holtwinters import ExponentialSmoothing
+
+    forecasts = np.empty((len(demand), horizon))
+    with warnings.catch_warnings():
+        warnings.simplefilter("ignore", ConvergenceWarning)
+        warnings.simplefilter("ignore", RuntimeWarning)
+        for i, series in enumerate(demand):
+            try:
+                fit = ExponentialSmoothing(
+                    series, trend=None, seasonal="add", seasonal_periods=period,
+                    initialization_method="estimated",
+                ).fit()
+                forecasts[i] = fit.forecast(horizon)
+            except (ValueError, np.linalg.LinAlgError):
+                forecasts[i] = np.nan  # Falls back to SES
+    return np.maximum(forecasts, 0, out=forecasts)
+
+
+def holt_winters(
+    demand: np.ndarray,
+    horizon: int,
+    period: Optional[int] = None,
+    workers: Optional[int] = None,
+) -> np.ndarray:
+    """
+    Seasonal forecasts for every row of `demand`, fitted in a process pool.
+
+    Rows are sent to the workers in chunks so each task carries enough fits
+    to outweigh its pickling. Rows whose fit fails come back as NaN.
+    With a single worker, fits run in this process.
+
+    Workers are spawned rather than forked: a fork would copy the caller's
+    threads, pooled database connections and Redis sockets into the child.
+    """
+    period = period or settings.FORECAST_SEASONAL_PERIOD
+    workers = workers or settings.FORECAST_WORKERS or os.cpu_count() or 1
+    if workers == 1 or len(demand) < 2:
+        return _holt_winters_chunk(demand, horizon, period)
+
+    # Small batches still spread over every worker
+    chunk_size = min(settings.FORECAST_CHUNK_SIZE, -(-len(demand) // workers))
+    chunks = [demand[start:start + chunk_size] for start in range(0, len(demand), chunk_size)]
+    with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn")) as pool:
+        results = pool.map(
+            _holt_winters_chunk, chunks, [horizon] * len(chunks), [period] * len(chunks)
+        )
+        return np.concatenate(list(results))
+
+
+def forecast(
+    history: DemandHistory,
+    horizon: Optional[int] = None,
+    method: str = "auto",
+    workers: Optional[int] = None,
+) -> Forecast:
+    """
+    Forecast daily demand of every SKU in `history` for `horizon` days.
+
+    "auto" uses Croston for intermittent SKUs, Holt-Winters for steady SKUs
+    with at least FORECAST_SEASONAL_MIN_DAYS of history and SES for the rest.
+    """
+    if method not in METHODS:
+        raise ValueError(f"Unknown forecasting method {method!r}; expected one of {', '.join(METHODS)}")
+    horizon = horizon or settings.FORECASTING_HORIZON_DAYS
+    demand = history.demand
+    skus, days = demand.shape
+    start = history.start + timedelta(days=days)
+
+    if method == "auto":
+        adi = average_demand_interval(demand)
+        methods = np.where(adi > INTERMITTENT_ADI, "croston", "ses").astype(object)
+        seasonal = (methods == "ses") & (days - first_sale(demand) >= settings.FORECAST_SEASONAL_MIN_DAYS)
+        methods[seasonal] = "holt_winters"
+    else:
+        methods = np.full(skus, method, dtype=object)
+
+    daily = np.empty((skus, horizon))
+    rate, _ = ses(demand)
+    daily[:] = rate[:, None]
+    intermittent = methods == "croston"
+    if intermittent.any():
+        daily[intermittent] = croston(demand[intermittent])[:, None]
+    seasonal = methods == "holt_winters"
+    if seasonal.any():
+        fitted = holt_winters(demand[seasonal], horizon, workers=workers)
+        failed = np.isnan(fitted).any(axis=1)
+        fitted[failed] = rate[seasonal][failed, None]
+        daily[seasonal] = fitted
+        methods[np.flatnonzero(seasonal)[failed]] = "ses"
+
+    return Forecast(product_ids=history.product_ids, start=start, methods=methods, daily=daily)
+
+
+def demand_changed_since(db: Session, run: ForecastRun, end: date) -> np.ndarray:
+    """
+    Products whose demand before `end` changed since `run` read its history.
+
+    That is shipments stamped at or above the run's watermark, including
+    backdated ones, plus shipments on days that have entered the window
+    since the run's history ended. Movements that were still being written
+    when the run started are above its watermark, whatever their id.
+    """
+    product_ids = db.execute(
+        select(StockMovement.product_id).distinct().where(
+            StockMovement.movement_type == "shipment",
+            StockMovement.occurred_at < end,
+            or_(
+                StockMovement.change_seq >= run.movement_watermark,
+                StockMovement.occurred_at >= run.history_end,
+            ),
+        )
+    ).scalars().all()
+    return np.array(sorted(product_ids), dtype=np.int64)
+
+
+def store_forecasts(db: Session, result: Forecast, movement_watermark: int, computed_at: datetime):
+    """Upsert a forecast per product into `demand_forecasts`. Does not commit."""
+    rows = [
+        {
+            "product_id": int(product_id),
+            "method": method,
+            "start_date": result.start,
+            "daily": daily.astype("<f4").tobytes(),
+            "total": float(daily.sum()),
+            "movement_watermark": movement_watermark,
+            "computed_at": computed_at,
+        }
+        for product_id, method, daily in zip(result.product_ids, result.methods, result.daily)
+    ]
+    for start in range(0, len(rows), settings.BULK_UPSERT_CHUNK_SIZE):
+        stmt = dialect_insert(db, DemandForecast.__table__).values(rows[start:start + settings.BULK_UPSERT_CHUNK_SIZE])
+        stmt = stmt.on_conflict_do_update(
+            index_elements=["product_id"],
+            set_={
+                column: stmt.excluded[column]
+                for column in ("method", "start_date", "daily", "total", "movement_watermark", "computed_at")
+            },
+        )
+        db.execute(stmt)
+
+
+def refresh_forecasts(
+    db: Session,
+    full: Optional[bool] = None,
+    end: Optional[date] = None,
+    method: str = "auto",
+    workers: Optional[int] = None,
+) -> ForecastRun:
+    """
+    Recompute stored forecasts and record the run.
+
+    By default the first run for a new `end` day is full, so every forecast
+    rolls forward a day, and later runs that day are incremental. A full
+    run also drops forecasts of products with no demand left in the window.
+
+    The ledger watermark is read before the history, so movements that land
+    or commit while the run is in progress are picked up again by the next one.
+    """
+    started_at = datetime.now(timezone.utc)
+    end = end or date.today()
+    last = db.execute(select(ForecastRun).order_by(ForecastRun.id.desc()).limit(1)).scalar_one_or_none()
+    if last is None:
+        full = True
+    elif full is None:
+        last_full_end = db.execute(select(func.max(ForecastRun.history_end)).where(ForecastRun.full)).scalar()
+        full = last_full_end is None or last_full_end < end
+
+    watermark = db.execute(select(movement_horizon())).scalar_one()
+    product_ids = None if full else demand_changed_since(db, last, end)
+    count = 0
+    if product_ids is None or len(product_ids):
+        history = load_demand_history(db, product_ids=product_ids, end=end)
+        count = len(history.product_ids)
+        if count:
+            store_forecasts(db, forecast(history, method=method, workers=workers), watermark, started_at)
+    if full:
+        db.execute(delete(DemandForecast).where(DemandForecast.start_date < end))
+
+    run = ForecastRun(
+        full=full,
+        history_end=end,
+        movement_watermark=watermark,
+        products=count,
+        started_at=started_at,
+        finished_at=datetime.now(timezone.utc),
+    )
+    db.add(run)
+    db.commit()
+    db.refresh(run)
+    return run
@@ -0,0 +1,280 @@
+# app/services/inventory.py
+"""
+Stock ledger ingestion and reservations.
+
+Movements are appended to `stock_movements` and folded into the
+`inventory_levels` (per warehouse) and `inventory_totals` (per product)
+summaries in the same transaction, so reads never aggregate the ledger.
+A batch is resolved and validated up front, then written with one
+executemany INSERT plus one upsert per summary table.
+
+Every write path touches summary rows in the same order, levels by
+(product_id, warehouse_id) and then totals by product_id, so concurrent
+batches queue behind each other on hot SKUs instead of deadlocking.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import bindparam, func, insert, select, update
+from sqlalchemy.orm import Session
+
+from app.cache import product_cache
+from app.config import settings
+from app.database import dialect_insert
+from app.models.inventory import (
+    InventoryLevel,
+    InventoryTotal,
+    StockMovement,
+    StockReservation,
+    StockReservationLine,
+    Warehouse,
+)
+from app.models.product import Product
+from app.schemas import inventory as inventory_schemas
+
+
+def lookup_ids(db: Session, column, key_column, keys: Iterable) -> Dict[Any, int]:
+    """Map `keys` of `key_column` to ids of `column`'s table, with one query."""
+    keys = set(keys)
+    if not keys:
+        return {}
+    return dict(db.execute(select(key_column, column).where(key_column.in_(keys))).all())
+
+
+def _chunks(rows: List[dict], size: int) -> Iterable[List[dict]]:
+    for start in range(0, len(rows), size):
+        yield rows[start:start + size]
+
+
+def apply_stock_deltas(db: Session, deltas: Dict[Tuple[int, int], int]):
+    """
+    Add on-hand deltas, keyed by (product_id, warehouse_id), to the summaries.
+
+    Rows are upserted in key order so concurrent batches lock summary rows
+    in the same order and can't deadlock. Does not commit.
+    """
+    level_rows = [
+        {"product_id": product_id, "warehouse_id": warehouse_id, "on_hand": delta}
+        for (product_id, warehouse_id), delta in sorted(deltas.items()) if delta
+    ]
+    totals: Dict[int, int] = defaultdict(int)
+    for row in level_rows:
+        totals[row["product_id"]] += row["on_hand"]
+    total_rows = [
+        {"product_id": product_id, "on_hand": delta}
+        for product_id, delta in sorted(totals.items()) if delta
+    ]
+
+    for model, rows, keys in (
+        (InventoryLevel, level_rows, ["product_id", "warehouse_id"]),
+        (InventoryTotal, total_rows, ["product_id"]),
+    ):
+        for chunk in _chunks(rows, settings.BULK_UPSERT_CHUNK_SIZE):
+            stmt = dialect_insert(db, model.__table__).values(chunk)
+            stmt = stmt.on_conflict_do_update(
+                index_elements=keys,
+                set_={"on_hand": model.on_hand + stmt.excluded.on_hand, "updated_at": func.now()},
+            )
+            db.execute(stmt)
+
+
+def record_movements(db: Session, raw_items: List[Any]) -> inventory_schemas.StockMovementBatchResult:
+    """Validate a batch of movements and commit the valid ones in one transaction."""
+    result = inventory_schemas.StockMovementBatchResult()
+    valid: List[Tuple[int, inventory_schemas.StockMovementCreate]] = []
+    for index, raw in enumerate(raw_items):
+        try:
+            if isinstance(raw, Exception):
+                raise ValueError(f"Invalid JSON: {raw}")
+            valid.append((index, inventory_schemas.StockMovementCreate.parse_obj(raw)))
+        except (ValidationError, ValueError) as exc:
+            result.errors.append(inventory_schemas.StockMovementError(index=index, error=str(exc)))
+
+    # Resolve every product and warehouse reference with one query per kind
+    product_ids = lookup_ids(db, Product.id, Product.sku, (m.sku for _, m in valid if m.product_id is None))
+    product_ids.update(lookup_ids(db, Product.id, Product.id, (m.product_id for _, m in valid if m.product_id is not None)))
+    warehouse_ids = lookup_ids(
+        db, Warehouse.id, Warehouse.code, (m.warehouse_code for _, m in valid if m.warehouse_id is None)
+    )
+    warehouse_ids.update(lookup_ids(
+        db, Warehouse.id, Warehouse.id, (m.warehouse_id for _, m in valid if m.warehouse_id is not None)
+    ))
+
+    now = datetime.now(timezone.utc)
+    movements: List[dict] = []
+    deltas: Dict[Tuple[int, int], int] = defaultdict(int)
+    for index, movement in valid:
+        product_id: Optional[int] = product_ids.get(
+            movement.product_id if movement.product_id is not None else movement.sku
+        )
+        warehouse_id: Optional[int] = warehouse_ids.get(
+            movement.warehouse_id if movement.warehouse_id is not None else movement.warehouse_code
+        )
+        if product_id is None or warehouse_id is None:
+            missing = "Product" if product_id is None else "Warehouse"
+            result.errors.append(inventory_schemas.StockMovementError(index=index, error=f"{missing} not found"))
+            continue
+        movements.append({
+            "product_id": product_id,
+            "warehouse_id": warehouse_id,
+            "quantity": movement.quantity,
+            "movement_type": movement.movement_type,
+            "reference": movement.reference,
+            "occurred_at": movement.occurred_at or now,
+        })
+        deltas[(product_id, warehouse_id)] += movement.quantity
+
+    if movements:
+        for chunk in _chunks(movements, settings.BULK_UPSERT_CHUNK_SIZE):
+            db.execute(insert(StockMovement), chunk)
+        apply_stock_deltas(db, deltas)
+        db.commit()
+        # Stock shows in product details only, so cached list pages stay valid
+        product_cache.invalidate_products({product_id for product_id, _ in deltas}, lists=False)
+
+    result.accepted = len(movements)
+    result.failed = len(result.errors)
+    result.errors.sort(key=lambda error: error.index)
+    return result
+
+
+def _apply_reserved_deltas(db: Session, deltas: Dict[Tuple[int, int], int]):
+    """Add reserved deltas, keyed by (product_id, warehouse_id), to the summaries. Does not commit."""
+    totals: Dict[int, int] = defaultdict(int)
+    for (product_id, _), delta in deltas.items():
+        totals[product_id] += delta
+
+    for table, rows, keys in (
+        (
+            InventoryLevel.__table__,
+            [{"p": p, "w": w, "delta": d} for (p, w), d in sorted(deltas.items()) if d],
+            ("product_id", "warehouse_id"),
+        ),
+        (
+            InventoryTotal.__table__,
+            [{"p": p, "delta": d} for p, d in sorted(totals.items()) if d],
+            ("product_id",),
+        ),
+    ):
+        if not rows:
+            continue
+        stmt = update(table).where(table.c.product_id == bindparam("p"))
+        if "warehouse_id" in keys:
+            stmt = stmt.where(table.c.warehouse_id == bindparam("w"))
+        stmt = stmt.values(reserved=table.c.reserved + bindparam("delta"), updated_at=func.now())
+        db.execute(stmt, rows)
+
+
+def reserve_stock(
+    db: Session, reservations: List[inventory_schemas.ReservationCreate]
+) -> inventory_schemas.ReservationBatchResult:
+    """
+    Hold stock for a batch of reservations, each one all-or-nothing.
+
+    Every inventory level the batch could draw from is locked up front with
+    a single SELECT ... FOR UPDATE in (product_id, warehouse_id) order.
+    Concurrent reservers on the same SKUs therefore wait for each other
+    rather than skipping rows (as SKIP LOCKED would) and rejecting orders
+    that could have been filled. Reservations are then allocated in request
+    order against the locked rows, and the held quantities are written back
+    before a single commit.
+    """
+    result = inventory_schemas.ReservationBatchResult()
+    lines = [line for reservation in reservations for line in reservation.lines]
+    product_ids = lookup_ids(db, Product.id, Product.sku, (line.sku for line in lines if line.product_id is None))
+    product_ids.update(lookup_ids(db, Product.id, Product.id, (line.product_id for line in lines if line.product_id is not None)))
+    warehouse_ids = lookup_ids(db, Warehouse.id, Warehouse.code, (line.warehouse_code for line in lines if line.warehouse_code))
+    warehouse_ids.update(lookup_ids(db, Warehouse.id, Warehouse.id, (line.warehouse_id for line in lines if line.warehouse_id is not None)))
+
+    available: Dict[Tuple[int, int], int] = {}
+    warehouses_of: Dict[int, List[int]] = defaultdict(list)
+    if product_ids:
+        locked = db.execute(
+            select(InventoryLevel.product_id, InventoryLevel.warehouse_id, InventoryLevel.on_hand, InventoryLevel.reserved)
+            .where(InventoryLevel.product_id.in_(set(product_ids.values())))
+            .order_by(InventoryLevel.product_id, InventoryLevel.warehouse_id)
+            .with_for_update()
+        ).all()
+        for product_id, warehouse_id, on_hand, reserved in locked:
+            available[(product_id, warehouse_id)] = on_hand - reserved
+            warehouses_of[product_id].append(warehouse_id)
+
+    deltas: Dict[Tuple[int, int], int] = defaultdict(int)
+    held: List[Tuple[inventory_schemas.ReservationResult, StockReservation]] = []
+    for index, reservation in enumerate(reservations):
+        outcome = inventory_schemas.ReservationResult(index=index, reference=reservation.reference, status="rejected")
+        result.results.append(outcome)
+        taken: Dict[Tuple[int, int], int] = defaultdict(int)
+        for line_number, line in enumerate(reservation.lines):
+            product_id = product_ids.get(line.product_id if line.product_id is not None else line.sku)
+            warehouse_key = line.warehouse_id if line.warehouse_id is not None else line.warehouse_code
+            if product_id is None or (warehouse_key is not None and warehouse_key not in warehouse_ids):
+                missing = "Product" if product_id is None else "Warehouse"
+                outcome.error = f"Line {line_number}: {missing} not found"
+                break
+
+            if warehouse_key is not None:
+                candidates = [warehouse_ids[warehouse_key]]
+            else:
+                # Fill from the fullest warehouses first to split orders as little as possible
+                candidates = sorted(
+                    warehouses_of[product_id],
+                    key=lambda w: available[(product_id, w)] - taken[(product_id, w)],
+                    reverse=True,
+                )
+            remaining = line.quantity
+            for warehouse_id in candidates:
+                free = available.get((product_id, warehouse_id), 0) - taken[(product_id, warehouse_id)]
+                take = min(free, remaining)
+                if take > 0:
+                    taken[(product_id, warehouse_id)] += take
+                    remaining -= take
+                if not remaining:
+                    break
+            if remaining:
+                outcome.shortages.append(inventory_schemas.ReservationShortage(
+                    line=line_number, product_id=product_id,
+                    requested=line.quantity, available=line.quantity - remaining,
+                ))
+        if outcome.error or outcome.shortages:
+            continue
+
+        outcome.status = "held"
+        db_reservation = StockReservation(reference=reservation.reference, status="held")
+        for (product_id, warehouse_id), quantity in taken.items():
+            if quantity:
+                available[(product_id, warehouse_id)] -= quantity
+                deltas[(product_id, warehouse_id)] += quantity
+                db_reservation.lines.append(StockReservationLine(
+                    product_id=product_id, warehouse_id=warehouse_id, quantity=quantity
+                ))
+                outcome.allocations.append(inventory_schemas.ReservationAllocation(
+                    product_id=product_id, warehouse_id=warehouse_id, quantity=quantity
+                ))
+        db.add(db_reservation)
+        held.append((outcome, db_reservation))
+
+    if held:
+        _apply_reserved_deltas(db, deltas)
+        db.flush()
+        for outcome, db_reservation in held:
+            outcome.id = db_reservation.id
+    db.commit()
+    if held:
+        product_cache.invalidate_products({product_id for product_id, _ in deltas}, lists=False)
+
+    result.held = len(held)
+    result.rejected = len(reservations) - len(held)
+    return result
+
+
+def release_reservation(db: Session, reservation: StockReservation):
+    """Return a held reservation's stock to available and mark it released. Does not commit."""
+    deltas: Dict[Tuple[int, int], int] = defaultdict(int)
+    for line in reservation.lines:
+        deltas[(line.product_id, line.warehouse_id)] -= line.quantity
+    _apply_reserved_deltas(db, deltas)
+    reservation.status = "released"
+    reservation.released_at = func.now()
@@ -0,0 +1,259 @@
+# app/services/replenishment.py
+"""
+Reorder points, safety stock and economic order quantities for every
+active product at every warehouse, in one pass.
+
+Inputs are read with a handful of aggregate queries into columns, one entry
+per (product, warehouse) pair, and the plan is computed with NumPy over
+whole columns:
+
+    safety stock   = z * sqrt(L * sd^2 + d^2 * sL^2)
+    reorder point  = d * L + safety stock
+    EOQ            = sqrt(2 * yearly demand * order cost / yearly holding cost)
+
+where d and sd are the mean and standard deviation of daily demand, L and
+sL those of the lead time in days, from the product's cheapest supplier,
+and z the standard normal quantile of REPLENISHMENT_SERVICE_LEVEL. The
+daily demand rate comes from the stored product forecast, split across
+warehouses by their share of recent shipments, and falls back to the
+historical mean where there is no forecast.
+"""
+from datetime import date, datetime, timedelta, timezone
+from typing import NamedTuple, Optional
+
+import numpy as np
+from scipy.stats import norm
+from sqlalchemy import delete, func, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import dialect_insert
+from app.models.forecast import DemandForecast
+from app.models.inventory import InventoryLevel, StockMovement
+from app.models.product import Product
+from app.models.replenishment import ReplenishmentPlan
+from app.schemas import analytics as analytics_schemas
+from app.services.suppliers import primary_lead_times
+
+_PLAN_COLUMNS = (
+    "demand_rate", "demand_std", "lead_time_days", "safety_stock", "reorder_point",
+    "economic_order_quantity", "available", "order_quantity", "computed_at",
+)
+
+
+class PlanningInputs(NamedTuple):
+    """One entry per (product, warehouse) pair, sorted by product then warehouse."""
+    product_ids: np.ndarray  # int64
+    warehouse_ids: np.ndarray  # int64
+    price: np.ndarray
+    available: np.ndarray  # On hand less reserved; 0 where nothing is stocked
+    demand_rate: np.ndarray  # Expected units per day
+    demand_std: np.ndarray  # Of daily demand over the history window
+
+
+class Plan(NamedTuple):
+    safety_stock: np.ndarray
+    reorder_point: np.ndarray
+    economic_order_quantity: np.ndarray
+    order_quantity: np.ndarray  # int64
+
+
+def _pair_keys(product_ids: np.ndarray, warehouse_ids: np.ndarray) -> np.ndarray:
+    return (product_ids.astype(np.int64) << 32) | warehouse_ids.astype(np.int64)
+
+
+def _columns(rows, dtypes):
+    """Transpose query rows into one NumPy array per column."""
+    if not rows:
+        return [np.empty(0, dtype=dtype) for dtype in dtypes]
+    return [np.array(column, dtype=dtype) for column, dtype in zip(zip(*rows), dtypes)]
+
+
+def load_planning_inputs(db: Session, days: Optional[int] = None, end: Optional[date] = None) -> PlanningInputs:
+    """
+    Read stock, demand and forecasts of active products with three queries.
+
+    Pairs are every warehouse holding a level for the product plus every
+    warehouse that shipped it within the last `days` days.
+    """
+    days = days or settings.FORECAST_HISTORY_DAYS
+    end = end or date.today()
+    start = end - timedelta(days=days)
+
+    level_p, level_w, level_available, level_price = _columns(db.execute(
+        select(
+            InventoryLevel.product_id, InventoryLevel.warehouse_id,
+            InventoryLevel.on_hand - InventoryLevel.reserved, Product.price,
+        )
+        .join(Product, Product.id == InventoryLevel.product_id)
+        .where(Product.is_active)
+    ).all(), (np.int64, np.int64, np.int64, np.float64))
+
+    # Daily totals first, so the standard deviation is of daily demand
+    day = func.date(StockMovement.occurred_at)
+    daily = (
+        select(
+            StockMovement.product_id, StockMovement.warehouse_id,
+            day.label("day"), func.sum(-StockMovement.quantity).label("units"),
+        )
+        .where(
+            StockMovement.movement_type == "shipment",
+            StockMovement.occurred_at >= start,
+            StockMovement.occurred_at < end,
+        )
+        .group_by(StockMovement.product_id, StockMovement.warehouse_id, day)
+        .subquery()
+    )
+    demand_p, demand_w, demand_first, demand_sum, demand_sumsq, demand_price = _columns(db.execute(
+        select(
+            daily.c.product_id, daily.c.warehouse_id, func.min(daily.c.day),
+            func.sum(daily.c.units), func.sum(daily.c.units * daily.c.units), Product.price,
+        )
+        .join(Product, Product.id == daily.c.product_id)
+        .where(Product.is_active)
+        .group_by(daily.c.product_id, daily.c.warehouse_id, Product.price)
+    ).all(), (np.int64, np.int64, "datetime64[D]", np.float64, np.float64, np.float64))
+
+    forecast_p, forecast_total, forecast_days = _columns(db.execute(
+        select(DemandForecast.product_id, DemandForecast.total, func.length(DemandForecast.daily) / 4)
+    ).all(), (np.int64, np.float64, np.float64))
+
+    level_keys = _pair_keys(level_p, level_w)
+    demand_keys = _pair_keys(demand_p, demand_w)
+    keys = np.union1d(level_keys, demand_keys)
+    product_ids, warehouse_ids = keys >> 32, keys & 0xFFFFFFFF
+    at_level = np.searchsorted(keys, level_keys)
+    at_demand = np.searchsorted(keys, demand_keys)
+
+    price = np.zeros(len(keys))
+    price[at_demand] = demand_price
+    price[at_level] = level_price
+    available = np.zeros(len(keys), dtype=np.int64)
+    available[at_level] = level_available
+
+    # Statistics run from the first shipment, so new pairs don't look intermittent
+    observed_days = np.full(len(keys), days)
+    observed_days[at_demand] = (np.datetime64(end, "D") - demand_first).astype(np.int64)
+    shipped = np.zeros(len(keys))
+    shipped[at_demand] = demand_sum
+    mean = shipped / observed_days
+    sumsq = np.zeros(len(keys))
+    sumsq[at_demand] = demand_sumsq
+    std = np.sqrt(np.maximum(sumsq / observed_days - mean * mean, 0))
+
+    # Split each product's forecast across its warehouses by shipped share
+    products, pair_product = np.unique(product_ids, return_inverse=True)
+    product_shipped = np.bincount(pair_product, weights=shipped, minlength=len(products))
+    with np.errstate(divide="ignore", invalid="ignore"):
+        share = np.where(product_shipped[pair_product] > 0, shipped / product_shipped[pair_product], 0.0)
+    forecast_rate = np.full(len(products), np.nan)
+    known = np.isin(forecast_p, products)
+    forecast_rate[np.searchsorted(products, forecast_p[known])] = forecast_total[known] / forecast_days[known]
+    pair_forecast = forecast_rate[pair_product]
+    rate = np.where(np.isnan(pair_forecast), mean, pair_forecast * share)
+
+    return PlanningInputs(
+        product_ids=product_ids,
+        warehouse_ids=warehouse_ids,
+        price=price,
+        available=available,
+        demand_rate=rate,
+        demand_std=std,
+    )
+
+
+def plan_replenishment(
+    inputs: PlanningInputs,
+    lead_time_days=None,
+    lead_time_std_days=None,
+    service_level: Optional[float] = None,
+) -> Plan:
+    """
+    Compute the plan for every pair in `inputs` at once.
+
+    Lead times are scalars or per-pair arrays and default to the
+    REPLENISHMENT_LEAD_TIME settings. A pair at or below its reorder point
+    gets an order of the EOQ plus its shortfall below the reorder point.
+    """
+    lead_time = settings.REPLENISHMENT_LEAD_TIME_DAYS if lead_time_days is None else lead_time_days
+    lead_time_std = settings.REPLENISHMENT_LEAD_TIME_STD_DAYS if lead_time_std_days is None else lead_time_std_days
+    z = norm.ppf(service_level or settings.REPLENISHMENT_SERVICE_LEVEL)
+
+    rate, std = inputs.demand_rate, inputs.demand_std
+    safety_stock = z * np.sqrt(lead_time * std * std + rate * rate * lead_time_std * lead_time_std)
+    reorder_point = rate * lead_time + safety_stock
+
+    yearly_demand = rate * 365
+    holding_cost = inputs.price * settings.REPLENISHMENT_HOLDING_RATE
+    with np.errstate(divide="ignore", invalid="ignore"):
+        eoq = np.where(
+            (yearly_demand > 0) & (holding_cost > 0),
+            np.sqrt(2 * yearly_demand * settings.REPLENISHMENT_ORDER_COST / holding_cost),
+            0.0,
+        )
+
+    reorder = (rate > 0) & (inputs.available <= reorder_point)
+    order_quantity = np.where(reorder, np.ceil(eoq + reorder_point - inputs.available), 0).astype(np.int64)
+    return Plan(
+        safety_stock=safety_stock,
+        reorder_point=reorder_point,
+        economic_order_quantity=eoq,
+        order_quantity=order_quantity,
+    )
+
+
+def store_plans(db: Session, inputs: PlanningInputs, plan: Plan, lead_time_days, computed_at: datetime):
+    """Upsert every pair's plan into `replenishment_plans`. Does not commit."""
+    size = len(inputs.product_ids)
+    columns = {
+        "product_id": inputs.product_ids.tolist(),
+        "warehouse_id": inputs.warehouse_ids.tolist(),
+        "demand_rate": inputs.demand_rate.tolist(),
+        "demand_std": inputs.demand_std.tolist(),
+        "lead_time_days": np.broadcast_to(np.asarray(lead_time_days, dtype=np.float64), size).tolist(),
+        "safety_stock": plan.safety_stock.tolist(),
+        "reorder_point": plan.reorder_point.tolist(),
+        "economic_order_quantity": plan.economic_order_quantity.tolist(),
+        "available": inputs.available.tolist(),
+        "order_quantity": plan.order_quantity.tolist(),
+        "computed_at": [computed_at] * size,
+    }
+    rows = [dict(zip(columns, values)) for values in zip(*columns.values())]
+
+    stmt = dialect_insert(db, ReplenishmentPlan.__table__)
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["product_id", "warehouse_id"],
+        set_={column: stmt.excluded[column] for column in _PLAN_COLUMNS},
+    )
+    # executemany, batched into multi-row statements by the driver layer
+    for start in range(0, size, settings.BULK_UPSERT_CHUNK_SIZE * 10):
+        db.execute(stmt, rows[start:start + settings.BULK_UPSERT_CHUNK_SIZE * 10])
+
+
+def refresh_replenishment(
+    db: Session, lead_time_days=None, lead_time_std_days=None
+) -> analytics_schemas.ReplenishmentRun:
+    """
+    Recompute and store the plan of every active product at every warehouse.
+
+    Lead times default to those of each product's cheapest supplier. Plans
+    of pairs that are no longer planned, such as deactivated products, are
+    removed.
+    """
+    computed_at = datetime.now(timezone.utc)
+    inputs = load_planning_inputs(db)
+    if lead_time_days is None or lead_time_std_days is None:
+        products, pair_product = np.unique(inputs.product_ids, return_inverse=True)
+        mean, std = primary_lead_times(db, products)
+        lead_time_days = mean[pair_product] if lead_time_days is None else lead_time_days
+        lead_time_std_days = std[pair_product] if lead_time_std_days is None else lead_time_std_days
+
+    plan = plan_replenishment(inputs, lead_time_days, lead_time_std_days)
+    store_plans(db, inputs, plan, lead_time_days, computed_at)
+    db.execute(delete(ReplenishmentPlan).where(ReplenishmentPlan.computed_at < computed_at))
+    db.commit()
+    return analytics_schemas.ReplenishmentRun(
+        plans=len(inputs.product_ids),
+        reorders=int(np.count_nonzero(plan.order_quantity)),
+        computed_at=computed_at,
+    )
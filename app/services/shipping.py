@@ -0,0 +1,248 @@
+# app/services/shipping.py
+"""
+Cartonization and rate quotes for batches of orders.
+
+An order's units are packed into the SHIPPING_CARTONS with first-fit
+decreasing: products in order of decreasing unit volume go into the first
+open carton with room for them, and otherwise open a carton of the largest
+size they fit. Identical units are placed as many at a time as a carton
+takes, so large quantities cost one step per carton rather than per unit.
+Each carton is then shrunk to the smallest size that still holds its
+contents.
+
+A unit fits a carton when its dimensions, largest first, are within the
+carton's, so any orientation counts. Contents may fill SHIPPING_FILL_FACTOR
+of a carton's volume, since real items never pack perfectly, and weigh up
+to its limit less the empty carton. A unit too large or heavy for every
+carton ships on its own, as is. Units without dimensions are packed on
+weight alone.
+
+Packages are rated on billable weight, the greater of actual weight and
+dimensional weight (length * width * height / SHIPPING_DIM_DIVISOR):
+
+    cost = SHIPPING_BASE_RATE + SHIPPING_RATE_PER_KG * billable weight
+
+Measurements come from the numeric dimension columns of every product in
+the batch, read with one query, and are prepared once per batch as arrays.
+"""
+from typing import Any, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.product import Product
+from app.schemas import shipping as shipping_schemas
+from app.services.inventory import lookup_ids
+
+
+class Carton(NamedTuple):
+    name: str
+    dims: Tuple[float, float, float]  # Inner, largest first
+    capacity: float  # Volume contents may fill
+    max_weight: float  # Of contents
+    tare: float
+
+
+class Measurements(NamedTuple):
+    """Per product, aligned with the sorted `product_ids`."""
+    product_ids: np.ndarray  # int64
+    dims: np.ndarray  # (products, 3), largest first; 0 where unknown
+    volume: np.ndarray  # 0 where unknown
+    weight: np.ndarray  # 0 where unknown
+    fits: np.ndarray  # Bit i set when a unit fits cartons[i]
+
+
+def load_cartons(specs: Optional[Sequence[Dict[str, Any]]] = None) -> List[Carton]:
+    """Cartons from SHIPPING_CARTONS style specs, smallest first."""
+    cartons = []
+    for spec in settings.SHIPPING_CARTONS if specs is None else specs:
+        dims = tuple(sorted((float(spec["length"]), float(spec["width"]), float(spec["height"])), reverse=True))
+        tare = float(spec.get("tare", 0))
+        cartons.append(Carton(
+            name=spec["name"],
+            dims=dims,
+            capacity=dims[0] * dims[1] * dims[2] * settings.SHIPPING_FILL_FACTOR,
+            max_weight=float(spec["max_weight"]) - tare,
+            tare=tare,
+        ))
+    return sorted(cartons, key=lambda carton: carton.capacity)
+
+
+def measure(product_ids, length, width, height, weight, cartons: List[Carton]) -> Measurements:
+    """Sort each product's dimensions and work out which cartons it fits, for all products at once."""
+    dims = np.sort(np.column_stack([length, width, height]).astype(np.float64), axis=1)[:, ::-1]
+    known = ~np.isnan(dims).any(axis=1)
+    dims = np.where(known[:, None], dims, 0.0)
+    weight = np.nan_to_num(np.asarray(weight, dtype=np.float64))
+
+    carton_dims = np.array([carton.dims for carton in cartons], dtype=np.float64).reshape(-1, 3)
+    carton_weight = np.array([carton.max_weight for carton in cartons], dtype=np.float64)
+    fit = (
+        (~known[:, None] | (dims[:, None, :] <= carton_dims[None, :, :]).all(axis=2))
+        & (weight[:, None] <= carton_weight[None, :])
+    )
+    return Measurements(
+        product_ids=np.asarray(product_ids, dtype=np.int64),
+        dims=dims,
+        volume=dims.prod(axis=1),
+        weight=weight,
+        fits=(fit * (1 << np.arange(len(cartons), dtype=np.int64))).sum(axis=1, dtype=np.int64),
+    )
+
+
+def pack_order(lines: List[Tuple[int, int]], volume: List[float], weight: List[float], fits: List[int], cartons: List[Carton]):
+    """
+    Pack one order, given as (product index, quantity) lines, with first-fit
+    decreasing. `volume`, `weight` and `fits` are indexed by product index.
+
+    Returns bins as [carton index, volume, weight, units, fits, {product index: quantity}],
+    with carton index -1 for a unit shipped as is.
+    """
+    bins: List[list] = []
+    for product, quantity in sorted(lines, key=lambda line: (volume[line[0]], weight[line[0]]), reverse=True):
+        v, w, mask = volume[product], weight[product], fits[product]
+        if not mask:
+            bins.extend([-1, v, w, 1, 0, {product: 1}] for _ in range(quantity))
+            continue
+        for b in bins:
+            if quantity == 0:
+                break
+            if b[0] < 0 or not mask >> b[0] & 1:
+                continue
+            take = min(quantity, _room(cartons[b[0]], b[1], b[2], v, w))
+            if take > 0:
+                _place(b, product, take, v, w, mask)
+                quantity -= take
+        while quantity > 0:
+            largest = mask.bit_length() - 1
+            b = [largest, 0.0, 0.0, 0, -1, {}]
+            # An empty carton takes at least one unit that fits it, whatever its fill
+            take = min(quantity, max(1, _room(cartons[largest], 0.0, 0.0, v, w)))
+            _place(b, product, take, v, w, mask)
+            bins.append(b)
+            quantity -= take
+
+    for b in bins:
+        if b[0] < 0:
+            continue
+        for index, carton in enumerate(cartons):
+            if (
+                b[4] >> index & 1 and b[2] <= carton.max_weight
+                and (b[1] <= carton.capacity or b[3] == 1)
+            ):
+                b[0] = index
+                break
+    return bins
+
+
+def _room(carton: Carton, used_volume: float, used_weight: float, volume: float, weight: float) -> int:
+    """Units of the given volume and weight that still go in a carton."""
+    room = 1 << 62
+    if volume > 0:
+        room = min(room, int((carton.capacity - used_volume) // volume))
+    if weight > 0:
+        room = min(room, int((carton.max_weight - used_weight) // weight))
+    return max(room, 0)
+
+
+def _place(b: list, product: int, quantity: int, volume: float, weight: float, mask: int):
+    b[1] += volume * quantity
+    b[2] += weight * quantity
+    b[3] += quantity
+    b[4] &= mask
+    b[5][product] = b[5].get(product, 0) + quantity
+
+
+def rate(dims: np.ndarray, weight: np.ndarray):
+    """Dimensional weight, billable weight and cost of every package at once."""
+    dimensional = dims.prod(axis=1) / settings.SHIPPING_DIM_DIVISOR
+    billable = np.maximum(weight, dimensional)
+    return dimensional, billable, settings.SHIPPING_BASE_RATE + settings.SHIPPING_RATE_PER_KG * billable
+
+
+def load_measurements(db: Session, product_ids, cartons: List[Carton]) -> Measurements:
+    """Measurements of the given products with one query."""
+    rows = db.execute(
+        select(Product.id, Product.length, Product.width, Product.height, Product.weight)
+        .where(Product.id.in_(set(product_ids)))
+        .order_by(Product.id)
+    ).all()
+    if not rows:
+        return measure(np.empty(0), *([np.empty(0)] * 4), cartons)
+    # None becomes NaN in the float columns
+    ids, length, width, height, weight = (np.array(column, dtype=np.float64) for column in zip(*rows))
+    return measure(ids, length, width, height, weight, cartons)
+
+
+def quote_orders(db: Session, orders: List[shipping_schemas.ShippingOrder]) -> shipping_schemas.ShippingQuoteBatchResult:
+    """Pack and rate a batch of orders. Orders with unknown products or too many units are reported, not quoted."""
+    result = shipping_schemas.ShippingQuoteBatchResult()
+    lines = [line for order in orders for line in order.lines]
+    product_ids = lookup_ids(db, Product.id, Product.sku, (line.sku for line in lines if line.product_id is None))
+    product_ids.update(lookup_ids(db, Product.id, Product.id, (line.product_id for line in lines if line.product_id is not None)))
+
+    cartons = load_cartons()
+    measurements = load_measurements(db, product_ids.values(), cartons)
+    index_of = {product_id: index for index, product_id in enumerate(measurements.product_ids.tolist())}
+    volume, weight = measurements.volume.tolist(), measurements.weight.tolist()
+    fits = measurements.fits.tolist()
+
+    bins: List[list] = []
+    owners: List[shipping_schemas.ShippingQuote] = []
+    for index, order in enumerate(orders):
+        quote = shipping_schemas.ShippingQuote(index=index, reference=order.reference)
+        result.results.append(quote)
+        packed: Dict[int, int] = {}
+        for line_number, line in enumerate(order.lines):
+            product_id = product_ids.get(line.product_id if line.product_id is not None else line.sku)
+            if product_id is None:
+                quote.error = f"Line {line_number}: Product not found"
+                break
+            product = index_of[product_id]
+            packed[product] = packed.get(product, 0) + line.quantity
+        if quote.error is None and sum(packed.values()) > settings.SHIPPING_MAX_ORDER_UNITS:
+            quote.error = f"At most {settings.SHIPPING_MAX_ORDER_UNITS} units per order"
+        if quote.error is not None:
+            continue
+        for b in pack_order(list(packed.items()), volume, weight, fits, cartons):
+            bins.append(b)
+            owners.append(quote)
+
+    # Rate every package of the batch together. Index -1, a unit shipped as is, picks the zero row.
+    carton_dims = np.array([carton.dims for carton in cartons] + [(0.0, 0.0, 0.0)], dtype=np.float64)
+    tare = np.array([carton.tare for carton in cartons] + [0.0], dtype=np.float64)
+    carton_index = np.array([b[0] for b in bins], dtype=np.int64)
+    # Such a unit is the only content of its bin
+    first_product = np.array([next(iter(b[5])) for b in bins], dtype=np.int64)
+    dims = np.where(
+        (carton_index >= 0)[:, None], carton_dims[carton_index], measurements.dims[first_product]
+    ).reshape(-1, 3)
+    gross = np.array([b[2] for b in bins], dtype=np.float64) + tare[carton_index]
+    dimensional, billable, cost = rate(dims, gross)
+
+    product_id_list = measurements.product_ids.tolist()
+    for b, quote, package_dims, package_weight, package_dimensional, package_billable, package_cost in zip(
+        bins, owners, dims.tolist(), gross.tolist(), dimensional.tolist(), billable.tolist(), cost.tolist(),
+    ):
+        quote.packages.append(shipping_schemas.ShippingPackage(
+            carton=cartons[b[0]].name if b[0] >= 0 else None,
+            length=package_dims[0],
+            width=package_dims[1],
+            height=package_dims[2],
+            weight=round(package_weight, 3),
+            dimensional_weight=round(package_dimensional, 3),
+            billable_weight=round(package_billable, 3),
+            cost=round(package_cost, 2),
+            items=[
+                shipping_schemas.ShippingPackageItem(product_id=product_id_list[product], quantity=quantity)
+                for product, quantity in sorted(b[5].items())
+            ],
+        ))
+    for quote in result.results:
+        if quote.error is None:
+            quote.cost = round(sum(package.cost for package in quote.packages), 2)
+    result.failed = sum(quote.error is not None for quote in result.results)
+    result.quoted = len(result.results) - result.failed
+    return result
@@ -0,0 +1,163 @@
+# app/services/sourcing.py
+"""
+Split the catalog's replenishment orders across suppliers.
+
+Each product's order quantity (the sum of its `replenishment_plans` orders)
+goes to its active, priced suppliers at the lowest landed cost: unit cost
+plus the cost of holding stock through the lead time and the extra safety
+stock an unreliable lead time needs,
+
+    cost = unit_cost * (1 + holding rate * (lead time + z * lead time sd) / 365)
+
+subject to each supplier product's capacity and each supplier's overall
+capacity. Without overall capacities products are independent, and the
+cheapest-first fill is optimal and computed for the whole catalog with
+array operations. Overall capacities couple products, so the run becomes
+one transportation LP over the whole catalog, solved with HiGHS. Units no
+supplier has capacity for are reported as unallocated.
+"""
+from datetime import datetime, timezone
+
+import numpy as np
+from scipy import sparse
+from scipy.optimize import linprog
+from scipy.stats import norm
+from sqlalchemy import delete, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.replenishment import ReplenishmentPlan
+from app.models.supplier import SourcingAllocation, Supplier
+from app.schemas import supplier as supplier_schemas
+from app.services.suppliers import supplier_links
+
+
+def landed_cost(unit_cost: np.ndarray, lead_time: np.ndarray, lead_time_std: np.ndarray) -> np.ndarray:
+    z = norm.ppf(settings.REPLENISHMENT_SERVICE_LEVEL)
+    return unit_cost * (1 + settings.REPLENISHMENT_HOLDING_RATE * (lead_time + z * lead_time_std) / 365)
+
+
+def allocate_greedy(demand: np.ndarray, link_product: np.ndarray, cost: np.ndarray, capacity: np.ndarray) -> np.ndarray:
+    """
+    Fill each product's demand from its cheapest links first.
+
+    `link_product` indexes `demand` for each link. Returns units per link.
+    """
+    if not len(cost):
+        return np.zeros(0)
+    order = np.lexsort((cost, link_product))
+    product = link_product[order]
+    usable = np.minimum(capacity[order], demand[product])
+    # Capacity of the cheaper links of the same product, ahead of each link
+    ahead = np.cumsum(usable) - usable
+    _, first = np.unique(product, return_index=True)
+    ahead -= np.repeat(ahead[first], np.diff(np.r_[first, len(product)]))
+    allocation = np.empty(len(cost))
+    allocation[order] = np.clip(demand[product] - ahead, 0, usable)
+    return allocation
+
+
+def allocate_lp(
+    demand: np.ndarray,
+    link_product: np.ndarray,
+    link_supplier: np.ndarray,
+    cost: np.ndarray,
+    capacity: np.ndarray,
+    supplier_capacity: np.ndarray,
+) -> np.ndarray:
+    """
+    Minimum-cost allocation with supplier-wide capacities, as one LP.
+
+    Variables are the units per link plus a shortfall per product, priced
+    above any link so supply is always preferred. `link_supplier` indexes
+    `supplier_capacity` (inf where unlimited). Returns units per link.
+    """
+    links, products = len(cost), len(demand)
+    columns = np.arange(links)
+    shortfall_cost = np.full(products, cost.max(initial=0) * 10 + 1)
+    a_eq = sparse.hstack([
+        sparse.csr_matrix((np.ones(links), (link_product, columns)), shape=(products, links)),
+        sparse.identity(products, format="csr"),
+    ], format="csr")
+    limited = np.flatnonzero(np.isfinite(supplier_capacity))
+    row = np.full(len(supplier_capacity), -1)
+    row[limited] = np.arange(len(limited))
+    capped = row[link_supplier] >= 0
+    a_ub = sparse.csr_matrix(
+        (np.ones(capped.sum()), (row[link_supplier][capped], columns[capped])),
+        shape=(len(limited), links + products),
+    )
+    bounds = np.column_stack([
+        np.zeros(links + products),
+        np.r_[capacity, np.full(products, np.inf)],
+    ])
+    solution = linprog(
+        np.r_[cost, shortfall_cost],
+        A_ub=a_ub if len(limited) else None,
+        b_ub=supplier_capacity[limited] if len(limited) else None,
+        A_eq=a_eq,
+        b_eq=demand,
+        bounds=bounds,
+        method="highs",
+    )
+    if not solution.success:
+        raise RuntimeError(f"Sourcing LP failed: {solution.message}")
+    # Transportation problems have integral vertex solutions for integral data
+    return np.round(solution.x[:links])
+
+
+def plan_sourcing(db: Session) -> supplier_schemas.SourcingRun:
+    """Allocate every product's replenishment order to suppliers and store the result."""
+    computed_at = datetime.now(timezone.utc)
+    orders = db.execute(
+        select(ReplenishmentPlan.product_id, func.sum(ReplenishmentPlan.order_quantity))
+        .where(ReplenishmentPlan.order_quantity > 0)
+        .group_by(ReplenishmentPlan.product_id)
+        .order_by(ReplenishmentPlan.product_id)
+    ).all()
+    product_ids = np.array([product_id for product_id, _ in orders], dtype=np.int64)
+    demand = np.array([quantity for _, quantity in orders], dtype=np.float64)
+
+    links = supplier_links(db)
+    ordered = np.isin(links["product_id"], product_ids)
+    links = {name: column[ordered] for name, column in links.items()}
+    link_product = np.searchsorted(product_ids, links["product_id"])
+    cost = landed_cost(links["unit_cost"], links["lead_time"], links["lead_time_std"])
+
+    suppliers = dict(db.execute(
+        select(Supplier.id, Supplier.capacity).where(Supplier.is_active, Supplier.capacity.is_not(None))
+    ).all())
+    supplier_ids, link_supplier = np.unique(links["supplier_id"], return_inverse=True)
+    supplier_capacity = np.array([suppliers.get(int(s), np.inf) for s in supplier_ids], dtype=np.float64)
+    if np.isfinite(supplier_capacity).any():
+        solver = "highs"
+        allocation = allocate_lp(demand, link_product, link_supplier, cost, links["capacity"], supplier_capacity)
+    else:
+        solver = "greedy"
+        allocation = allocate_greedy(demand, link_product, cost, links["capacity"])
+
+    used = allocation > 0
+    db.execute(delete(SourcingAllocation))
+    rows = [
+        {
+            "product_id": product_id, "supplier_id": supplier_id, "quantity": quantity,
+            "unit_cost": unit_cost, "lead_time_days": lead_time, "computed_at": computed_at,
+        }
+        for product_id, supplier_id, quantity, unit_cost, lead_time in zip(
+            links["product_id"][used].tolist(), links["supplier_id"][used].tolist(),
+            allocation[used].astype(np.int64).tolist(), links["unit_cost"][used].tolist(),
+            links["lead_time"][used].tolist(),
+        )
+    ]
+    for start in range(0, len(rows), settings.BULK_UPSERT_CHUNK_SIZE * 10):
+        db.execute(insert(SourcingAllocation), rows[start:start + settings.BULK_UPSERT_CHUNK_SIZE * 10])
+    db.commit()
+
+    allocated = int(allocation.sum())
+    return supplier_schemas.SourcingRun(
+        products=len(product_ids),
+        allocated=allocated,
+        unallocated=int(demand.sum()) - allocated,
+        solver=solver,
+        computed_at=computed_at,
+    )
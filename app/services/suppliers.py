@@ -0,0 +1,186 @@
+# app/services/suppliers.py
+"""
+Supplier receipts and lead-time statistics.
+
+A receipt is stock arriving from a supplier against an order placed at
+`ordered_at`; its lead time is the days from order to receipt. Receipts are
+booked into the stock ledger like any other movement and, in the same
+transaction, folded into per supplier and product lead-time statistics.
+
+The statistics are a running count, mean and sum of squared deviations
+(Welford). A batch is summarized per (supplier, product) in memory and
+merged into the stored values with the parallel form of the update (Chan et
+al.), inside a single INSERT ... ON CONFLICT so concurrent batches can't
+lose each other's samples.
+"""
+from collections import defaultdict
+from datetime import datetime, timezone
+from typing import Dict, List, Tuple
+
+import numpy as np
+from sqlalchemy import Float, cast, func, insert, select
+from sqlalchemy.orm import Session
+
+from app.cache import product_cache
+from app.config import settings
+from app.database import dialect_insert
+from app.models.inventory import StockMovement, Warehouse
+from app.models.product import Product
+from app.models.supplier import Supplier, SupplierProduct
+from app.schemas import inventory as inventory_schemas
+from app.schemas import supplier as supplier_schemas
+from app.services.inventory import apply_stock_deltas, lookup_ids
+
+
+def merge_lead_times(db: Session, samples: Dict[Tuple[int, int], List[float]], unit_costs: Dict[Tuple[int, int], float]):
+    """
+    Merge lead-time samples, keyed by (supplier_id, product_id), into the
+    stored statistics, creating supplier products as needed. Does not commit.
+    """
+    rows = []
+    for (supplier_id, product_id), days in sorted(samples.items()):
+        days = np.asarray(days, dtype=np.float64)
+        mean = days.mean()
+        rows.append({
+            "supplier_id": supplier_id,
+            "product_id": product_id,
+            "unit_cost": unit_costs.get((supplier_id, product_id)),
+            "lead_time_samples": len(days),
+            "lead_time_mean": float(mean),
+            "lead_time_m2": float(((days - mean) ** 2).sum()),
+        })
+    if not rows:
+        return
+
+    table = SupplierProduct.__table__
+    stmt = dialect_insert(db, table)
+    n_a, mean_a, m2_a = table.c.lead_time_samples, table.c.lead_time_mean, table.c.lead_time_m2
+    n_b, mean_b, m2_b = stmt.excluded.lead_time_samples, stmt.excluded.lead_time_mean, stmt.excluded.lead_time_m2
+    n = cast(n_a + n_b, Float)
+    delta = mean_b - mean_a
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["supplier_id", "product_id"],
+        set_={
+            # Every right-hand side sees the row as it was before this update
+            "lead_time_samples": n_a + n_b,
+            "lead_time_mean": mean_a + delta * n_b / n,
+            "lead_time_m2": m2_a + m2_b + delta * delta * n_a * n_b / n,
+            "unit_cost": func.coalesce(stmt.excluded.unit_cost, table.c.unit_cost),
+            "updated_at": func.now(),
+        },
+    )
+    db.execute(stmt, rows)
+
+
+def record_receipts(
+    db: Session, receipts: List[supplier_schemas.SupplierReceiptCreate]
+) -> supplier_schemas.SupplierReceiptBatchResult:
+    """Book a batch of receipts into stock and lead-time statistics in one transaction."""
+    result = supplier_schemas.SupplierReceiptBatchResult()
+    supplier_ids = lookup_ids(db, Supplier.id, Supplier.code, (r.supplier_code for r in receipts if r.supplier_id is None))
+    supplier_ids.update(lookup_ids(db, Supplier.id, Supplier.id, (r.supplier_id for r in receipts if r.supplier_id is not None)))
+    product_ids = lookup_ids(db, Product.id, Product.sku, (r.sku for r in receipts if r.product_id is None))
+    product_ids.update(lookup_ids(db, Product.id, Product.id, (r.product_id for r in receipts if r.product_id is not None)))
+    warehouse_ids = lookup_ids(db, Warehouse.id, Warehouse.code, (r.warehouse_code for r in receipts if r.warehouse_id is None))
+    warehouse_ids.update(lookup_ids(db, Warehouse.id, Warehouse.id, (r.warehouse_id for r in receipts if r.warehouse_id is not None)))
+
+    now = datetime.now(timezone.utc)
+    movements: List[dict] = []
+    deltas: Dict[Tuple[int, int], int] = defaultdict(int)
+    samples: Dict[Tuple[int, int], List[float]] = defaultdict(list)
+    unit_costs: Dict[Tuple[int, int], float] = {}
+    for index, receipt in enumerate(receipts):
+        supplier_id = supplier_ids.get(receipt.supplier_id if receipt.supplier_id is not None else receipt.supplier_code)
+        product_id = product_ids.get(receipt.product_id if receipt.product_id is not None else receipt.sku)
+        warehouse_id = warehouse_ids.get(receipt.warehouse_id if receipt.warehouse_id is not None else receipt.warehouse_code)
+        if supplier_id is None or product_id is None or warehouse_id is None:
+            missing = "Supplier" if supplier_id is None else "Product" if product_id is None else "Warehouse"
+            result.errors.append(inventory_schemas.StockMovementError(index=index, error=f"{missing} not found"))
+            continue
+        received_at = receipt.received_at or now
+        movements.append({
+            "product_id": product_id,
+            "warehouse_id": warehouse_id,
+            "quantity": receipt.quantity,
+            "movement_type": "receipt",
+            "reference": receipt.reference,
+            "occurred_at": received_at,
+        })
+        deltas[(product_id, warehouse_id)] += receipt.quantity
+        samples[(supplier_id, product_id)].append((received_at - receipt.ordered_at).total_seconds() / 86400)
+        if receipt.unit_cost is not None:
+            unit_costs[(supplier_id, product_id)] = receipt.unit_cost
+
+    if movements:
+        for start in range(0, len(movements), settings.BULK_UPSERT_CHUNK_SIZE):
+            db.execute(insert(StockMovement), movements[start:start + settings.BULK_UPSERT_CHUNK_SIZE])
+        apply_stock_deltas(db, deltas)
+        merge_lead_times(db, samples, unit_costs)
+        db.commit()
+        # Product details show stock and supplier terms, list pages neither
+        product_cache.invalidate_products({product_id for product_id, _ in deltas}, lists=False)
+
+    result.accepted = len(movements)
+    result.failed = len(result.errors)
+    return result
+
+
+def supplier_links(db: Session, product_ids=None) -> Dict[str, np.ndarray]:
+    """
+    Priced products of active suppliers as columns, with lead-time mean and
+    standard deviation resolved the way `SupplierProduct` reports them.
+    """
+    stmt = (
+        select(
+            SupplierProduct.product_id, SupplierProduct.supplier_id, SupplierProduct.unit_cost,
+            SupplierProduct.capacity, SupplierProduct.quoted_lead_time_days,
+            SupplierProduct.lead_time_samples, SupplierProduct.lead_time_mean, SupplierProduct.lead_time_m2,
+        )
+        .join(Supplier, Supplier.id == SupplierProduct.supplier_id)
+        .where(Supplier.is_active, SupplierProduct.unit_cost.is_not(None))
+        .order_by(SupplierProduct.product_id, SupplierProduct.supplier_id)
+    )
+    if product_ids is not None:
+        stmt = stmt.where(SupplierProduct.product_id.in_(product_ids))
+    rows = db.execute(stmt).all()
+    names = ("product_id", "supplier_id", "unit_cost", "capacity", "quoted", "samples", "mean", "m2")
+    if not rows:
+        columns = {name: np.empty(0) for name in names}
+        columns["product_id"] = columns["supplier_id"] = np.empty(0, dtype=np.int64)
+    else:
+        # None becomes NaN in the float columns
+        columns = {name: np.array(column, dtype=np.float64) for name, column in zip(names, zip(*rows))}
+        columns["product_id"] = columns["product_id"].astype(np.int64)
+        columns["supplier_id"] = columns["supplier_id"].astype(np.int64)
+
+    samples = columns["samples"]
+    with np.errstate(divide="ignore", invalid="ignore"):
+        columns["lead_time"] = np.where(
+            samples > 0, columns["mean"],
+            np.where(np.isnan(columns["quoted"]), settings.REPLENISHMENT_LEAD_TIME_DAYS, columns["quoted"]),
+        )
+        columns["lead_time_std"] = np.where(
+            samples > 1, np.sqrt(columns["m2"] / (samples - 1)), settings.REPLENISHMENT_LEAD_TIME_STD_DAYS
+        )
+    columns["capacity"] = np.where(np.isnan(columns["capacity"]), np.inf, columns["capacity"])
+    return columns
+
+
+def primary_lead_times(db: Session, product_ids: np.ndarray):
+    """
+    Lead-time mean and standard deviation of each product's cheapest active
+    supplier, aligned with the sorted `product_ids`. Products without a
+    priced supplier get the REPLENISHMENT_LEAD_TIME defaults.
+    """
+    mean = np.full(len(product_ids), settings.REPLENISHMENT_LEAD_TIME_DAYS)
+    std = np.full(len(product_ids), settings.REPLENISHMENT_LEAD_TIME_STD_DAYS)
+    links = supplier_links(db)
+    # Cheapest link per product: sort by cost within product, keep each product's first
+    order = np.lexsort((links["unit_cost"], links["product_id"]))
+    linked, first = np.unique(links["product_id"][order], return_index=True)
+    cheapest = order[first]
+    known = np.isin(linked, product_ids)
+    at = np.searchsorted(product_ids, linked[known])
+    mean[at] = links["lead_time"][cheapest[known]]
+    std[at] = links["lead_time_std"][cheapest[known]]
+    return mean, std
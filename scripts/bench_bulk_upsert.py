@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+# scripts/bench_bulk_upsert.py
+"""
+Compare product ingestion throughput of POST /products/ against POST /products/bulk.
+
+Both runs go through the real app (in-process TestClient) against the
+database at DATABASE_URL and write fresh SKUs, so every row is an insert.
+"""
+
+import argparse
+import os
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+from app.models.product import Product
+
+# Database connection
+DB_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/supply_chain_db")
+engine = create_engine(DB_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def make_products(prefix: str, count: int):
+    return [
+        {"sku": f"{prefix}-{i:08d}", "name": f"Bulk Bench {i}", "price": 19.99, "weight": 1.0}
+        for i in range(count)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--single", type=int, default=2_000, help="Products sent one request at a time")
+    parser.add_argument("--bulk", type=int, default=50_000, help="Products sent through the bulk endpoint")
+    parser.add_argument("--batch", type=int, default=10_000, help="Products per bulk request")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    app.dependency_overrides[get_db] = override_get_db
+    prefix = f"BULKBENCH-{uuid.uuid4().hex[:8]}"
+
+    try:
+        with TestClient(app) as client:
+            products = make_products(f"{prefix}-S", args.single)
+            start = time.perf_counter()
+            for product in products:
+                client.post("/api/v1/products/", json=product).raise_for_status()
+            single_rate = args.single / (time.perf_counter() - start)
+
+            products = make_products(f"{prefix}-B", args.bulk)
+            start = time.perf_counter()
+            for offset in range(0, args.bulk, args.batch):
+                response = client.post("/api/v1/products/bulk", json=products[offset:offset + args.batch])
+                response.raise_for_status()
+                assert response.json()["failed"] == 0, response.json()
+            bulk_rate = args.bulk / (time.perf_counter() - start)
+    finally:
+        with engine.begin() as connection:
+            connection.execute(delete(Product).where(Product.sku.like(f"{prefix}-%")))
+
+    print(f"single endpoint: {single_rate:>10.0f} rows/sec")
+    print(f"bulk endpoint:   {bulk_rate:>10.0f} rows/sec ({bulk_rate / single_rate:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+# scripts/bench_forecast_refresh.py
+"""
+Compare a full forecast refresh with an incremental one.
+
+Seeds --skus products with --days of daily shipments at DATABASE_URL, runs
+a full refresh, records new shipments for --changed (a fraction) of the
+products and runs an incremental refresh. Use a scratch database: the full
+refresh covers every product there, not just the seeded ones.
+"""
+
+import argparse
+import os
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.forecast import DemandForecast, ForecastRun
+from app.models.inventory import StockMovement, Warehouse
+from app.models.product import Product
+from app.services.forecasting import refresh_forecasts
+
+# Database connection
+DB_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/supply_chain_db")
+engine = create_engine(DB_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def shipments(product_ids: np.ndarray, warehouse_id: int, days: int, steady: float, rng) -> list:
+    """Daily shipment rows: a few steady sellers, the rest intermittent."""
+    rate = rng.gamma(2.0, 3.0, size=(len(product_ids), 1))
+    selling = rng.random((len(product_ids), days)) < np.where(rng.random((len(product_ids), 1)) < steady, 1.0, 0.15)
+    units = np.where(selling, rng.poisson(rate, size=selling.shape) + 1, 0)
+    rows, columns = np.nonzero(units)
+    today = date.today()
+    return [
+        {
+            "product_id": int(product_ids[row]), "warehouse_id": warehouse_id, "quantity": -int(units[row, column]),
+            "movement_type": "shipment",
+            "occurred_at": datetime.combine(today - timedelta(days=days - int(column)), datetime.min.time()),
+        }
+        for row, column in zip(rows, columns)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=120)
+    parser.add_argument("--changed", type=float, default=0.01, help="Fraction of products with new demand")
+    parser.add_argument("--steady", type=float, default=0.05, help="Fraction of products selling every day")
+    parser.add_argument("--method", default="auto")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    prefix = f"FCBENCH-{uuid.uuid4().hex[:8]}"
+    rng = np.random.default_rng(42)
+
+    with engine.begin() as connection:
+        connection.execute(insert(Product), [
+            {"sku": f"{prefix}-{i:06d}", "name": f"Forecast Bench {i}", "price": 5.0} for i in range(args.skus)
+        ])
+        warehouse_id = connection.execute(
+            insert(Warehouse).values(code=prefix, name="Forecast Bench").returning(Warehouse.id)
+        ).scalar_one()
+        product_ids = np.array(
+            connection.execute(select(Product.id).where(Product.sku.like(f"{prefix}-%"))).scalars().all()
+        )
+        run_id = connection.execute(select(ForecastRun.id).order_by(ForecastRun.id.desc()).limit(1)).scalar() or 0
+
+    start = time.perf_counter()
+    rows = shipments(product_ids, warehouse_id, args.days, args.steady, rng)
+    with engine.begin() as connection:
+        for offset in range(0, len(rows), 50_000):
+            connection.execute(insert(StockMovement), rows[offset:offset + 50_000])
+    print(f"Seeded {len(rows):,} shipments for {args.skus:,} products in {time.perf_counter() - start:.1f}s")
+
+    try:
+        db = SessionLocal()
+        try:
+            start = time.perf_counter()
+            run = refresh_forecasts(db, full=True, method=args.method, workers=args.workers)
+            full_elapsed = time.perf_counter() - start
+            print(f"Full refresh:        {run.products:>8,} products in {full_elapsed:8.2f}s")
+
+            changed = rng.choice(product_ids, size=max(1, int(args.skus * args.changed)), replace=False)
+            with engine.begin() as connection:
+                connection.execute(insert(StockMovement), [
+                    {"product_id": int(product_id), "warehouse_id": warehouse_id, "quantity": -5,
+                     "movement_type": "shipment", "occurred_at": datetime.combine(date.today() - timedelta(days=1),
+                                                                                   datetime.min.time())}
+                    for product_id in changed
+                ])
+
+            start = time.perf_counter()
+            run = refresh_forecasts(db, full=False, method=args.method, workers=args.workers)
+            incremental_elapsed = time.perf_counter() - start
+            print(f"Incremental refresh: {run.products:>8,} products in {incremental_elapsed:8.2f}s "
+                  f"({full_elapsed / incremental_elapsed:,.0f}x faster)")
+        finally:
+            db.close()
+    finally:
+        with engine.begin() as connection:
+            connection.execute(delete(ForecastRun).where(ForecastRun.id > run_id))
+            for model in (DemandForecast, StockMovement):
+                connection.execute(delete(model).where(model.product_id.in_(product_ids.tolist())))
+            connection.execute(delete(Warehouse).where(Warehouse.id == warehouse_id))
+            connection.execute(delete(Product).where(Product.id.in_(product_ids.tolist())))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+# scripts/bench_forecasting.py
+"""
+Measure forecasting throughput over a synthetic catalog.
+
+Builds a demand matrix like the one `load_demand_history` returns, with a
+mix of steady weekly-seasonal and intermittent SKUs, then times each stage
+of `forecast()`. A per-SKU Python SES loop over a sample is timed for
+comparison with the vectorized version.
+"""
+
+import argparse
+import time
+from datetime import date
+
+import numpy as np
+
+from app.services.forecasting import DemandHistory, croston, forecast, holt_winters, ses
+
+
+def synthetic_demand(skus: int, days: int, seed: int = 42) -> np.ndarray:
+    rng = np.random.default_rng(seed)
+    weekly = np.array([1.0, 0.9, 0.9, 1.0, 1.2, 1.6, 1.4])
+    season = np.resize(weekly, days)
+    base = rng.gamma(2.0, 5.0, size=(skus, 1))
+    demand = rng.poisson(base * season)
+    # A third of the catalog sells on only a few days in ten
+    intermittent = rng.random(skus) < 1 / 3
+    demand[intermittent] *= rng.random((intermittent.sum(), days)) < 0.15
+    return demand.astype(np.float64)
+
+
+def ses_loop(series: np.ndarray, alpha: float) -> float:
+    level = series[0]
+    for value in series[1:]:
+        level += alpha * (value - level)
+    return level
+
+
+def timed(label: str, count: int, fn, *args, **kwargs):
+    start = time.perf_counter()
+    result = fn(*args, **kwargs)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<32} {count:>8} SKUs in {elapsed:8.2f}s  {count / elapsed:>12,.0f} SKUs/sec")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--days", type=int, default=365)
+    parser.add_argument("--horizon", type=int, default=90)
+    parser.add_argument("--loop-sample", type=int, default=2_000, help="SKUs for the per-SKU loop baseline")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for Holt-Winters; default every CPU")
+    parser.add_argument("--full", action="store_true", help="Also run forecast(method='auto') on every SKU")
+    args = parser.parse_args()
+
+    demand = synthetic_demand(args.skus, args.days)
+    print(f"{args.skus} SKUs x {args.days} days ({demand.nbytes / 1e6:.0f} MB)")
+
+    sample = demand[:args.loop_sample]
+    _, loop_elapsed = timed(
+        "SES, per-SKU Python loop", len(sample),
+        lambda: [ses_loop(series, alpha) for series in sample for alpha in (0.05, 0.1, 0.2, 0.3, 0.5)],
+    )
+    _, ses_elapsed = timed("SES, vectorized (5 alphas)", args.skus, ses, demand)
+    print(f"  vectorized SES is {loop_elapsed / len(sample) * args.skus / ses_elapsed:,.0f}x the loop")
+    timed("Croston, vectorized", args.skus, croston, demand)
+    timed(
+        "Holt-Winters, process pool", len(sample),
+        holt_winters, sample, args.horizon, workers=args.workers,
+    )
+
+    if args.full:
+        history = DemandHistory(product_ids=np.arange(args.skus), start=date.today(), demand=demand)
+        result, _ = timed("forecast(method='auto')", args.skus, forecast, history, args.horizon, workers=args.workers)
+        methods, counts = np.unique(result.methods.astype(str), return_counts=True)
+        print("  " + ", ".join(f"{method}: {count}" for method, count in zip(methods, counts)))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# scripts/bench_list_serialization.py
+"""
+Compare response size and build time of full product listings against
+`fields=` projections.
+
+Seeds --rows products with realistic descriptions (if needed), then times
+fetching and serializing a --limit row page through `get_products` with and
+without a projection.
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.api.endpoints.products import ProductListParams, get_products
+from app.cache import product_cache
+from app.models.product import Product
+
+# Database connection
+DB_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/supply_chain_db")
+engine = create_engine(DB_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Endpoints are called directly; a bare request carries no conditional headers
+REQUEST = Request({"type": "http", "headers": []})
+
+DESCRIPTION = "Durable, food-safe and dishwasher friendly. " * 10
+
+
+def seed(rows: int):
+    """Top the products table up to `rows` rows."""
+    Product.__table__.create(bind=engine, checkfirst=True)
+    with engine.begin() as connection:
+        existing = connection.execute(select(func.count()).select_from(Product)).scalar()
+        if existing >= rows:
+            return
+        print(f"Seeding {rows - existing} products...")
+        connection.execute(insert(Product), [
+            {
+                "sku": f"SERIAL-{i:09d}", "name": f"Serialization Product {i:09d}",
+                "description": DESCRIPTION, "price": 9.99, "weight": 1.5,
+                "dimensions": '{"length": 10, "width": 5, "height": 2}', "is_active": True,
+            }
+            for i in range(existing, rows)
+        ])
+
+
+def measure(db, params: ProductListParams, repeat: int):
+    """Median milliseconds and response bytes of one listing call."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        response = get_products(request=REQUEST, db=db, params=params)
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples), len(response.body)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000)
+    parser.add_argument("--limit", type=int, default=1_000)
+    parser.add_argument("--fields", default="id,sku,name,price")
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    product_cache.enabled = False  # Measure the query and serialization, not list cache hits
+    db = SessionLocal()
+    try:
+        full_ms, full_bytes = measure(db, ProductListParams(limit=args.limit, order_by="id"), args.repeat)
+        sparse_ms, sparse_bytes = measure(
+            db, ProductListParams(limit=args.limit, order_by="id", fields=args.fields), args.repeat
+        )
+    finally:
+        db.close()
+
+    print(f"{'':>8} {'ms':>10} {'bytes':>12}")
+    print(f"{'full':>8} {full_ms:>10.2f} {full_bytes:>12}")
+    print(f"{'fields':>8} {sparse_ms:>10.2f} {sparse_bytes:>12}")
+    print(f"speedup {full_ms / sparse_ms:.1f}x, {full_bytes / sparse_bytes:.1f}x smaller")
+
+
+if __name__ == "__main__":
+    main()
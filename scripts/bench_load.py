@@ -0,0 +1,76 @@
+#!/usr/bin/env python3
+# scripts/bench_load.py
+"""
+Load-test a running API and report requests/sec and latency percentiles.
+
+Run it once against a server started with DATABASE_ASYNC=false and once
+with DATABASE_ASYNC=true to compare the threadpool and async paths, e.g.
+
+    DATABASE_ASYNC=true uvicorn app.main:app --port 8000
+    python scripts/bench_load.py --url http://localhost:8000 --concurrency 500
+
+The workload mixes product detail reads and first-page listings for the
+product ids that exist when the run starts.
+"""
+
+import argparse
+import asyncio
+import random
+import statistics
+import time
+
+import aiohttp
+
+
+async def worker(session, url, product_ids, deadline, latencies, errors):
+    while time.perf_counter() < deadline:
+        if random.random() < 0.8:
+            path = f"/api/v1/products/{random.choice(product_ids)}"
+        else:
+            path = "/api/v1/products/?limit=20"
+        start = time.perf_counter()
+        try:
+            async with session.get(url + path) as response:
+                await response.read()
+                if response.status != 200:
+                    errors.append(response.status)
+                    continue
+        except aiohttp.ClientError as exc:
+            errors.append(type(exc).__name__)
+            continue
+        latencies.append(time.perf_counter() - start)
+
+
+async def run(args):
+    connector = aiohttp.TCPConnector(limit=args.concurrency)
+    async with aiohttp.ClientSession(connector=connector) as session:
+        async with session.get(f"{args.url}/api/v1/products/?limit=1000") as response:
+            product_ids = [product["id"] for product in await response.json()]
+        if not product_ids:
+            raise SystemExit("No products found; seed the database first")
+
+        latencies, errors = [], []
+        deadline = time.perf_counter() + args.duration
+        await asyncio.gather(*(
+            worker(session, args.url, product_ids, deadline, latencies, errors)
+            for _ in range(args.concurrency)
+        ))
+
+    latencies.sort()
+    quantiles = statistics.quantiles(latencies, n=100)
+    print(f"requests:    {len(latencies)} ok, {len(errors)} failed")
+    print(f"throughput:  {len(latencies) / args.duration:.0f} req/s")
+    print(f"latency p50: {quantiles[49] * 1000:.1f} ms")
+    print(f"latency p99: {quantiles[98] * 1000:.1f} ms")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8000")
+    parser.add_argument("--concurrency", type=int, default=500)
+    parser.add_argument("--duration", type=float, default=30.0, help="Seconds to run")
+    asyncio.run(run(parser.parse_args()))
+
+
+if __name__ == "__main__":
+    main()
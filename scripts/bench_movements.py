@@ -0,0 +1,96 @@
+#!/usr/bin/env python3
+# scripts/bench_movements.py
+"""
+Measure stock movement ingestion throughput of POST /inventory/movements.
+
+Runs through the real app (in-process TestClient) against the database at
+DATABASE_URL. Movements are spread over --products products and
+--warehouses warehouses, like scanner traffic from a few sites.
+"""
+
+import argparse
+import os
+import random
+import time
+import uuid
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base, get_db
+from app.main import app
+from app.models.inventory import InventoryLevel, InventoryTotal, StockMovement, Warehouse
+from app.models.product import Product
+
+# Database connection
+DB_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/supply_chain_db")
+engine = create_engine(DB_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--movements", type=int, default=100_000)
+    parser.add_argument("--batch", type=int, default=2_000, help="Movements per request")
+    parser.add_argument("--products", type=int, default=1_000)
+    parser.add_argument("--warehouses", type=int, default=5)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    app.dependency_overrides[get_db] = override_get_db
+    prefix = f"MOVEBENCH-{uuid.uuid4().hex[:8]}"
+
+    with engine.begin() as connection:
+        connection.execute(insert(Product), [
+            {"sku": f"{prefix}-{i:06d}", "name": f"Movement Bench {i}", "price": 5.0}
+            for i in range(args.products)
+        ])
+        connection.execute(insert(Warehouse), [
+            {"code": f"{prefix}-WH{i}", "name": f"Bench Warehouse {i}"} for i in range(args.warehouses)
+        ])
+        product_ids = connection.execute(select(Product.id).where(Product.sku.like(f"{prefix}-%"))).scalars().all()
+        warehouse_ids = connection.execute(
+            select(Warehouse.id).where(Warehouse.code.like(f"{prefix}-%"))
+        ).scalars().all()
+
+    rng = random.Random(42)
+    movements = [
+        {
+            "product_id": rng.choice(product_ids),
+            "warehouse_id": rng.choice(warehouse_ids),
+            "quantity": rng.choice([-2, -1, 1, 5, 20]),
+            "movement_type": "adjustment",
+        }
+        for _ in range(args.movements)
+    ]
+
+    try:
+        with TestClient(app) as client:
+            start = time.perf_counter()
+            for offset in range(0, args.movements, args.batch):
+                response = client.post("/api/v1/inventory/movements", json=movements[offset:offset + args.batch])
+                response.raise_for_status()
+                assert response.json()["failed"] == 0, response.json()
+            elapsed = time.perf_counter() - start
+    finally:
+        with engine.begin() as connection:
+            for model in (StockMovement, InventoryLevel, InventoryTotal):
+                connection.execute(delete(model).where(model.product_id.in_(product_ids)))
+            connection.execute(delete(Warehouse).where(Warehouse.id.in_(warehouse_ids)))
+            connection.execute(delete(Product).where(Product.id.in_(product_ids)))
+
+    print(f"{args.movements} movements in {elapsed:.2f}s: {args.movements / elapsed:,.0f} movements/sec "
+          f"({args.batch} per request)")
+
+
+if __name__ == "__main__":
+    main()
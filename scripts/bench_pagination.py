@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+# scripts/bench_pagination.py
+"""
+Compare deep-page latency of OFFSET pagination against keyset cursors.
+
+Seeds the products table up to --rows rows (if needed), then times
+fetching a page at increasing depths through both code paths of
+`get_products`. OFFSET latency grows with depth; keyset latency stays flat.
+"""
+
+import argparse
+import os
+import statistics
+import time
+
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+from starlette.requests import Request
+
+from app.api.endpoints.products import ProductListParams, get_products
+from app.models.product import Product
+from app.pagination import encode_cursor
+
+# Database connection
+DB_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/supply_chain_db")
+engine = create_engine(DB_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Endpoints are called directly; a bare request carries no conditional headers
+REQUEST = Request({"type": "http", "headers": []})
+
+BATCH_SIZE = 10_000
+
+
+def seed(rows: int):
+    """Top the products table up to `rows` rows."""
+    Product.__table__.create(bind=engine, checkfirst=True)
+    with engine.begin() as connection:
+        existing = connection.execute(select(func.count()).select_from(Product)).scalar()
+        if existing >= rows:
+            return
+        print(f"Seeding {rows - existing} products...")
+        for start in range(existing, rows, BATCH_SIZE):
+            end = min(start + BATCH_SIZE, rows)
+            connection.execute(insert(Product), [
+                {"sku": f"BENCH-{i:09d}", "name": f"Bench Product {i:09d}", "price": 9.99, "is_active": True}
+                for i in range(start, end)
+            ])
+
+
+def time_call(fn, repeat: int) -> float:
+    """Median wall time of `fn` in milliseconds."""
+    samples = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--limit", type=int, default=100)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    db = SessionLocal()
+    try:
+        ids = db.execute(
+            select(Product.id).where(Product.is_active.is_(True)).order_by(Product.id)
+        ).scalars().all()
+        print(f"{'depth':>10} {'offset ms':>12} {'keyset ms':>12}")
+        depth = args.limit
+        while depth < len(ids):
+            cursor = encode_cursor("id", [ids[depth - 1]])
+            offset_ms = time_call(lambda: get_products(request=REQUEST, db=db, params=ProductListParams(skip=depth, limit=args.limit, order_by="id")), args.repeat)
+            keyset_ms = time_call(lambda: get_products(request=REQUEST, db=db, params=ProductListParams(cursor=cursor, limit=args.limit, order_by="id")), args.repeat)
+            print(f"{depth:>10} {offset_ms:>12.2f} {keyset_ms:>12.2f}")
+            depth *= 10
+    finally:
+        db.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+# scripts/bench_replenishment.py
+"""
+Time a replenishment planning run over --skus x --warehouses pairs.
+
+Seeds inventory levels for every pair and a few weeks of shipments for
+--selling of them at DATABASE_URL, then times loading the inputs, computing
+the plan and upserting it. Use a scratch database: the run plans every
+active product there and replaces all stored plans.
+"""
+
+import argparse
+import os
+import time
+import uuid
+from datetime import date, datetime, timedelta
+
+import numpy as np
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.config import settings
+from app.database import Base
+from app.models.inventory import InventoryLevel, StockMovement, Warehouse
+from app.models.product import Product
+from app.models.replenishment import ReplenishmentPlan
+from app.services.replenishment import load_planning_inputs, plan_replenishment, store_plans
+
+# Database connection
+DB_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/supply_chain_db")
+engine = create_engine(DB_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+SEED_CHUNK = 50_000
+
+
+def timed(label: str, fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<12} {elapsed:8.2f}s")
+    return result, elapsed
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=100_000)
+    parser.add_argument("--warehouses", type=int, default=5)
+    parser.add_argument("--selling", type=float, default=0.2, help="Fraction of pairs with recent shipments")
+    parser.add_argument("--days", type=int, default=28, help="Days of shipments for selling pairs")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    prefix = f"PLANBENCH-{uuid.uuid4().hex[:8]}"
+    rng = np.random.default_rng(42)
+
+    start = time.perf_counter()
+    with engine.begin() as connection:
+        for offset in range(0, args.skus, SEED_CHUNK):
+            connection.execute(insert(Product), [
+                {"sku": f"{prefix}-{i:07d}", "name": f"Plan Bench {i}", "price": float(rng.uniform(1, 200))}
+                for i in range(offset, min(offset + SEED_CHUNK, args.skus))
+            ])
+        connection.execute(insert(Warehouse), [
+            {"code": f"{prefix}-WH{i}", "name": f"Bench Warehouse {i}"} for i in range(args.warehouses)
+        ])
+        product_ids = np.array(connection.execute(
+            select(Product.id).where(Product.sku.like(f"{prefix}-%"))
+        ).scalars().all())
+        warehouse_ids = np.array(connection.execute(
+            select(Warehouse.id).where(Warehouse.code.like(f"{prefix}-%"))
+        ).scalars().all())
+
+        pairs_p = np.repeat(product_ids, len(warehouse_ids))
+        pairs_w = np.tile(warehouse_ids, len(product_ids))
+        on_hand = rng.integers(0, 500, size=len(pairs_p))
+        for offset in range(0, len(pairs_p), SEED_CHUNK):
+            connection.execute(insert(InventoryLevel), [
+                {"product_id": p, "warehouse_id": w, "on_hand": q}
+                for p, w, q in zip(*(column[offset:offset + SEED_CHUNK].tolist() for column in (pairs_p, pairs_w, on_hand)))
+            ])
+
+        selling = rng.random(len(pairs_p)) < args.selling
+        today = date.today()
+        shipments = [
+            {"product_id": p, "warehouse_id": w, "quantity": -q, "movement_type": "shipment",
+             "occurred_at": datetime.combine(today - timedelta(days=d), datetime.min.time())}
+            for d in range(1, args.days + 1)
+            for p, w, q in zip(
+                pairs_p[selling].tolist(), pairs_w[selling].tolist(),
+                rng.poisson(4, size=int(selling.sum())).tolist(),
+            )
+            if q
+        ]
+        for offset in range(0, len(shipments), SEED_CHUNK):
+            connection.execute(insert(StockMovement), shipments[offset:offset + SEED_CHUNK])
+    print(f"Seeded {len(pairs_p):,} pairs and {len(shipments):,} shipments in {time.perf_counter() - start:.1f}s")
+
+    try:
+        db = SessionLocal()
+        try:
+            computed_at = datetime.now().astimezone()
+            inputs, load_elapsed = timed("Load", load_planning_inputs, db)
+            plan, plan_elapsed = timed("Plan", plan_replenishment, inputs)
+            _, store_elapsed = timed(
+                "Upsert", store_plans, db, inputs, plan, settings.REPLENISHMENT_LEAD_TIME_DAYS, computed_at
+            )
+            db.commit()
+        finally:
+            db.close()
+        total = load_elapsed + plan_elapsed + store_elapsed
+        print(f"{len(inputs.product_ids):,} pairs in {total:.2f}s: {len(inputs.product_ids) / total:,.0f} pairs/sec, "
+              f"{int(np.count_nonzero(plan.order_quantity)):,} to reorder")
+    finally:
+        with engine.begin() as connection:
+            for model in (ReplenishmentPlan, StockMovement, InventoryLevel):
+                connection.execute(delete(model).where(model.warehouse_id.in_(warehouse_ids.tolist())))
+            connection.execute(delete(Warehouse).where(Warehouse.id.in_(warehouse_ids.tolist())))
+            connection.execute(delete(Product).where(Product.sku.like(f"{prefix}-%")))
+
+
+if __name__ == "__main__":
+    main()
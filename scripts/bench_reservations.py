@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+# scripts/bench_reservations.py
+"""
+Measure stock reservation throughput under contention and check for oversell.
+
+Many threads, each with its own session, reserve small quantities of a
+handful of hot SKUs at once against the database at DATABASE_URL, like a
+flash sale. Afterwards reserved stock must never exceed on-hand stock, and
+must equal the sum of the held reservation lines.
+"""
+
+import argparse
+import os
+import random
+import threading
+import time
+import uuid
+from collections import Counter
+
+from sqlalchemy import create_engine, delete, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.inventory import (
+    InventoryLevel,
+    InventoryTotal,
+    StockReservation,
+    StockReservationLine,
+    Warehouse,
+)
+from app.models.product import Product
+from app.schemas.inventory import ReservationCreate, ReservationLine
+from app.services.inventory import reserve_stock
+
+# Database connection
+DB_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/supply_chain_db")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--threads", type=int, default=200)
+    parser.add_argument("--reservations", type=int, default=25, help="Reservations per thread")
+    parser.add_argument("--products", type=int, default=5, help="Hot SKUs to contend on")
+    parser.add_argument("--warehouses", type=int, default=3)
+    parser.add_argument("--stock", type=int, default=1_000, help="On-hand stock per product and warehouse")
+    args = parser.parse_args()
+
+    engine = create_engine(DB_URL, pool_size=args.threads, max_overflow=0)
+    SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+    Base.metadata.create_all(bind=engine)
+    prefix = f"RESBENCH-{uuid.uuid4().hex[:8]}"
+
+    with engine.begin() as connection:
+        connection.execute(insert(Product), [
+            {"sku": f"{prefix}-{i:03d}", "name": f"Reservation Bench {i}", "price": 5.0}
+            for i in range(args.products)
+        ])
+        connection.execute(insert(Warehouse), [
+            {"code": f"{prefix}-WH{i}", "name": f"Bench Warehouse {i}"} for i in range(args.warehouses)
+        ])
+        product_ids = connection.execute(select(Product.id).where(Product.sku.like(f"{prefix}-%"))).scalars().all()
+        warehouse_ids = connection.execute(
+            select(Warehouse.id).where(Warehouse.code.like(f"{prefix}-%"))
+        ).scalars().all()
+        connection.execute(insert(InventoryLevel), [
+            {"product_id": p, "warehouse_id": w, "on_hand": args.stock}
+            for p in product_ids for w in warehouse_ids
+        ])
+        connection.execute(insert(InventoryTotal), [
+            {"product_id": p, "on_hand": args.stock * len(warehouse_ids)} for p in product_ids
+        ])
+
+    outcomes = Counter()
+    errors = []
+    lock = threading.Lock()
+    start_line = threading.Barrier(args.threads)
+
+    def worker(seed: int):
+        rng = random.Random(seed)
+        db = SessionLocal()
+        try:
+            start_line.wait()
+            for _ in range(args.reservations):
+                reservation = ReservationCreate(lines=[
+                    ReservationLine(product_id=product_id, quantity=rng.randint(1, 5))
+                    for product_id in rng.sample(product_ids, k=min(2, len(product_ids)))
+                ])
+                result = reserve_stock(db, [reservation])
+                with lock:
+                    outcomes[result.results[0].status] += 1
+        except Exception as exc:
+            db.rollback()
+            with lock:
+                errors.append(repr(exc))
+        finally:
+            db.close()
+
+    threads = [threading.Thread(target=worker, args=(seed,)) for seed in range(args.threads)]
+    try:
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        with engine.connect() as connection:
+            oversold = connection.execute(
+                select(func.count()).select_from(InventoryLevel)
+                .where(InventoryLevel.product_id.in_(product_ids), InventoryLevel.reserved > InventoryLevel.on_hand)
+            ).scalar_one()
+            reserved = connection.execute(
+                select(func.coalesce(func.sum(InventoryLevel.reserved), 0))
+                .where(InventoryLevel.product_id.in_(product_ids))
+            ).scalar_one()
+            held = connection.execute(
+                select(func.coalesce(func.sum(StockReservationLine.quantity), 0))
+                .join(StockReservation, StockReservation.id == StockReservationLine.reservation_id)
+                .where(StockReservationLine.product_id.in_(product_ids), StockReservation.status == "held")
+            ).scalar_one()
+    finally:
+        with engine.begin() as connection:
+            ids = connection.execute(
+                select(StockReservationLine.reservation_id).where(StockReservationLine.product_id.in_(product_ids))
+            ).scalars().all()
+            connection.execute(delete(StockReservationLine).where(StockReservationLine.reservation_id.in_(ids)))
+            connection.execute(delete(StockReservation).where(StockReservation.id.in_(ids)))
+            for model in (InventoryLevel, InventoryTotal):
+                connection.execute(delete(model).where(model.product_id.in_(product_ids)))
+            connection.execute(delete(Warehouse).where(Warehouse.id.in_(warehouse_ids)))
+            connection.execute(delete(Product).where(Product.id.in_(product_ids)))
+
+    attempted = sum(outcomes.values())
+    print(f"{attempted} reservations from {args.threads} threads in {elapsed:.2f}s: "
+          f"{attempted / elapsed:,.0f} reservations/sec")
+    print(f"held: {outcomes['held']}  rejected: {outcomes['rejected']}  errors: {len(errors)}")
+    for error in errors[:5]:
+        print(f"  {error}")
+    print(f"reserved: {reserved}  held lines: {held}  oversold levels: {oversold}")
+    if oversold or reserved != held:
+        raise SystemExit("Reservation invariants violated")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+# scripts/bench_responses.py
+"""
+Measure CPU per request and bytes on the wire of the list and export
+endpoints for each response coding.
+
+Requests go through the real app (in-process TestClient, so the middleware
+stack runs) against the database at DATABASE_URL. CPU is process time
+spent per request, including serialization and compression; wire bytes
+are the response body as sent, before the client decodes it.
+"""
+
+import argparse
+import os
+import time
+
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.cache import product_cache
+from app.database import get_db
+from app.main import app
+from app.middleware import brotli
+from app.models.product import Product
+
+# Database connection
+DB_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/supply_chain_db")
+engine = create_engine(DB_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+ENDPOINTS = {
+    "list": ("/api/v1/products/", {"limit": 1000}),
+    "export": ("/api/v1/products/export", {"format": "ndjson"}),
+}
+
+
+def override_get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+
+def seed(rows: int):
+    """Top the products table up to `rows` rows."""
+    Product.__table__.create(bind=engine, checkfirst=True)
+    with engine.begin() as connection:
+        existing = connection.execute(select(func.count()).select_from(Product)).scalar()
+        if existing >= rows:
+            return
+        print(f"Seeding {rows - existing} products...")
+        connection.execute(insert(Product), [
+            {
+                "sku": f"WIRE-{i:09d}", "name": f"Wire Product {i:09d}",
+                "description": "Stackable storage bin with snap-on lid.", "price": 9.99,
+                "weight": 1.5, "is_active": True,
+            }
+            for i in range(existing, rows)
+        ])
+
+
+def measure(client: TestClient, path: str, params: dict, encoding: str, repeat: int):
+    """Mean CPU milliseconds per request and wire bytes of one response."""
+    wire_bytes = 0
+    start = time.process_time()
+    for _ in range(repeat):
+        with client.stream("GET", path, params=params, headers={"Accept-Encoding": encoding}) as response:
+            response.raise_for_status()
+            wire_bytes = sum(len(chunk) for chunk in response.iter_raw())
+    return (time.process_time() - start) * 1000 / repeat, wire_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    seed(args.rows)
+    product_cache.enabled = False  # Measure serialization, not list cache hits
+    app.dependency_overrides[get_db] = override_get_db
+    encodings = ["identity", "gzip"] + (["br"] if brotli is not None else [])
+
+    print(f"{'endpoint':>8} {'encoding':>9} {'cpu ms/req':>11} {'wire bytes':>12}")
+    with TestClient(app) as client:
+        for name, (path, params) in ENDPOINTS.items():
+            for encoding in encodings:
+                cpu_ms, wire_bytes = measure(client, path, params, encoding, args.repeat)
+                print(f"{name:>8} {encoding:>9} {cpu_ms:>11.2f} {wire_bytes:>12}")
+
+
+if __name__ == "__main__":
+    main()
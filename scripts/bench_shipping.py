@@ -0,0 +1,90 @@
+#!/usr/bin/env python3
+# scripts/bench_shipping.py
+"""
+Time shipping quotes for batches of multi-item orders.
+
+Seeds --skus products with random weights and dimensions at DATABASE_URL,
+then quotes --batches batches of --orders orders, each of a few lines drawn
+from the catalog, and reports orders and packages per second.
+"""
+
+import argparse
+import os
+import time
+import uuid
+
+import numpy as np
+from sqlalchemy import create_engine, delete, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.models.product import Product
+from app.schemas.shipping import ShippingOrder, ShippingOrderLine
+from app.services.shipping import quote_orders
+
+# Database connection
+DB_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/supply_chain_db")
+engine = create_engine(DB_URL)
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+SEED_CHUNK = 50_000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--skus", type=int, default=10_000)
+    parser.add_argument("--orders", type=int, default=5000, help="Orders per batch")
+    parser.add_argument("--batches", type=int, default=5)
+    parser.add_argument("--max-lines", type=int, default=6)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    prefix = f"SHIPBENCH-{uuid.uuid4().hex[:8]}"
+    rng = np.random.default_rng(42)
+
+    # Mostly small parcels, with a tail of bulky items
+    dims = np.round(rng.lognormal(np.log([20, 12, 6]), 0.6, size=(args.skus, 3)), 1)
+    weight = np.round(dims.prod(axis=1) / 4000 * rng.uniform(0.3, 2.0, size=args.skus), 3)
+    with engine.begin() as connection:
+        for offset in range(0, args.skus, SEED_CHUNK):
+            connection.execute(insert(Product), [
+                {"sku": f"{prefix}-{i:07d}", "name": f"Ship Bench {i}", "price": 10.0, "weight": weight[i],
+                 "length": dims[i, 0], "width": dims[i, 1], "height": dims[i, 2]}
+                for i in range(offset, min(offset + SEED_CHUNK, args.skus))
+            ])
+        product_ids = np.array(connection.execute(
+            select(Product.id).where(Product.sku.like(f"{prefix}-%"))
+        ).scalars().all())
+
+    try:
+        total_orders = total_packages = 0
+        elapsed = 0.0
+        for _ in range(args.batches):
+            orders = [
+                ShippingOrder(lines=[
+                    ShippingOrderLine(product_id=product_id, quantity=quantity)
+                    for product_id, quantity in zip(
+                        rng.choice(product_ids, size=lines).tolist(), rng.integers(1, 4, size=lines).tolist()
+                    )
+                ])
+                for lines in rng.integers(1, args.max_lines + 1, size=args.orders).tolist()
+            ]
+            db = SessionLocal()
+            try:
+                start = time.perf_counter()
+                result = quote_orders(db, orders)
+                elapsed += time.perf_counter() - start
+            finally:
+                db.close()
+            assert result.failed == 0
+            total_orders += result.quoted
+            total_packages += sum(len(quote.packages) for quote in result.results)
+        print(f"{total_orders:,} orders, {total_packages:,} packages in {elapsed:.2f}s: "
+              f"{total_orders / elapsed:,.0f} orders/sec, {total_packages / elapsed:,.0f} packages/sec")
+    finally:
+        with engine.begin() as connection:
+            connection.execute(delete(Product).where(Product.sku.like(f"{prefix}-%")))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,372 @@
+#!/usr/bin/env python3
+# scripts/generate_catalog.py
+"""
+Generate a synthetic product catalog and a matching request trace.
+
+The catalog is a CSV file that seed_products.py loads. SKUs look like
+`ELC-VOL-00001234` (category, brand, serial). Names combine a brand, an
+adjective, a category noun and sometimes a model number. Brands, adjectives
+and categories are drawn from Zipf-skewed distributions, so a few dominate
+as in real catalogs. Prices, sizes and densities are lognormal around
+per-category medians. Some products have no dimensions and a few are
+inactive.
+
+The trace is JSON lines in the backlog format of the repo's requests.jsonl,
+one request per line:
+
+    {"request_id": "trace-000000001", "title": "GET /api/v1/products/42", "body": ""}
+
+`title` is the method and path, and `body` is the JSON request body or
+empty. Products are picked by Zipfian popularity over a random ranking, so
+a few hot SKUs take most of the traffic. Reads (detail, listing, search,
+lookup, size range) and writes (price updates, stock movements, shipping
+quotes) are mixed by --write-ratio. Product ids assume the catalog was
+loaded into an empty table, in file order.
+
+Everything is generated with whole-array NumPy operations. CSV rows are
+rendered into a byte matrix, a fixed-width slot per field padded with NUL
+bytes, and the padding is dropped in one step. The same --seed always gives
+the same files.
+
+    python scripts/generate_catalog.py --products 10000000 --products-out catalog.csv \\
+        --requests 1000000 --requests-out trace.jsonl
+"""
+
+import argparse
+import gzip
+import time
+from typing import List, NamedTuple, Sequence
+
+import numpy as np
+import orjson
+
+PAD = 0  # Filler byte of unused slot positions, dropped when rows are joined
+CHUNK_ROWS = 500_000
+
+# code, nouns, median price, median (length, width, height) in cm, median density in kg/l
+CATEGORIES = [
+    ("ELC", ["Phone", "Tablet", "Charger", "Cable", "Speaker", "Headphones", "Monitor", "Keyboard"],
+     90.0, (18.0, 10.0, 4.0), 0.6),
+    ("HOM", ["Lamp", "Vase", "Cushion", "Rug", "Frame", "Clock", "Candle", "Mirror"],
+     35.0, (30.0, 25.0, 15.0), 0.3),
+    ("KIT", ["Pan", "Pot", "Knife", "Blender", "Kettle", "Toaster", "Mug", "Bowl"],
+     30.0, (28.0, 20.0, 14.0), 0.5),
+    ("APP", ["Shirt", "Jeans", "Jacket", "Dress", "Sweater", "Scarf", "Socks", "Hat"],
+     28.0, (35.0, 25.0, 4.0), 0.2),
+    ("SPO", ["Yoga Mat", "Dumbbell", "Ball", "Racket", "Bottle", "Helmet", "Gloves", "Rope"],
+     25.0, (30.0, 15.0, 10.0), 0.5),
+    ("BTY", ["Cream", "Serum", "Shampoo", "Lotion", "Lipstick", "Perfume", "Brush", "Mask"],
+     15.0, (10.0, 6.0, 5.0), 0.9),
+    ("TOY", ["Puzzle", "Robot", "Doll", "Blocks", "Car", "Kite", "Plush", "Game"],
+     20.0, (25.0, 20.0, 10.0), 0.25),
+    ("OFF", ["Notebook", "Pen", "Stapler", "Binder", "Desk Lamp", "Chair", "Folder", "Marker"],
+     12.0, (25.0, 18.0, 4.0), 0.6),
+    ("GRD", ["Hose", "Planter", "Shovel", "Seeds", "Sprinkler", "Shears", "Trowel", "Lantern"],
+     22.0, (40.0, 20.0, 12.0), 0.4),
+    ("PET", ["Leash", "Bed", "Bowl", "Toy", "Collar", "Brush", "Carrier", "Treats"],
+     18.0, (30.0, 20.0, 10.0), 0.35),
+    ("AUT", ["Wiper", "Mat", "Charger", "Cover", "Polish", "Jack", "Light", "Filter"],
+     30.0, (40.0, 25.0, 10.0), 0.5),
+    ("FRN", ["Shelf", "Table", "Stool", "Cabinet", "Desk", "Bench", "Wardrobe", "Sofa"],
+     180.0, (90.0, 50.0, 40.0), 0.15),
+]
+
+BRANDS = [
+    "Acme", "Volta", "Nordic", "Zephyr", "Orion", "Lumen", "Kestrel", "Maple", "Quartz", "Summit",
+    "Tidal", "Vertex", "Willow", "Apex", "Boreal", "Cobalt", "Delta", "Ember", "Fjord", "Granite",
+    "Harbor", "Iris", "Juniper", "Kinetic", "Lark", "Meridian", "Nimbus", "Onyx", "Pioneer", "Radiant",
+    "Sierra", "Tundra", "Umber", "Vista", "Wren", "Yarrow", "Zenith", "Atlas", "Beacon", "Cedar",
+]
+
+ADJECTIVES = [
+    "Classic", "Premium", "Compact", "Deluxe", "Essential", "Ultra", "Pro", "Smart", "Eco", "Mini",
+    "Max", "Lite", "Heavy-Duty", "Portable", "Wireless", "Organic", "Vintage", "Modern", "Soft", "Rapid",
+    "Silent", "Bold", "Slim", "Grand", "Urban", "Rustic", "Sport", "Travel", "Studio", "Everyday",
+]
+
+DESCRIPTIONS = [
+    "Bestseller with free returns", "Durable everyday quality", "Limited edition", "Eco-friendly materials",
+    "Award-winning design", "Great value", "Backed by a two-year warranty", "Customer favourite",
+    "New for this season", "Professional grade", "Handmade", "Easy to clean", "Lightweight and strong",
+    "Gift ready", "Imported", "Recycled packaging",
+]
+
+# Mix of reads and of writes in the trace, by operation
+READS = {"detail": 0.70, "list": 0.12, "search": 0.10, "lookup": 0.05, "range": 0.03}
+WRITES = {"update": 0.5, "movement": 0.3, "quote": 0.2}
+
+
+class Catalog(NamedTuple):
+    """One entry per product, in file order."""
+    category: np.ndarray
+    brand: np.ndarray
+    adjective: np.ndarray
+    noun: np.ndarray  # Index into the category's nouns
+    model: np.ndarray  # Model number, 0 for none
+    description: np.ndarray  # Index into DESCRIPTIONS, -1 for none
+    price_cents: np.ndarray
+    weight_grams: np.ndarray
+    dims_mm: np.ndarray  # (products, 3)
+    has_dims: np.ndarray
+    active: np.ndarray
+
+
+def zipf_weights(size: int, exponent: float) -> np.ndarray:
+    weights = 1.0 / np.arange(1, size + 1, dtype=np.float64) ** exponent
+    return weights / weights.sum()
+
+
+def generate_catalog(rng: np.random.Generator, products: int) -> Catalog:
+    category = rng.choice(len(CATEGORIES), size=products, p=zipf_weights(len(CATEGORIES), 0.8)).astype(np.int8)
+    brand = rng.choice(len(BRANDS), size=products, p=zipf_weights(len(BRANDS), 1.1)).astype(np.int16)
+    adjective = rng.choice(len(ADJECTIVES), size=products, p=zipf_weights(len(ADJECTIVES), 1.0)).astype(np.int16)
+    noun = rng.choice(8, size=products, p=zipf_weights(8, 0.7)).astype(np.int8)
+    model = np.where(rng.random(products) < 0.6, rng.integers(1, 10_000, size=products), 0).astype(np.int32)
+    description = np.where(
+        rng.random(products) < 0.8, rng.integers(0, len(DESCRIPTIONS), size=products), -1
+    ).astype(np.int8)
+
+    median_price = np.array([c[2] for c in CATEGORIES])[category]
+    price = median_price * rng.lognormal(0.0, 0.7, size=products)
+    price_cents = np.maximum(np.round(price * 100), 99).astype(np.int64)
+    # Most prices end in .99
+    charm = rng.random(products) < 0.6
+    price_cents[charm] = price_cents[charm] // 100 * 100 + 99
+
+    median_dims = np.array([c[3] for c in CATEGORIES])[category]
+    dims_cm = median_dims * rng.lognormal(0.0, 0.35, size=(products, 3))
+    dims_mm = np.clip(np.round(dims_cm * 10), 1, 99_999).astype(np.int32)
+    density = np.array([c[4] for c in CATEGORIES])[category] * rng.lognormal(0.0, 0.3, size=products)
+    liters = dims_mm.prod(axis=1, dtype=np.float64) / 1e6
+    weight_grams = np.clip(np.round(liters * density * 1000), 5, 9_999_999).astype(np.int32)
+
+    return Catalog(
+        category=category,
+        brand=brand,
+        adjective=adjective,
+        noun=noun,
+        model=model,
+        description=description,
+        price_cents=price_cents,
+        weight_grams=weight_grams,
+        dims_mm=dims_mm,
+        has_dims=rng.random(products) >= 0.05,
+        active=rng.random(products) >= 0.03,
+    )
+
+
+def sku_codes(catalog: Catalog, index: np.ndarray) -> List[str]:
+    """SKUs of the products at `index`."""
+    codes = np.array([c[0] for c in CATEGORIES], dtype=object)[catalog.category[index]]
+    brands = np.array([b[:3].upper() for b in BRANDS], dtype=object)[catalog.brand[index]]
+    return [f"{code}-{brand}-{serial:08d}" for code, brand, serial in zip(codes, brands, index.tolist())]
+
+
+# CSV rendering
+
+def _vocabulary(words: Sequence[str]) -> np.ndarray:
+    """Words as rows of ASCII bytes, padded to the longest."""
+    width = max(len(word) for word in words)
+    rows = np.full((len(words), width), PAD, dtype=np.uint8)
+    for row, word in enumerate(words):
+        rows[row, :len(word)] = np.frombuffer(word.encode("ascii"), dtype=np.uint8)
+    return rows
+
+
+def _integers(values: np.ndarray, width: int, min_digits: int = 1) -> np.ndarray:
+    """Decimal digits of non-negative integers, right aligned in `width` bytes."""
+    if len(values) and (values.min() < 0 or values.max() >= 10 ** width):
+        raise ValueError(f"Values must be between 0 and {10 ** width - 1}, not {values.min()}..{values.max()}")
+    powers = 10 ** np.arange(width - 1, -1, -1, dtype=np.int64)
+    values = values.astype(np.int64)[:, None]
+    out = (values // powers % 10 + ord("0")).astype(np.uint8)
+    out[(values < powers) & (np.arange(width) < width - min_digits)] = PAD
+    return out
+
+
+def _fixed(values: np.ndarray, width: int, decimals: int) -> np.ndarray:
+    """Integers scaled by 10**decimals, written as decimals."""
+    scale = 10 ** decimals
+    return np.hstack([
+        _integers(values // scale, width),
+        np.full((len(values), 1), ord("."), dtype=np.uint8),
+        _integers(values % scale, decimals, min_digits=decimals),
+    ])
+
+
+def _literal(text: str, rows: int) -> np.ndarray:
+    return np.tile(np.frombuffer(text.encode("ascii"), dtype=np.uint8), (rows, 1))
+
+
+def render_products(catalog: Catalog, start: int, stop: int) -> bytes:
+    """CSV rows of products start..stop."""
+    rows = stop - start
+    part = slice(start, stop)
+    category = catalog.category[part]
+    index = np.arange(start, stop)
+
+    nouns = [noun for c in CATEGORIES for noun in c[1]]
+    model = catalog.model[part]
+    model_slot = np.hstack([_literal(" X", rows), _integers(model, 4)])
+    model_slot[model == 0] = PAD
+    description = catalog.description[part]
+    description_slot = _vocabulary(DESCRIPTIONS)[np.maximum(description, 0)]
+    description_slot[description < 0] = PAD
+    # Products without dimensions get empty fields, keeping the commas between them
+    dims = catalog.dims_mm[part]
+    dims_fields = [_fixed(dims[:, axis], 4, 1) for axis in range(3)]
+    for field in dims_fields:
+        field[~catalog.has_dims[part]] = PAD
+    comma = _literal(",", rows)
+
+    matrix = np.hstack([
+        _vocabulary([c[0] for c in CATEGORIES])[category],
+        _literal("-", rows),
+        _vocabulary([b[:3].upper() for b in BRANDS])[catalog.brand[part]],
+        _literal("-", rows),
+        _integers(index, 8, min_digits=8),
+        _literal(",", rows),
+        _vocabulary(BRANDS)[catalog.brand[part]],
+        _literal(" ", rows),
+        _vocabulary(ADJECTIVES)[catalog.adjective[part]],
+        _literal(" ", rows),
+        _vocabulary(nouns)[category.astype(np.int64) * 8 + catalog.noun[part]],
+        model_slot,
+        _literal(",", rows),
+        description_slot,
+        _literal(",", rows),
+        _fixed(catalog.price_cents[part], 7, 2),
+        _literal(",", rows),
+        _fixed(catalog.weight_grams[part], 4, 3),
+        _literal(",", rows),
+        dims_fields[0], comma, dims_fields[1], comma, dims_fields[2],
+        _literal(",", rows),
+        _vocabulary(["true", "false"])[(~catalog.active[part]).astype(np.int8)],
+        _literal("\n", rows),
+    ])
+    return matrix[matrix != PAD].tobytes()
+
+
+def _open(path: str):
+    return gzip.open(path, "wb", compresslevel=1) if path.endswith(".gz") else open(path, "wb")
+
+
+def write_products(catalog: Catalog, path: str):
+    with _open(path) as out:
+        out.write(b"sku,name,description,price,weight,length,width,height,is_active\n")
+        for start in range(0, len(catalog.price_cents), CHUNK_ROWS):
+            out.write(render_products(catalog, start, min(start + CHUNK_ROWS, len(catalog.price_cents))))
+
+
+# Request trace
+
+def write_requests(
+    rng: np.random.Generator, catalog: Catalog, path: str, requests: int,
+    write_ratio: float, exponent: float, warehouses: int, api_prefix: str,
+):
+    products = len(catalog.price_cents)
+    # Popularity rank -> product, so hot products are spread over the catalog
+    ranking = rng.permutation(products)
+    cdf = np.cumsum(zipf_weights(products, exponent))
+    hot = ranking[np.minimum(np.searchsorted(cdf, rng.random((requests, 10))), products - 1)]
+    product = hot[:, 0]
+
+    names = list(READS) + list(WRITES)
+    mix = np.r_[np.array(list(READS.values())) * (1 - write_ratio), np.array(list(WRITES.values())) * write_ratio]
+    operation = rng.choice(len(names), size=requests, p=mix / mix.sum())
+
+    titles = np.empty(requests, dtype=object)
+    bodies = np.full(requests, "", dtype=object)
+    ids = (product + 1).tolist()
+    prefix = f"{api_prefix}/products"
+
+    at = np.flatnonzero(operation == names.index("detail"))
+    titles[at] = [f"GET {prefix}/{ids[i]}" for i in at.tolist()]
+
+    at = np.flatnonzero(operation == names.index("list"))
+    order = np.where(rng.random(len(at)) < 0.7, "id", "name")
+    titles[at] = [f"GET {prefix}/?limit=50&cursor=&order_by={o}" for o in order.tolist()]
+
+    at = np.flatnonzero(operation == names.index("search"))
+    nouns = [noun for c in CATEGORIES for noun in c[1]]
+    terms = np.array(nouns, dtype=object)[catalog.category[product[at]].astype(np.int64) * 8 + catalog.noun[product[at]]]
+    titles[at] = [f"GET {prefix}/?search={term.replace(' ', '+')}&limit=20" for term in terms.tolist()]
+
+    at = np.flatnonzero(operation == names.index("lookup"))
+    titles[at] = f"POST {prefix}/lookup"
+    skus = sku_codes(catalog, hot[at].ravel())
+    bodies[at] = [orjson.dumps({"skus": skus[i * 10:(i + 1) * 10]}).decode() for i in range(len(at))]
+
+    at = np.flatnonzero(operation == names.index("range"))
+    low = np.round(rng.lognormal(np.log(2000), 1.0, size=len(at)))
+    titles[at] = [f"GET {prefix}/?min_volume={v:.0f}&max_volume={v * 4:.0f}&limit=50" for v in low.tolist()]
+
+    at = np.flatnonzero(operation == names.index("update"))
+    titles[at] = [f"PUT {prefix}/{ids[i]}" for i in at.tolist()]
+    price = np.round(catalog.price_cents[product[at]] * rng.uniform(0.9, 1.1, size=len(at))) / 100
+    bodies[at] = [orjson.dumps({"price": max(p, 0.01)}).decode() for p in price.tolist()]
+
+    at = np.flatnonzero(operation == names.index("movement"))
+    titles[at] = f"POST {api_prefix}/inventory/movements"
+    skus = sku_codes(catalog, product[at])
+    warehouse = rng.integers(1, warehouses + 1, size=len(at)).tolist()
+    quantity = rng.integers(1, 5, size=len(at)).tolist()
+    bodies[at] = [
+        orjson.dumps([{"sku": sku, "warehouse_code": f"WH-{w}", "quantity": -q, "movement_type": "shipment"}]).decode()
+        for sku, w, q in zip(skus, warehouse, quantity)
+    ]
+
+    at = np.flatnonzero(operation == names.index("quote"))
+    titles[at] = f"POST {api_prefix}/shipping/quotes"
+    lines = rng.integers(1, 6, size=len(at))
+    skus = sku_codes(catalog, hot[at].ravel())
+    bodies[at] = [
+        orjson.dumps([{"lines": [{"sku": sku, "quantity": 1} for sku in skus[i * 10:i * 10 + n]]}]).decode()
+        for i, n in enumerate(lines.tolist())
+    ]
+
+    with _open(path) as out:
+        for start in range(0, requests, CHUNK_ROWS):
+            stop = min(start + CHUNK_ROWS, requests)
+            out.write(b"".join(
+                orjson.dumps({"request_id": f"trace-{n + 1:09d}", "title": title, "body": body}) + b"\n"
+                for n, title, body in zip(range(start, stop), titles[start:stop], bodies[start:stop])
+            ))
+    return {name: int(count) for name, count in zip(names, np.bincount(operation, minlength=len(names)))}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--products", type=int, default=1_000_000)
+    parser.add_argument("--products-out", default="catalog.csv", help="CSV file, gzipped if it ends in .gz")
+    parser.add_argument("--requests", type=int, default=0, help="Requests in the trace; none by default")
+    parser.add_argument("--requests-out", default="trace.jsonl")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="Share of requests that write")
+    parser.add_argument("--zipf", type=float, default=1.1, help="Exponent of product popularity")
+    parser.add_argument("--warehouses", type=int, default=3, help="Warehouse codes WH-1..WH-n used by movements")
+    parser.add_argument("--api-prefix", default="/api/v1")
+    parser.add_argument("--seed", type=int, default=42)
+    args = parser.parse_args()
+    if not 0 < args.products < 10 ** 8:
+        parser.error("--products must be between 1 and 99,999,999")
+
+    rng = np.random.default_rng(args.seed)
+    start = time.perf_counter()
+    catalog = generate_catalog(rng, args.products)
+    write_products(catalog, args.products_out)
+    elapsed = time.perf_counter() - start
+    print(f"{args.products:,} products in {elapsed:.1f}s ({args.products / elapsed:,.0f} rows/sec) -> {args.products_out}")
+
+    if args.requests:
+        start = time.perf_counter()
+        counts = write_requests(
+            rng, catalog, args.requests_out, args.requests,
+            args.write_ratio, args.zipf, args.warehouses, args.api_prefix,
+        )
+        elapsed = time.perf_counter() - start
+        mix = ", ".join(f"{name} {count:,}" for name, count in counts.items())
+        print(f"{args.requests:,} requests in {elapsed:.1f}s -> {args.requests_out} ({mix})")
+
+
+if __name__ == "__main__":
+    main()
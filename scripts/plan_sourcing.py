@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+# scripts/plan_sourcing.py
+"""
+Allocate every product's replenishment order across its suppliers by landed
+cost, within supplier capacities, from cron or another scheduler. Sourcing
+reads the stored replenishment plans, so schedule it after
+scripts/refresh_replenishment.py.
+
+    python -m scripts.plan_sourcing
+"""
+
+import argparse
+import time
+
+from app.database import SessionLocal
+from app.services.sourcing import plan_sourcing
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        run = plan_sourcing(db)
+    print(
+        f"Sourced {run.products:,} products with {run.solver}: {run.allocated:,} units allocated, "
+        f"{run.unallocated:,} unallocated, in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+# scripts/refresh_forecasts.py
+"""
+Refresh the stored demand forecasts, from cron or another scheduler.
+
+By default the first run of a day refits every product and later runs only
+those with new demand; --full forces a full refit. Holt-Winters fits run in
+a process pool of FORECAST_WORKERS processes, or --workers.
+
+    python -m scripts.refresh_forecasts [--full] [--workers N]
+"""
+
+import argparse
+import time
+
+from app.database import SessionLocal
+from app.services.forecasting import METHODS, refresh_forecasts
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--full", action="store_true", default=None, help="Refit every product")
+    parser.add_argument("--method", choices=METHODS, default="auto")
+    parser.add_argument("--workers", type=int, default=None, help="Processes for Holt-Winters fits")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        run = refresh_forecasts(db, full=args.full, method=args.method, workers=args.workers)
+    print(
+        f"{'Full' if run.full else 'Incremental'} refresh {run.id}: {run.products:,} forecasts "
+        f"through {run.history_end} in {time.perf_counter() - started:.1f}s"
+    )
+
+
+if __name__ == "__main__":
+    main()
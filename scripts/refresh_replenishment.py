@@ -0,0 +1,28 @@
+#!/usr/bin/env python3
+# scripts/refresh_replenishment.py
+"""
+Recompute the replenishment plan of every active product at every
+warehouse, from cron or another scheduler. Plans read the stored forecasts,
+so schedule it after scripts/refresh_forecasts.py.
+
+    python -m scripts.refresh_replenishment
+"""
+
+import argparse
+import time
+
+from app.database import SessionLocal
+from app.services.replenishment import refresh_replenishment
+
+
+def main():
+    argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter).parse_args()
+
+    started = time.perf_counter()
+    with SessionLocal() as db:
+        run = refresh_replenishment(db)
+    print(f"Planned {run.plans:,} pairs, {run.reorders:,} to reorder, in {time.perf_counter() - started:.1f}s")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,37 +1,54 @@
 #!/usr/bin/env python3
 # scripts/seed_products.py
+"""
+Load products from CSV or NDJSON files, matched on SKU.
 
-import datetime
-from sqlalchemy import create_engine, Column, Integer, String, Float, Boolean, Text, DateTime, MetaData, Table, Index
-from sqlalchemy.ext.declarative import declarative_base
-from sqlalchemy.orm import sessionmaker
-from sqlalchemy.sql import func
-import os
-
-# Database connection 
-DB_URL = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/supply_chain_db")
-engine = create_engine(DB_URL)
-metadata = MetaData()
-Base = declarative_base()
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-# Define Product model
-class Product(Base):
-    __tablename__ = "products"
-    
-    id = Column(Integer, primary_key=True, index=True)
-    sku = Column(String, unique=True, index=True, nullable=False)
-    name = Column(String, index=True, nullable=False)
-    description = Column(Text)
-    price = Column(Float, nullable=False)
-    weight = Column(Float)
-    dimensions = Column(String)
-    # category_id = Column(Integer, nullable=True)
-    is_active = Column(Boolean, default=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-    updated_at = Column(DateTime(timezone=True), onupdate=func.now())
-
-# Sample products (without category references)
+Each file (optionally gzipped) is read in batches of --batch-size rows.
+A batch is streamed with COPY into a temporary staging table and merged
+into products with one INSERT ... SELECT ... ON CONFLICT (sku); rows whose
+values haven't changed are left alone, so reloading a file is cheap and
+doesn't flood the change feed. Each batch commits on its own, then evicts
+the cached details of the products it created or changed.
+
+Rows take the fields of a product create: sku, name, description, price,
+weight, dimensions and is_active. CSV files may give length, width and
+height columns instead of the dimensions JSON. Invalid rows are reported
+and skipped. Without files, a handful of sample products are loaded.
+
+The loader uses the application's models and settings, so it loads into
+the PostgreSQL database at DATABASE_URL, which must already be migrated.
+Run it from the repository root as a module, or with the root on
+PYTHONPATH as the Docker image has:
+
+    alembic upgrade head
+    python -m scripts.seed_products catalog.csv.gz more.ndjson
+    PYTHONPATH=. python scripts/seed_products.py catalog.csv.gz
+"""
+
+import argparse
+import csv
+import gzip
+import io
+import sys
+import time
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Tuple
+
+import orjson
+from sqlalchemy import Column, MetaData, Table, func, inspect, select, text, tuple_
+from sqlalchemy.dialects import postgresql
+
+from app.cache import product_cache
+from app.changes import next_change_seq
+from app.database import engine
+from app.dimensions import DIMENSION_COLUMNS, parse_dimensions, validate_dimensions
+from app.models.product import Product
+
+# Columns a load writes, in staging and COPY order
+COLUMNS = ("sku", "name", "description", "price", "weight", "dimensions", *DIMENSION_COLUMNS, "is_active")
+
+MAX_REPORTED_ERRORS = 20
+
+# Sample products, loaded when no files are given
 PRODUCTS = [
     {
         "sku": "E-PHONE-001",
@@ -125,51 +142,182 @@ PRODUCTS = [
     }
 ]
 
-def create_tables():
-    """Create tables if they don't exist."""
-    try:
-        # Check if products table exists
-        insp = engine.dialect.has_table(engine.connect(), "products")
-        if not insp:
-            print("Creating products table...")
-            # Create all tables defined in Base
-            Base.metadata.create_all(bind=engine)
-            print("Tables created successfully.")
+
+def _optional_float(value: Any) -> Optional[float]:
+    return None if value is None or value == "" else float(value)
+
+
+def _bool(value: Any) -> bool:
+    if isinstance(value, bool):
+        return value
+    if value is None or value == "":
+        return True
+    text_value = str(value).strip().lower()
+    if text_value in ("true", "t", "1", "yes", "y"):
+        return True
+    if text_value in ("false", "f", "0", "no", "n"):
+        return False
+    raise ValueError(f"is_active must be a boolean, not {value!r}")
+
+
+def product_row(raw: Dict[str, Any]) -> tuple:
+    """Validate one input record like a product create, as a tuple in COLUMNS order."""
+    sku, name = raw.get("sku"), raw.get("name")
+    if not isinstance(sku, str) or not sku.strip() or not isinstance(name, str) or not name:
+        raise ValueError("sku and name are required")
+    price = float(raw.get("price"))
+    if not price > 0:
+        raise ValueError("price must be greater than 0")
+    dimensions = raw.get("dimensions") or None
+    if dimensions is None and all(raw.get(key) not in (None, "") for key in DIMENSION_COLUMNS[:3]):
+        dimensions = orjson.dumps({key: float(raw[key]) for key in DIMENSION_COLUMNS[:3]}).decode()
+    validate_dimensions(dimensions)
+    numbers = parse_dimensions(dimensions)
+    return (
+        sku.strip(), name, raw.get("description") or None, price, _optional_float(raw.get("weight")),
+        dimensions, *(numbers[key] for key in DIMENSION_COLUMNS), _bool(raw.get("is_active")),
+    )
+
+
+def read_records(path: str) -> Iterator[Tuple[int, Any]]:
+    """(line number, record) of a CSV or NDJSON file; undecodable lines come as exceptions."""
+    opener = gzip.open if path.endswith(".gz") else open
+    stem = path[:-3] if path.endswith(".gz") else path
+    with opener(path, "rt", encoding="utf-8", newline="") as handle:
+        if stem.endswith(".csv"):
+            reader = csv.DictReader(handle)
+            for record in reader:
+                yield reader.line_num, record
         else:
-            print("Products table already exists.")
-    except Exception as e:
-        print(f"Error creating tables: {e}")
-
-def seed_products():
-    """Seed the products table with sample data."""
-    db = SessionLocal()
-    try:
-        # Create products
-        print("Creating products...")
-        for product_data in PRODUCTS:
-            # Check if product already exists
-            if not db.query(Product).filter(Product.sku == product_data["sku"]).first():
-                now = datetime.datetime.now()
-                product = Product(
-                    **product_data,
-                    created_at=now,
-                    updated_at=now
-                )
-                db.add(product)
-                print(f"Added product: {product_data['name']}")
-            else:
-                print(f"Product already exists: {product_data['name']}")
-        
-        db.commit()
-        print("Products seeded successfully!")
-    except Exception as e:
-        db.rollback()
-        print(f"Error seeding products: {e}")
-    finally:
-        db.close()
+            for number, line in enumerate(handle, start=1):
+                if not line.strip():
+                    continue
+                try:
+                    yield number, orjson.loads(line)
+                except orjson.JSONDecodeError as exc:
+                    yield number, exc
+
+
+def batches(records: Iterable[Tuple[str, int, Any]], size: int, stats: Dict[str, int]) -> Iterator[List[tuple]]:
+    """Valid rows in batches with unique SKUs, later rows of a batch winning."""
+    batch: Dict[str, tuple] = {}
+    for source, number, record in records:
+        stats["read"] += 1
+        try:
+            if isinstance(record, Exception):
+                raise ValueError(f"Invalid JSON: {record}")
+            if not isinstance(record, dict):
+                raise ValueError("Expected an object")
+            row = product_row(record)
+        except (TypeError, ValueError) as exc:
+            stats["invalid"] += 1
+            if stats["invalid"] <= MAX_REPORTED_ERRORS:
+                print(f"{source}:{number}: {exc}", file=sys.stderr)
+            continue
+        batch[row[0]] = row
+        if len(batch) >= size:
+            yield list(batch.values())
+            batch = {}
+    if batch:
+        yield list(batch.values())
+
+
+def merge_statement(source):
+    """
+    INSERT ... ON CONFLICT (sku) DO UPDATE from `source`, skipping rows that
+    wouldn't change. Returns the ids of the rows it created or changed.
+    """
+    table = Product.__table__
+    stmt = postgresql.insert(table).from_select(
+        [*COLUMNS, "change_seq"],
+        select(*(source.c[name] for name in COLUMNS), next_change_seq()),
+    )
+    updated = [name for name in COLUMNS if name != "sku"]
+    set_ = {name: stmt.excluded[name] for name in updated}
+    set_["updated_at"] = func.now()
+    set_["change_seq"] = next_change_seq()  # onupdate doesn't apply to ON CONFLICT
+    return stmt.on_conflict_do_update(
+        index_elements=[table.c.sku],
+        set_=set_,
+        where=tuple_(*(table.c[name] for name in updated)).is_distinct_from(
+            tuple_(*(stmt.excluded[name] for name in updated))
+        ),
+    ).returning(table.c.id)
+
+
+class PostgresLoader:
+    """COPY each batch into a temporary staging table, then merge it with one statement."""
+
+    def __init__(self, connection):
+        self.connection = connection
+        self.staging = Table(
+            "product_staging", MetaData(),
+            *(Column(name, Product.__table__.c[name].type) for name in COLUMNS),
+            prefixes=["TEMPORARY"],
+            postgresql_on_commit="DELETE ROWS",
+        )
+        self.staging.create(connection)
+        # A crash can lose the last few batches, never corrupt anything; rerunning the load redoes them
+        connection.execute(text("SET synchronous_commit TO off"))
+        connection.commit()
+        self.copy_sql = f"COPY product_staging ({', '.join(COLUMNS)}) FROM STDIN WITH (FORMAT csv)"
+        self.merge = merge_statement(self.staging)
+
+    def load(self, rows: List[tuple]) -> List[int]:
+        buffer = io.StringIO()
+        # None is written as an empty unquoted field, which COPY reads as NULL
+        csv.writer(buffer).writerows(rows)
+        buffer.seek(0)
+        cursor = self.connection.connection.dbapi_connection.cursor()
+        try:
+            cursor.copy_expert(self.copy_sql, buffer)
+        finally:
+            cursor.close()
+        written = self.connection.execute(self.merge).scalars().all()
+        self.connection.commit()  # Also empties the staging table
+        return written
+
+    def finish(self):
+        self.connection.execute(text("ANALYZE products"))
+        self.connection.commit()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("files", nargs="*", help="CSV (.csv) or NDJSON files, optionally .gz")
+    parser.add_argument("--batch-size", type=int, default=100_000, help="Rows per COPY, merge and commit")
+    args = parser.parse_args()
+
+    if not inspect(engine).has_table(Product.__tablename__):
+        parser.exit(1, "The products table doesn't exist; run `alembic upgrade head` first\n")
+    if args.files:
+        records = ((path, number, record) for path in args.files for number, record in read_records(path))
+    else:
+        records = (("samples", number, record) for number, record in enumerate(PRODUCTS, start=1))
+
+    stats = {"read": 0, "invalid": 0, "written": 0}
+    start = time.perf_counter()
+    with engine.connect() as connection:
+        loader = PostgresLoader(connection)
+        for rows in batches(records, args.batch_size, stats):
+            written = loader.load(rows)
+            product_cache.invalidate_products(written)
+            stats["written"] += len(written)
+            elapsed = time.perf_counter() - start
+            print(
+                f"{stats['read']:>12,} read {stats['written']:>12,} written {stats['invalid']:>8,} invalid "
+                f"{stats['read'] / elapsed:>10,.0f} rows/sec",
+                flush=True,
+            )
+        loader.finish()
+    elapsed = time.perf_counter() - start
+
+    print(
+        f"Loaded {stats['read']:,} rows in {elapsed:.1f}s ({stats['read'] / max(elapsed, 1e-9):,.0f} rows/sec): "
+        f"{stats['written']:,} created or changed, {stats['invalid']:,} invalid, "
+        f"{stats['read'] - stats['invalid'] - stats['written']:,} unchanged or repeated"
+    )
+
 
 if __name__ == "__main__":
-    print("Starting product seed process...")
-    create_tables()
-    seed_products()
-    print("Process completed.")
\ No newline at end of file
+    main()
@@ -11,7 +11,9 @@ from sqlalchemy.orm import sessionmaker, Session
 from sqlalchemy_utils import database_exists, create_database
 
 from app.main import app
+from app.cache import product_cache
 from app.database import get_db, Base
+from app.models.inventory import Warehouse
 from app.models.product import Product
 
 # Database connection parameters
@@ -127,4 +129,61 @@ def test_product(db: Session) -> Product:
         db.commit()
         db.refresh(product)
     
-    return product
\ No newline at end of file
+    return product
+
+@pytest.fixture(scope="function")
+def test_warehouse(db: Session) -> Warehouse:
+    """Create a test warehouse."""
+    warehouse = Warehouse(code="WH-TEST", name="Test Warehouse")
+    db.add(warehouse)
+    db.commit()
+    db.refresh(warehouse)
+    return warehouse
+
+
+class FakeRedis:
+    """Just enough of the redis-py client for the product cache."""
+
+    def __init__(self):
+        self.store = {}
+        self.published = []
+
+    def get(self, name):
+        return self.store.get(name)
+
+    def set(self, name, value, ex=None):
+        self.store[name] = value.encode() if isinstance(value, str) else value
+
+    def delete(self, *names):
+        for name in names:
+            self.store.pop(name, None)
+
+    def incr(self, name):
+        self.store[name] = str(int(self.store.get(name, 0)) + 1).encode()
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+
+    def pipeline(self, transaction=True):
+        return self
+
+    def execute(self):
+        pass
+
+
+@pytest.fixture(autouse=True)
+def disable_product_cache(monkeypatch):
+    """Keep tests independent of whatever Redis happens to be reachable."""
+    monkeypatch.setattr(product_cache, "enabled", False)
+
+
+@pytest.fixture(scope="function")
+def cache(monkeypatch) -> Generator[FakeRedis, None, None]:
+    """Enable the product cache against an in-memory Redis stand-in."""
+    fake = FakeRedis()
+    monkeypatch.setattr(product_cache, "enabled", True)
+    monkeypatch.setattr(product_cache, "_client", fake)
+    monkeypatch.setattr(product_cache, "_unavailable_until", 0.0)
+    product_cache.local.clear()
+    yield fake
+    product_cache.local.clear()
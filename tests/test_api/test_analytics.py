@@ -0,0 +1,110 @@
+# tests/test_api/test_analytics.py
+from datetime import date, datetime, time, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.inventory import StockMovement, Warehouse
+from app.models.product import Product
+from app.services.forecasting import refresh_forecasts
+from app.services.replenishment import refresh_replenishment
+
+
+def ship(db: Session, product: Product, warehouse: Warehouse, days_ago: int, quantity: int):
+    db.execute(insert(StockMovement), [{
+        "product_id": product.id, "warehouse_id": warehouse.id, "quantity": -quantity,
+        "movement_type": "shipment",
+        "occurred_at": datetime.combine(date.today() - timedelta(days=days_ago), time(12)),
+    }])
+    db.flush()
+
+
+def test_forecast_refresh_and_read(
+    client: TestClient, db: Session, test_product: Product, test_warehouse: Warehouse
+):
+    """Test that refreshes store forecasts and reads report staleness."""
+    for days_ago in range(1, 31):
+        ship(db, test_product, test_warehouse, days_ago, 3)
+
+    assert client.get("/api/v1/analytics/forecasts/runs/latest").status_code == 404
+    refresh_forecasts(db)
+    response = client.get("/api/v1/analytics/forecasts/runs/latest")
+    assert response.status_code == 200, response.text
+    run = response.json()
+    assert run["full"] is True
+    assert run["products"] == 1
+    assert run["history_end"] == date.today().isoformat()
+
+    response = client.get(f"/api/v1/analytics/forecasts/{test_product.id}")
+    assert response.status_code == 200, response.text
+    forecast = response.json()
+    assert forecast["method"] == "ses"
+    assert forecast["start_date"] == date.today().isoformat()
+    assert forecast["horizon_days"] == len(forecast["daily"]) == 90
+    assert forecast["daily"][0] == 3.0
+    assert forecast["total"] == 270.0
+    assert forecast["stale"] is False
+
+    # New demand marks the forecast stale until the next refresh picks it up
+    ship(db, test_product, test_warehouse, 1, 30)
+    assert client.get(f"/api/v1/analytics/forecasts/{test_product.id}").json()["stale"] is True
+    run = refresh_forecasts(db)
+    assert (run.full, run.products) == (False, 1)
+    forecast = client.get(f"/api/v1/analytics/forecasts/{test_product.id}").json()
+    assert forecast["stale"] is False
+    assert forecast["daily"][0] > 3.0
+
+    # Nothing changed since, so nothing is refit
+    run = refresh_forecasts(db)
+    assert (run.full, run.products) == (False, 0)
+
+    listed = client.get("/api/v1/analytics/forecasts", params={"product_id": [test_product.id, 999999]})
+    assert [item["product_id"] for item in listed.json()] == [test_product.id]
+
+
+def test_forecast_not_found(client: TestClient, test_product: Product):
+    """Test 404s for unknown products and products without a forecast."""
+    response = client.get(f"/api/v1/analytics/forecasts/{test_product.id}")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "No forecast for this product"
+    response = client.get("/api/v1/analytics/forecasts/999999")
+    assert response.status_code == 404
+    assert response.json()["detail"] == "Product not found"
+
+
+def test_replenishment_refresh_and_list(
+    client: TestClient, db: Session, test_product: Product, test_warehouse: Warehouse
+):
+    """Test that a refresh plans stocked products and lists those to reorder."""
+    idle = Product(sku="REPLENISH-IDLE", name="Idle", price=5.0)
+    db.add(idle)
+    db.commit()
+    client.post("/api/v1/inventory/movements", json=[
+        {"product_id": product_id, "warehouse_id": test_warehouse.id, "quantity": 40, "movement_type": "receipt"}
+        for product_id in (test_product.id, idle.id)
+    ])
+    for days_ago in range(1, 31):
+        ship(db, test_product, test_warehouse, days_ago, 3)
+    refresh_forecasts(db)
+
+    assert client.get("/api/v1/analytics/replenishment/runs/latest").status_code == 404
+    refresh_replenishment(db)
+    response = client.get("/api/v1/analytics/replenishment/runs/latest")
+    assert response.status_code == 200, response.text
+    assert (response.json()["plans"], response.json()["reorders"]) == (2, 1)
+
+    response = client.get("/api/v1/analytics/replenishment", params={"reorder_only": True})
+    assert response.status_code == 200, response.text
+    [plan] = response.json()["items"]
+    assert (plan["product_id"], plan["warehouse_id"]) == (test_product.id, test_warehouse.id)
+    assert plan["demand_rate"] == pytest.approx(3.0)
+    assert plan["available"] == 40
+    assert plan["reorder_point"] == pytest.approx(42.0)  # 3/day over 14 days, no variability
+    assert plan["order_quantity"] > 0
+
+    first = client.get("/api/v1/analytics/replenishment", params={"limit": 1}).json()
+    second = client.get("/api/v1/analytics/replenishment", params={"limit": 1, "cursor": first["next_cursor"]}).json()
+    assert [p["product_id"] for p in first["items"] + second["items"]] == sorted([test_product.id, idle.id])
+    assert second["next_cursor"] is None
@@ -0,0 +1,155 @@
+# tests/test_api/test_inventory.py
+import json
+
+from fastapi.testclient import TestClient
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+
+from app.models.inventory import InventoryTotal, StockMovement, Warehouse
+from app.models.product import Product
+
+def test_create_warehouse(client: TestClient):
+    """Test creating a warehouse, and rejecting a duplicate code."""
+    response = client.post("/api/v1/inventory/warehouses", json={"code": "WH-NEW", "name": "New DC"})
+    assert response.status_code == 201, response.text
+    assert response.json()["code"] == "WH-NEW"
+
+    duplicate = client.post("/api/v1/inventory/warehouses", json={"code": "WH-NEW", "name": "Again"})
+    assert duplicate.status_code == 400, duplicate.text
+    assert [warehouse["code"] for warehouse in client.get("/api/v1/inventory/warehouses").json()] == ["WH-NEW"]
+
+def test_record_movements(
+    client: TestClient, db: Session, test_product: Product, test_warehouse: Warehouse
+):
+    """Test that a movement batch updates per-warehouse and total stock."""
+    second = Warehouse(code="WH-TWO", name="Second Warehouse")
+    db.add(second)
+    db.commit()
+
+    response = client.post("/api/v1/inventory/movements", json=[
+        {"sku": test_product.sku, "warehouse_code": "WH-TEST", "quantity": 40, "movement_type": "receipt"},
+        {"product_id": test_product.id, "warehouse_id": second.id, "quantity": 15, "movement_type": "receipt"},
+        {"sku": test_product.sku, "warehouse_code": "WH-TEST", "quantity": -5, "movement_type": "shipment",
+         "reference": "SO-1"},
+    ])
+
+    assert response.status_code == 200, response.text
+    assert response.json() == {"accepted": 3, "failed": 0, "errors": []}
+    inventory = client.get(f"/api/v1/inventory/products/{test_product.id}").json()
+    assert inventory["total_inventory"] == 50
+    assert inventory["stock_status"] == "In Stock"
+    assert [(level["warehouse_code"], level["on_hand"]) for level in inventory["levels"]] == [
+        ("WH-TEST", 35), ("WH-TWO", 15)
+    ]
+    assert db.execute(select(func.count()).select_from(StockMovement)).scalar() == 3
+
+def test_record_movements_reports_bad_rows(
+    client: TestClient, db: Session, test_product: Product, test_warehouse: Warehouse
+):
+    """Test that invalid movements are reported while the rest are recorded."""
+    body = "\n".join([
+        json.dumps({"sku": test_product.sku, "warehouse_code": "WH-TEST", "quantity": 3, "movement_type": "receipt"}),
+        json.dumps({"sku": "NO-SUCH-SKU", "warehouse_code": "WH-TEST", "quantity": 1, "movement_type": "receipt"}),
+        json.dumps({"sku": test_product.sku, "warehouse_code": "WH-TEST", "quantity": 0, "movement_type": "receipt"}),
+        "{not json",
+        json.dumps({"sku": test_product.sku, "warehouse_code": "NOWHERE", "quantity": 1, "movement_type": "receipt"}),
+    ])
+
+    response = client.post(
+        "/api/v1/inventory/movements", content=body, headers={"Content-Type": "application/x-ndjson"}
+    )
+
+    content = response.json()
+    assert content["accepted"] == 1
+    assert [error["index"] for error in content["errors"]] == [1, 2, 3, 4]
+    assert content["errors"][0]["error"] == "Product not found"
+    assert content["errors"][3]["error"] == "Warehouse not found"
+    assert db.get(InventoryTotal, test_product.id).on_hand == 3
+
+def test_product_detail_stock(
+    client: TestClient, test_product: Product, test_warehouse: Warehouse, cache
+):
+    """Test that product details report stock from the summary and refresh after movements."""
+    detail = client.get(f"/api/v1/products/{test_product.id}").json()
+    assert (detail["total_inventory"], detail["stock_status"]) == (0, "Unknown")
+
+    movement = {"sku": test_product.sku, "warehouse_code": "WH-TEST", "movement_type": "receipt"}
+    client.post("/api/v1/inventory/movements", json=[dict(movement, quantity=4)])
+    detail = client.get(f"/api/v1/products/{test_product.id}").json()
+    assert (detail["total_inventory"], detail["stock_status"]) == (4, "Low Stock")
+
+    client.post("/api/v1/inventory/movements", json=[dict(movement, quantity=-4, movement_type="shipment")])
+    detail = client.get(f"/api/v1/products/{test_product.id}").json()
+    assert (detail["total_inventory"], detail["stock_status"]) == (0, "Out of Stock")
+
+def stock(client: TestClient, sku: str, warehouse_code: str, quantity: int):
+    response = client.post("/api/v1/inventory/movements", json=[
+        {"sku": sku, "warehouse_code": warehouse_code, "quantity": quantity, "movement_type": "receipt"}
+    ])
+    assert response.json()["accepted"] == 1, response.text
+
+def test_reserve_stock(
+    client: TestClient, db: Session, test_product: Product, test_warehouse: Warehouse
+):
+    """Test that reservations are held in full or not at all, in request order."""
+    other = Product(sku="RESERVE-OTHER", name="Other", price=1.0)
+    db.add_all([other, Warehouse(code="WH-TWO", name="Second Warehouse")])
+    db.commit()
+    stock(client, test_product.sku, "WH-TEST", 6)
+    stock(client, test_product.sku, "WH-TWO", 4)
+    stock(client, "RESERVE-OTHER", "WH-TEST", 1)
+
+    response = client.post("/api/v1/inventory/reservations", json=[
+        {"reference": "SO-1", "lines": [{"sku": test_product.sku, "quantity": 8}]},
+        {"reference": "SO-2", "lines": [
+            {"sku": "RESERVE-OTHER", "quantity": 1},
+            {"sku": test_product.sku, "quantity": 3},
+        ]},
+        {"reference": "SO-3", "lines": [{"sku": test_product.sku, "quantity": 2, "warehouse_code": "WH-TWO"}]},
+    ])
+
+    assert response.status_code == 200, response.text
+    content = response.json()
+    assert (content["held"], content["rejected"]) == (2, 1)
+    first, second, third = content["results"]
+    # Split across warehouses, fullest first
+    assert sorted((a["warehouse_id"], a["quantity"]) for a in first["allocations"]) == sorted(
+        [(test_warehouse.id, 6), (third["allocations"][0]["warehouse_id"], 2)]
+    )
+    # Only 2 left, so the whole reservation is rejected and RESERVE-OTHER stays available
+    assert second["status"] == "rejected"
+    assert second["shortages"] == [{"line": 1, "product_id": test_product.id, "requested": 3, "available": 2}]
+    assert third["status"] == "held"
+
+    inventory = client.get(f"/api/v1/inventory/products/{test_product.id}").json()
+    assert (inventory["total_inventory"], inventory["available_inventory"]) == (10, 0)
+    assert client.get(f"/api/v1/products/{test_product.id}").json()["stock_status"] == "Out of Stock"
+    other_inventory = client.get(f"/api/v1/inventory/products/{other.id}").json()
+    assert other_inventory["available_inventory"] == 1
+
+def test_release_reservation(
+    client: TestClient, test_product: Product, test_warehouse: Warehouse
+):
+    """Test that releasing a reservation returns its stock, once."""
+    stock(client, test_product.sku, "WH-TEST", 5)
+    held = client.post("/api/v1/inventory/reservations", json=[
+        {"reference": "SO-9", "lines": [{"product_id": test_product.id, "quantity": 5}]}
+    ]).json()["results"][0]
+    assert client.get(f"/api/v1/inventory/reservations/{held['id']}").json()["status"] == "held"
+
+    released = client.delete(f"/api/v1/inventory/reservations/{held['id']}")
+    assert released.status_code == 200, released.text
+    assert released.json()["status"] == "released"
+    assert client.get(f"/api/v1/inventory/products/{test_product.id}").json()["available_inventory"] == 5
+
+    again = client.delete(f"/api/v1/inventory/reservations/{held['id']}")
+    assert again.status_code == 409, again.text
+
+def test_reserve_unknown_product(client: TestClient):
+    """Test that reservations naming unknown products are rejected."""
+    response = client.post("/api/v1/inventory/reservations", json=[
+        {"lines": [{"sku": "NO-SUCH-SKU", "quantity": 1}]}
+    ])
+    result = response.json()["results"][0]
+    assert result["status"] == "rejected"
+    assert result["error"] == "Line 0: Product not found"
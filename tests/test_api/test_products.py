@@ -1,10 +1,16 @@
 # tests/test_api/test_products.py
+import csv
+import io
 import json
+import time
 import pytest
 from fastapi.testclient import TestClient
 from sqlalchemy.orm import Session
 
+from app.cache import product_cache
+from app.config import settings
 from app.models.product import Product
+from app.pagination import encode_cursor
 
 def test_create_product(
     client: TestClient, db: Session
@@ -127,3 +133,438 @@ def test_delete_product(
     # Check in database - should be marked inactive (soft delete)
     db.refresh(test_product)
     assert test_product.is_active is False
+
+def test_read_products_cursor_pagination(client: TestClient, db: Session):
+    """Test walking the catalog with keyset cursors."""
+    for i in range(5):
+        db.add(Product(sku=f"CURSOR-{i}", name=f"Cursor Product {i}", price=10.0 + i))
+    db.commit()
+
+    seen = []
+    cursor = ""
+    while cursor is not None:
+        response = client.get(
+            "/api/v1/products/",
+            params={"cursor": cursor, "limit": 2, "name": "Cursor Product"}
+        )
+        assert response.status_code == 200, response.text
+        content = response.json()
+        assert len(content["items"]) <= 2
+        seen.extend(product["sku"] for product in content["items"])
+        cursor = content["next_cursor"]
+
+    assert seen == [f"CURSOR-{i}" for i in range(5)]
+
+def test_read_products_cursor_by_name(client: TestClient, db: Session):
+    """Test keyset pagination ordered by (name, id)."""
+    for sku, name in [("NAME-C", "Keyset C"), ("NAME-A", "Keyset A"), ("NAME-B", "Keyset B")]:
+        db.add(Product(sku=sku, name=name, price=5.0))
+    db.commit()
+
+    first = client.get(
+        "/api/v1/products/",
+        params={"cursor": "", "limit": 2, "name": "Keyset", "order_by": "name"}
+    ).json()
+    assert [product["name"] for product in first["items"]] == ["Keyset A", "Keyset B"]
+
+    second = client.get(
+        "/api/v1/products/",
+        params={"cursor": first["next_cursor"], "limit": 2, "name": "Keyset", "order_by": "name"}
+    ).json()
+    assert [product["name"] for product in second["items"]] == ["Keyset C"]
+    assert second["next_cursor"] is None
+
+def test_read_products_invalid_cursor(client: TestClient):
+    """Test that cursors we did not issue are rejected."""
+    response = client.get("/api/v1/products/", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400, response.text
+
+    # A cursor issued for one ordering can't be replayed against another
+    id_cursor = encode_cursor("id", [1])
+    response = client.get(
+        "/api/v1/products/", params={"cursor": id_cursor, "order_by": "name"}
+    )
+    assert response.status_code == 400, response.text
+
+def test_bulk_upsert_products(
+    client: TestClient, db: Session, test_product: Product, monkeypatch
+):
+    """Test creating and updating products in one bulk request."""
+    invalidated = []
+    monkeypatch.setattr(product_cache, "invalidate_products", invalidated.extend)
+    data = [
+        {"sku": "BULK-001", "name": "Bulk One", "price": 10.0},
+        {"sku": test_product.sku, "name": "Renamed By Bulk", "price": 42.0},
+        {"sku": "BULK-002", "name": "Invalid Price", "price": 0},
+    ]
+    response = client.post("/api/v1/products/bulk", json=data)
+
+    assert response.status_code == 200, response.text
+    content = response.json()
+    assert (content["created"], content["updated"], content["failed"]) == (1, 1, 1)
+    assert [row["status"] for row in content["results"]] == ["created", "updated", "error"]
+    assert content["results"][1]["id"] == test_product.id
+    # Created rows are evicted too, in case a cache entry raced the upsert
+    assert sorted(invalidated) == sorted(row["id"] for row in content["results"][:2])
+
+    db.refresh(test_product)
+    assert test_product.name == "Renamed By Bulk"
+    assert db.query(Product).filter(Product.sku == "BULK-002").first() is None
+
+def test_bulk_upsert_products_ndjson(client: TestClient, db: Session):
+    """Test NDJSON bulk bodies, including malformed lines and repeated SKUs."""
+    lines = [
+        json.dumps({"sku": "NDJSON-001", "name": "First", "price": 1.0}),
+        "{not json",
+        json.dumps({"sku": "NDJSON-001", "name": "Second", "price": 2.0}),
+    ]
+    response = client.post(
+        "/api/v1/products/bulk",
+        content="\n".join(lines),
+        headers={"Content-Type": "application/x-ndjson"},
+    )
+
+    assert response.status_code == 200, response.text
+    content = response.json()
+    assert [row["status"] for row in content["results"]] == ["error", "error", "created"]
+    saved_product = db.query(Product).filter(Product.sku == "NDJSON-001").one()
+    assert saved_product.name == "Second"
+
+def test_export_products_ndjson(client: TestClient, test_product: Product):
+    """Test streaming the catalog as NDJSON."""
+    response = client.get("/api/v1/products/export", params={"format": "ndjson"})
+
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("application/x-ndjson")
+    rows = [json.loads(line) for line in response.text.splitlines()]
+    exported = next(row for row in rows if row["id"] == test_product.id)
+    assert exported["sku"] == test_product.sku
+    assert exported["price"] == test_product.price
+
+def test_export_products_csv(client: TestClient, test_product: Product):
+    """Test streaming the catalog as CSV with a header row."""
+    response = client.get("/api/v1/products/export", params={"format": "csv"})
+
+    assert response.status_code == 200, response.text
+    assert response.headers["content-type"].startswith("text/csv")
+    rows = list(csv.DictReader(io.StringIO(response.text)))
+    exported = next(row for row in rows if row["sku"] == test_product.sku)
+    assert exported["name"] == test_product.name
+    assert int(exported["id"]) == test_product.id
+
+def test_read_product_cached(
+    client: TestClient, db: Session, test_product: Product, cache, monkeypatch
+):
+    """Test that product details are served from the cache until the product changes."""
+    first = client.get(f"/api/v1/products/{test_product.id}")
+    assert first.status_code == 200, first.text
+    original_name = first.json()["name"]
+
+    # Change the row behind the cache's back; the cached copy is still served
+    db.query(Product).filter(Product.id == test_product.id).update({"name": "Changed Directly"})
+    cached = client.get(f"/api/v1/products/{test_product.id}")
+    assert cached.json()["name"] == original_name
+
+    # Writes through the API invalidate the entry
+    client.put(f"/api/v1/products/{test_product.id}", json={"name": "Changed Via API"})
+    fresh = client.get(f"/api/v1/products/{test_product.id}")
+    assert fresh.json()["name"] == "Changed Via API"
+
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "secret")
+    stats = client.get("/api/v1/internal/cache", headers={"X-Internal-Token": "secret"}).json()
+    assert stats["local"]["hits"] >= 1
+    assert stats["product_misses"] >= 2
+
+def test_read_products_cache_invalidated_on_create(
+    client: TestClient, test_product: Product, cache
+):
+    """Test that creating a product retires cached list pages."""
+    before = client.get("/api/v1/products/", params={"limit": 1000}).json()
+    client.post("/api/v1/products/", json={"sku": "CACHE-NEW", "name": "Cache New", "price": 3.0})
+    after = client.get("/api/v1/products/", params={"limit": 1000}).json()
+
+    assert "CACHE-NEW" not in [product["sku"] for product in before]
+    assert "CACHE-NEW" in [product["sku"] for product in after]
+
+def test_update_product_publishes_invalidation(
+    client: TestClient, test_product: Product, cache
+):
+    """Test that writes evict the local tier and notify other workers."""
+    client.get(f"/api/v1/products/{test_product.id}")
+    assert product_cache.local.get(test_product.id) is not None
+
+    client.put(f"/api/v1/products/{test_product.id}", json={"price": 11.0})
+
+    assert product_cache.local.get(test_product.id) is None
+    assert cache.published[-1] == ("products:invalidate", json.dumps([test_product.id]))
+
+def test_search_products(client: TestClient, db: Session):
+    """Test ranked name search, with prefix matches ranked first."""
+    for sku, name in [("SEARCH-1", "Deluxe Blender"), ("SEARCH-2", "Blender Jar"), ("SEARCH-3", "Toaster")]:
+        db.add(Product(sku=sku, name=name, price=20.0))
+    db.commit()
+
+    response = client.get("/api/v1/products/", params={"search": "blender"})
+
+    assert response.status_code == 200, response.text
+    assert [product["sku"] for product in response.json()] == ["SEARCH-2", "SEARCH-1"]
+
+def test_search_products_escapes_wildcards(client: TestClient, db: Session):
+    """Test that LIKE wildcards in search terms match literally."""
+    db.add(Product(sku="WILD-1", name="100% Cotton", price=5.0))
+    db.add(Product(sku="WILD-2", name="1000 Threads", price=5.0))
+    db.commit()
+
+    response = client.get("/api/v1/products/", params={"search": "100%"})
+
+    assert [product["sku"] for product in response.json()] == ["WILD-1"]
+
+def test_search_products_rejects_cursor(client: TestClient):
+    """Test that ranked search can't be combined with keyset pagination."""
+    response = client.get("/api/v1/products/", params={"search": "x", "cursor": ""})
+    assert response.status_code == 400, response.text
+
+def test_read_products_include_total(client: TestClient, db: Session):
+    """Test that include_total wraps offset and cursor pages with the match count."""
+    for i in range(3):
+        db.add(Product(sku=f"TOTAL-{i}", name=f"Total Product {i}", price=4.0))
+    db.commit()
+
+    offset_page = client.get(
+        "/api/v1/products/", params={"name": "Total Product", "limit": 2, "include_total": True}
+    ).json()
+    assert len(offset_page["items"]) == 2
+    assert offset_page["total"] == 3
+    assert offset_page["total_is_estimate"] is False
+    assert offset_page["next_cursor"] is None
+
+    cursor_page = client.get(
+        "/api/v1/products/",
+        params={"name": "Total Product", "limit": 2, "cursor": "", "include_total": True}
+    ).json()
+    assert cursor_page["total"] == 3
+    assert cursor_page["next_cursor"] is not None
+
+def test_read_products_total_cached(
+    client: TestClient, db: Session, test_product: Product, cache
+):
+    """Test that listing totals are served from the count cache."""
+    params = {"name": test_product.name, "include_total": True}
+    assert client.get("/api/v1/products/", params=params).json()["total"] == 1
+
+    db.add(Product(sku="TOTAL-LATE", name=test_product.name, price=1.0))
+    db.commit()
+
+    # Name-filtered listings skip the page cache, but the total comes from the count cache
+    page = client.get("/api/v1/products/", params=params).json()
+    assert len(page["items"]) == 2
+    assert page["total"] == 1
+    assert product_cache.stats()["count_hits"] >= 1
+
+def test_lookup_products(client: TestClient, db: Session):
+    """Test resolving ids and SKUs in one request, in request order."""
+    products = [Product(sku=f"LOOKUP-{i}", name=f"Lookup {i}", price=2.0) for i in range(3)]
+    db.add_all(products)
+    db.commit()
+    first, second, third = products
+
+    response = client.post("/api/v1/products/lookup", json={
+        "ids": [third.id, 999999, first.id],
+        "skus": ["LOOKUP-1", "NOPE", "LOOKUP-0"],
+    })
+
+    assert response.status_code == 200, response.text
+    content = response.json()
+    assert list(content["by_id"]) == [str(third.id), str(first.id)]
+    assert list(content["by_sku"]) == ["LOOKUP-1", "LOOKUP-0"]
+    assert content["by_sku"]["LOOKUP-1"]["id"] == second.id
+    assert content["missing_ids"] == [999999]
+    assert content["missing_skus"] == ["NOPE"]
+
+def test_lookup_products_cached_sku(client: TestClient, db: Session, test_product: Product, cache, monkeypatch):
+    """Test that SKU lookups are served from cached product details until they expire."""
+    original_name = client.get(f"/api/v1/products/{test_product.id}").json()["name"]
+    # Change the row behind the cache's back; the cached copy is still served
+    db.query(Product).filter(Product.id == test_product.id).update({"name": "Uncached"})
+    db.commit()
+    hits = product_cache.local.stats()["hits"]
+
+    content = client.post("/api/v1/products/lookup", json={"skus": [test_product.sku, "NOPE"]}).json()
+    assert content["by_sku"][test_product.sku]["name"] == original_name
+    assert "stock_status" not in content["by_sku"][test_product.sku]
+    assert content["missing_skus"] == ["NOPE"]
+    assert product_cache.local.stats()["hits"] == hits + 1
+
+    # The local TTL bounds how long the stale copy is served
+    expired = time.monotonic() + product_cache.local.ttl + 1
+    monkeypatch.setattr(time, "monotonic", lambda: expired)
+    content = client.post("/api/v1/products/lookup", json={"skus": [test_product.sku]}).json()
+    assert content["by_sku"][test_product.sku]["name"] == "Uncached"
+
+def test_lookup_products_too_many_keys(client: TestClient, monkeypatch):
+    """Test that oversized lookups are rejected."""
+    monkeypatch.setattr(settings, "LOOKUP_MAX_KEYS", 2)
+    response = client.post("/api/v1/products/lookup", json={"ids": [1, 2], "skus": ["A"]})
+    assert response.status_code == 413, response.text
+
+def test_read_products_fields(client: TestClient, db: Session):
+    """Test projecting listings to a subset of fields, with and without a cursor."""
+    for i in range(3):
+        db.add(Product(sku=f"FIELDS-{i}", name=f"Fields {i}", description="Long text", price=3.0))
+    db.commit()
+
+    listing = client.get("/api/v1/products/", params={"name": "Fields", "fields": "sku,price"})
+    assert listing.status_code == 200, listing.text
+    assert listing.json() == [{"sku": f"FIELDS-{i}", "price": 3.0} for i in range(3)]
+
+    page = client.get(
+        "/api/v1/products/",
+        params={"name": "Fields", "fields": "sku", "cursor": "", "order_by": "name", "limit": 2}
+    ).json()
+    assert page["items"] == [{"sku": "FIELDS-0"}, {"sku": "FIELDS-1"}]
+    rest = client.get(
+        "/api/v1/products/",
+        params={"name": "Fields", "fields": "sku", "cursor": page["next_cursor"], "order_by": "name"}
+    ).json()
+    assert rest["items"] == [{"sku": "FIELDS-2"}]
+
+def test_read_products_unknown_field(client: TestClient):
+    """Test that projecting to an unknown field is rejected."""
+    response = client.get("/api/v1/products/", params={"fields": "sku,secret"})
+    assert response.status_code == 400, response.text
+
+def test_read_products_size_and_weight_ranges(client: TestClient, db: Session):
+    """Test volume and weight range filters, which skip the page cache and count exactly."""
+    for i, (side, weight) in enumerate([(1, 0.5), (2, 1.0), (3, 2.0)]):
+        db.add(Product(
+            sku=f"RANGE-{i}", name=f"Range {i}", price=1.0, weight=weight,
+            dimensions=f'{{"length": {side}, "width": {side}, "height": {side}}}',
+        ))
+    db.add(Product(sku="RANGE-NODIMS", name="Range none", price=1.0))
+    db.commit()
+
+    listing = client.get("/api/v1/products/", params={"min_volume": 8, "fields": "sku,volume"})
+    assert listing.status_code == 200, listing.text
+    assert listing.json() == [{"sku": "RANGE-1", "volume": 8.0}, {"sku": "RANGE-2", "volume": 27.0}]
+
+    page = client.get(
+        "/api/v1/products/", params={"max_volume": 10, "min_weight": 0.75, "include_total": True}
+    ).json()
+    assert [item["sku"] for item in page["items"]] == ["RANGE-1"]
+    assert (page["total"], page["total_is_estimate"]) == (1, False)
+
+    response = client.get("/api/v1/products/", params={"min_weight": 2, "max_weight": 1})
+    assert response.status_code == 400, response.text
+
+def test_product_dimensions_validated(client: TestClient, test_product: Product):
+    """Test that dimensions must be a JSON object of positive numbers, and are returned parsed."""
+    response = client.post("/api/v1/products/", json={
+        "sku": "DIMS-BAD", "name": "Bad", "price": 1.0, "dimensions": '{"length": 10, "width": "wide"}',
+    })
+    assert response.status_code == 422, response.text
+
+    response = client.put(f"/api/v1/products/{test_product.id}", json={"dimensions": '{"length": 4, "width": 3, "height": 2}'})
+    assert response.status_code == 200, response.text
+    content = response.json()
+    assert (content["length"], content["width"], content["height"], content["volume"]) == (4.0, 3.0, 2.0, 24.0)
+
+    response = client.put(f"/api/v1/products/{test_product.id}", json={"dimensions": "[1, 2, 3]"})
+    assert response.status_code == 422, response.text
+
+def test_read_product_conditional(client: TestClient, test_product: Product):
+    """Test revalidating product details with ETag and Last-Modified."""
+    response = client.get(f"/api/v1/products/{test_product.id}")
+    etag = response.headers["etag"]
+    last_modified = response.headers["last-modified"]
+
+    unchanged = client.get(f"/api/v1/products/{test_product.id}", headers={"If-None-Match": etag})
+    assert unchanged.status_code == 304
+    assert unchanged.content == b""
+    assert unchanged.headers["etag"] == etag
+
+    since = client.get(f"/api/v1/products/{test_product.id}", headers={"If-Modified-Since": last_modified})
+    assert since.status_code == 304
+
+    client.put(f"/api/v1/products/{test_product.id}", json={"name": "Revalidated"})
+    changed = client.get(f"/api/v1/products/{test_product.id}", headers={"If-None-Match": etag})
+    assert changed.status_code == 200
+    assert changed.headers["etag"] != etag
+
+def test_read_products_conditional(client: TestClient, test_product: Product, cache):
+    """Test that unchanged listing pages revalidate from the cache."""
+    etag = client.get("/api/v1/products/").headers["etag"]
+    response = client.get("/api/v1/products/", headers={"If-None-Match": f'W/{etag}'})
+    assert response.status_code == 304
+
+def test_update_product_if_match(client: TestClient, test_product: Product):
+    """Test optimistic concurrency on updates with If-Match."""
+    etag = client.get(f"/api/v1/products/{test_product.id}").headers["etag"]
+
+    first = client.put(
+        f"/api/v1/products/{test_product.id}", json={"price": 30.0}, headers={"If-Match": etag}
+    )
+    assert first.status_code == 200, first.text
+    assert first.headers["etag"] != etag
+    # The new row version, which the detail tag starts with
+    assert client.get(f"/api/v1/products/{test_product.id}").headers["etag"].startswith(first.headers["etag"][:-1] + ".")
+
+    # A second writer holding the old tag loses
+    stale = client.put(
+        f"/api/v1/products/{test_product.id}", json={"price": 40.0}, headers={"If-Match": etag}
+    )
+    assert stale.status_code == 412, stale.text
+    assert client.get(f"/api/v1/products/{test_product.id}").json()["price"] == 30.0
+
+def test_product_validators_follow_stock(client: TestClient, test_product: Product, test_warehouse):
+    """Test that stock movements change the detail ETag but don't fail If-Match updates."""
+    before = client.get(f"/api/v1/products/{test_product.id}")
+    client.post("/api/v1/inventory/movements", json=[
+        {"product_id": test_product.id, "warehouse_id": test_warehouse.id, "quantity": 5, "movement_type": "receipt"},
+    ])
+    after = client.get(f"/api/v1/products/{test_product.id}", headers={"If-None-Match": before.headers["etag"]})
+    assert after.status_code == 200
+    assert after.json()["total_inventory"] == before.json()["total_inventory"] + 5
+    assert after.headers["etag"] != before.headers["etag"]
+    assert after.json()["last_modified"] >= before.json()["last_modified"]
+
+    update = client.put(
+        f"/api/v1/products/{test_product.id}", json={"price": 30.0}, headers={"If-Match": before.headers["etag"]}
+    )
+    assert update.status_code == 200, update.text
+
+def test_product_changes(client: TestClient, test_product: Product):
+    """Test following the change feed across inserts, updates and soft deletes."""
+    feed = client.get("/api/v1/products/changes").json()
+    assert [product["sku"] for product in feed["items"]] == [test_product.sku]
+    assert feed["has_more"] is False
+    since = feed["next_since"]
+
+    idle = client.get("/api/v1/products/changes", params={"since": since}).json()
+    assert idle["items"] == []
+    assert idle["next_since"] == since
+
+    client.post("/api/v1/products/", json={"sku": "FEED-NEW", "name": "Feed New", "price": 2.0})
+    client.delete(f"/api/v1/products/{test_product.id}")
+
+    first = client.get("/api/v1/products/changes", params={"since": since, "limit": 1}).json()
+    assert [product["sku"] for product in first["items"]] == ["FEED-NEW"]
+    assert first["has_more"] is True
+    second = client.get("/api/v1/products/changes", params={"since": first["next_since"]}).json()
+    assert [(product["id"], product["is_active"]) for product in second["items"]] == [(test_product.id, False)]
+    assert second["has_more"] is False
+
+def test_product_changes_after_bulk_upsert(client: TestClient, test_product: Product):
+    """Test that bulk upserts stamp both inserted and updated rows."""
+    since = client.get("/api/v1/products/changes").json()["next_since"]
+    client.post("/api/v1/products/bulk", json=[
+        {"sku": test_product.sku, "name": "Bulk Renamed", "price": 9.0},
+        {"sku": "FEED-BULK", "name": "Feed Bulk", "price": 9.0},
+    ])
+
+    changes = client.get("/api/v1/products/changes", params={"since": since}).json()
+    assert sorted(product["sku"] for product in changes["items"]) == sorted([test_product.sku, "FEED-BULK"])
+
+def test_product_changes_invalid_token(client: TestClient):
+    """Test that tokens from other endpoints are rejected."""
+    response = client.get("/api/v1/products/changes", params={"since": encode_cursor("id", [1])})
+    assert response.status_code == 400, response.text
@@ -0,0 +1,82 @@
+# tests/test_api/test_products_async.py
+from typing import Generator
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine
+from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+from sqlalchemy.orm import Session
+from sqlalchemy.pool import NullPool
+
+from app.api.endpoints import products, products_async
+from app.database import Base, get_async_db, get_db
+
+pytest.importorskip("aiosqlite")
+
+
+@pytest.fixture(scope="function")
+def async_client(tmp_path) -> Generator[TestClient, None, None]:
+    """A client for an app serving the async product router from a scratch database."""
+    url = f"sqlite:///{tmp_path / 'async.db'}"
+    sync_engine = create_engine(url)
+    Base.metadata.create_all(bind=sync_engine)
+    async_engine = create_async_engine(url.replace("sqlite://", "sqlite+aiosqlite://"), poolclass=NullPool)
+    AsyncTestingSession = async_sessionmaker(async_engine, expire_on_commit=False)
+
+    async def override_get_async_db():
+        async with AsyncTestingSession() as session:
+            yield session
+
+    test_app = FastAPI()
+    test_app.include_router(products_async.router, prefix="/api/v1/products")
+    test_app.include_router(products.router, prefix="/api/v1/products")
+    test_app.dependency_overrides[get_async_db] = override_get_async_db
+    test_app.dependency_overrides[get_db] = lambda: Session(bind=sync_engine)
+
+    with TestClient(test_app) as client:
+        yield client
+    sync_engine.dispose()
+
+
+def test_async_product_lifecycle(async_client: TestClient):
+    """Test create, read, list, update and delete through the async endpoints."""
+    data = {"sku": "ASYNC-001", "name": "Async Product", "price": 12.5}
+    response = async_client.post("/api/v1/products/", json=data)
+    assert response.status_code == 201, response.text
+    product_id = response.json()["id"]
+
+    duplicate = async_client.post("/api/v1/products/", json=data)
+    assert duplicate.status_code == 400, duplicate.text
+
+    detail = async_client.get(f"/api/v1/products/{product_id}")
+    assert detail.status_code == 200, detail.text
+    assert detail.json()["sku"] == "ASYNC-001"
+
+    listing = async_client.get("/api/v1/products/", params={"cursor": "", "include_total": True})
+    assert [product["id"] for product in listing.json()["items"]] == [product_id]
+    assert listing.json()["total"] == 1
+
+    lookup = async_client.post("/api/v1/products/lookup", json={"ids": [product_id], "skus": ["MISSING"]})
+    assert list(lookup.json()["by_id"]) == [str(product_id)]
+    assert lookup.json()["missing_skus"] == ["MISSING"]
+
+    etag = detail.headers["etag"]
+    assert async_client.get(f"/api/v1/products/{product_id}", headers={"If-None-Match": etag}).status_code == 304
+    updated = async_client.put(f"/api/v1/products/{product_id}", json={"price": 15.0}, headers={"If-Match": etag})
+    assert updated.json()["price"] == 15.0
+    stale = async_client.put(f"/api/v1/products/{product_id}", json={"price": 16.0}, headers={"If-Match": etag})
+    assert stale.status_code == 412, stale.text
+
+    assert async_client.delete(f"/api/v1/products/{product_id}").status_code == 204
+    listing = async_client.get("/api/v1/products/")
+    assert listing.json() == []
+
+
+def test_async_router_leaves_other_routes_to_sync(async_client: TestClient):
+    """Test that endpoints without an async version are still served by the sync router."""
+    async_client.post("/api/v1/products/", json={"sku": "ASYNC-EXPORT", "name": "Exported", "price": 1.0})
+
+    response = async_client.get("/api/v1/products/export")
+    assert response.status_code == 200, response.text
+    assert "ASYNC-EXPORT" in response.text
@@ -0,0 +1,50 @@
+# tests/test_api/test_shipping.py
+import pytest
+from fastapi.testclient import TestClient
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.models.product import Product
+
+
+def test_quote_orders(client: TestClient, db: Session, test_product: Product):
+    """Test packing and rating a batch of orders, including one with an unknown product."""
+    response = client.post("/api/v1/products/bulk", json=[{
+        "sku": "SHIP-BIG", "name": "Sofa", "price": 500, "weight": 12,
+        "dimensions": '{"length": 100, "width": 50, "height": 50}',
+    }])
+    assert response.status_code == 200, response.text
+    big = db.query(Product).filter(Product.sku == "SHIP-BIG").one()
+    assert (big.length, big.width, big.height) == (100.0, 50.0, 50.0)
+
+    response = client.post("/api/v1/shipping/quotes", json=[
+        {"reference": "A", "lines": [{"product_id": test_product.id, "quantity": 3}]},
+        {"reference": "B", "lines": [{"sku": "SHIP-BIG", "quantity": 1}, {"sku": test_product.sku, "quantity": 1}]},
+        {"reference": "C", "lines": [{"sku": "NOPE", "quantity": 1}]},
+    ])
+    assert response.status_code == 200, response.text
+    body = response.json()
+    assert (body["quoted"], body["failed"]) == (2, 1)
+    a, b, c = body["results"]
+
+    [package] = a["packages"]
+    assert package["carton"] == "S"
+    assert package["items"] == [{"product_id": test_product.id, "quantity": 3}]
+    assert package["weight"] == pytest.approx(3 + settings.SHIPPING_CARTONS[0]["tare"])
+    assert a["cost"] == package["cost"]
+
+    loose = [p for p in b["packages"] if p["carton"] is None]
+    assert len(loose) == 1 and loose[0]["items"] == [{"product_id": big.id, "quantity": 1}]
+    assert loose[0]["dimensional_weight"] == pytest.approx(100 * 50 * 50 / settings.SHIPPING_DIM_DIVISOR)
+    assert len(b["packages"]) == 2
+
+    assert c["error"] == "Line 0: Product not found"
+    assert c["packages"] == [] and c["cost"] is None
+
+
+def test_quote_orders_limit(client: TestClient, monkeypatch):
+    """Test that oversized batches are rejected."""
+    monkeypatch.setattr(settings, "SHIPPING_MAX_ORDERS", 1)
+    order = {"lines": [{"sku": "X", "quantity": 1}]}
+    response = client.post("/api/v1/shipping/quotes", json=[order, order])
+    assert response.status_code == 413
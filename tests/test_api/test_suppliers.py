@@ -0,0 +1,134 @@
+# tests/test_api/test_suppliers.py
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+from sqlalchemy.orm import Session
+
+from app.models.inventory import Warehouse
+from app.models.product import Product
+from app.models.replenishment import ReplenishmentPlan
+from app.models.supplier import SupplierProduct
+from app.schemas.supplier import SupplierReceiptCreate
+from app.services.sourcing import plan_sourcing
+
+
+def create_supplier(client: TestClient, code: str, **fields) -> dict:
+    response = client.post("/api/v1/suppliers/", json={"code": code, "name": f"Supplier {code}", **fields})
+    assert response.status_code == 201, response.text
+    return response.json()
+
+
+def test_create_supplier(client: TestClient):
+    """Test creating and listing suppliers."""
+    supplier = create_supplier(client, "SUP-1", capacity=500)
+    assert supplier["capacity"] == 500
+
+    duplicate = client.post("/api/v1/suppliers/", json={"code": "SUP-1", "name": "Again"})
+    assert duplicate.status_code == 400
+    assert [s["code"] for s in client.get("/api/v1/suppliers/").json()] == ["SUP-1"]
+
+
+def test_receipts_update_lead_times(
+    client: TestClient, db: Session, test_product: Product, test_warehouse: Warehouse
+):
+    """Test that receipts add stock and merge into running lead-time statistics."""
+    supplier = create_supplier(client, "SUP-LT")
+    response = client.put(
+        f"/api/v1/suppliers/{supplier['id']}/products/{test_product.id}",
+        json={"unit_cost": 4.0, "quoted_lead_time_days": 10},
+    )
+    assert response.status_code == 200, response.text
+    assert response.json()["lead_time_days"] == 10
+    assert response.json()["lead_time_samples"] == 0
+
+    lead_times = [3, 5, 4, 9, 6]
+    for batch in (lead_times[:2], lead_times[2:]):
+        response = client.post("/api/v1/suppliers/receipts", json=[
+            {"supplier_code": "SUP-LT", "sku": test_product.sku, "warehouse_code": "WH-TEST", "quantity": 10,
+             "ordered_at": "2026-09-01T00:00:00Z", "received_at": f"2026-09-{1 + days:02d}T00:00:00Z"}
+            for days in batch
+        ] + [{"supplier_code": "NOPE", "sku": test_product.sku, "warehouse_code": "WH-TEST", "quantity": 1,
+              "ordered_at": "2026-09-01T00:00:00Z"}])
+        assert response.status_code == 200, response.text
+        assert (response.json()["accepted"], response.json()["failed"]) == (len(batch), 1)
+        assert response.json()["errors"][0]["error"] == "Supplier not found"
+
+    [terms] = client.get(f"/api/v1/suppliers/{supplier['id']}/products").json()
+    assert terms["lead_time_samples"] == 5
+    assert terms["lead_time_days"] == pytest.approx(np.mean(lead_times))
+    assert terms["lead_time_std_days"] == pytest.approx(np.std(lead_times, ddof=1))
+    assert terms["unit_cost"] == 4.0
+
+    detail = client.get(f"/api/v1/products/{test_product.id}").json()
+    assert detail["total_inventory"] == 50
+    assert [s["supplier_code"] for s in detail["suppliers"]] == ["SUP-LT"]
+    assert detail["suppliers"][0]["lead_time_samples"] == 5
+
+
+def test_receipt_validation(client: TestClient):
+    """Test that receipts must name everything and arrive after they were ordered."""
+    response = client.post("/api/v1/suppliers/receipts", json=[
+        {"supplier_code": "S", "sku": "P", "warehouse_code": "W", "quantity": 1,
+         "ordered_at": "2026-09-02T00:00:00Z", "received_at": "2026-09-01T00:00:00Z"}
+    ])
+    assert response.status_code == 422
+
+    # Orders placed in the future can't have arrived yet
+    response = client.post("/api/v1/suppliers/receipts", json=[
+        {"supplier_code": "S", "sku": "P", "warehouse_code": "W", "quantity": 1, "ordered_at": "2999-01-01T00:00:00Z"}
+    ])
+    assert response.status_code == 422
+
+    # Offsets are compared in UTC, and timestamps without one are UTC
+    receipt = SupplierReceiptCreate(
+        supplier_code="S", sku="P", warehouse_code="W", quantity=1,
+        ordered_at="2026-09-01T12:00:00+02:00", received_at="2026-09-01T11:00:00",
+    )
+    assert receipt.ordered_at == datetime(2026, 9, 1, 10, tzinfo=timezone.utc)
+    assert receipt.received_at.tzinfo == timezone.utc
+    with pytest.raises(ValidationError):
+        SupplierReceiptCreate(
+            supplier_code="S", sku="P", warehouse_code="W", quantity=1,
+            ordered_at="2026-09-01T12:00:00", received_at="2026-09-01T13:00:00+02:00",
+        )
+
+
+def test_sourcing_run(
+    client: TestClient, db: Session, test_product: Product, test_warehouse: Warehouse
+):
+    """Test that sourcing fills orders by landed cost within supplier capacity."""
+    other = Product(sku="SOURCE-OTHER", name="Other", price=10.0)
+    db.add(other)
+    db.commit()
+    cheap = create_supplier(client, "SUP-CHEAP")
+    dear = create_supplier(client, "SUP-DEAR")
+    for supplier, cost in ((cheap, 1.0), (dear, 2.0)):
+        for product in (test_product, other):
+            client.put(f"/api/v1/suppliers/{supplier['id']}/products/{product.id}", json={"unit_cost": cost})
+    for product, quantity in ((test_product, 70), (other, 50)):
+        db.add(ReplenishmentPlan(
+            product_id=product.id, warehouse_id=test_warehouse.id, demand_rate=1, demand_std=0,
+            lead_time_days=14, safety_stock=0, reorder_point=14, economic_order_quantity=quantity,
+            available=0, order_quantity=quantity, computed_at=datetime.now(timezone.utc),
+        ))
+    db.commit()
+
+    assert client.get("/api/v1/suppliers/sourcing/runs/latest").status_code == 404
+    run = plan_sourcing(db)
+    assert (run.products, run.allocated, run.unallocated, run.solver) == (2, 120, 0, "greedy")
+    latest = client.get("/api/v1/suppliers/sourcing/runs/latest").json()
+    assert (latest["products"], latest["allocated"]) == (2, 120)
+    allocations = client.get(f"/api/v1/suppliers/{cheap['id']}/allocations").json()
+    assert [(a["product_id"], a["quantity"]) for a in allocations] == [(test_product.id, 70), (other.id, 50)]
+
+    # Capping the cheap supplier moves the overflow to the dear one
+    db.get(SupplierProduct, (cheap["id"], other.id)).supplier.capacity = 100
+    db.commit()
+    run = plan_sourcing(db)
+    assert (run.allocated, run.solver) == (120, "highs")
+    cheap_units = sum(a["quantity"] for a in client.get(f"/api/v1/suppliers/{cheap['id']}/allocations").json())
+    dear_units = sum(a["quantity"] for a in client.get(f"/api/v1/suppliers/{dear['id']}/allocations").json())
+    assert (cheap_units, dear_units) == (100, 20)
@@ -0,0 +1,45 @@
+# tests/test_cache.py
+import sys
+import time
+
+from app.cache import LocalCache
+
+
+def test_local_cache_evicts_least_recently_used():
+    """Test that the byte budget evicts the least recently used entry."""
+    payload = b"x" * 100
+    cache = LocalCache(max_bytes=sys.getsizeof(payload) * 2, ttl=60)
+    cache.set(1, payload)
+    cache.set(2, payload)
+    cache.get(1)  # 2 is now least recently used
+    cache.set(3, payload)
+
+    assert cache.get(2) is None
+    assert cache.get(1) == payload
+    assert cache.get(3) == payload
+    stats = cache.stats()
+    assert stats["evictions"] == 1
+    assert stats["entries"] == 2
+    assert stats["bytes"] <= stats["max_bytes"]
+
+
+def test_local_cache_expires_entries(monkeypatch):
+    """Test that entries are dropped once their TTL has passed."""
+    cache = LocalCache(max_bytes=10_000, ttl=5)
+    cache.set(1, b"{}")
+    now = time.monotonic()
+    monkeypatch.setattr(time, "monotonic", lambda: now + 10)
+
+    assert cache.get(1) is None
+    assert cache.stats()["expirations"] == 1
+
+
+def test_local_cache_sku_alias():
+    """Test lookups and eviction through the SKU alias."""
+    cache = LocalCache(max_bytes=10_000, ttl=60)
+    cache.set(7, b'{"id": 7}', alias="SKU-7")
+
+    assert cache.get_by_alias("SKU-7") == b'{"id": 7}'
+    cache.evict([7])
+    assert cache.get_by_alias("SKU-7") is None
+    assert cache.stats()["bytes"] == 0
@@ -0,0 +1,58 @@
+# tests/test_conditional.py
+from datetime import datetime, timezone
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.conditional import check_if_match, detail_validators, etag_for, not_modified, version_etag
+
+
+def make_request(**headers) -> Request:
+    raw = [(name.replace("_", "-").lower().encode(), value.encode()) for name, value in headers.items()]
+    return Request({"type": "http", "headers": raw})
+
+
+def test_etag_for_is_stable():
+    """Test that equal bodies get equal strong tags, whatever their type."""
+    assert etag_for('{"id":1}') == etag_for(b'{"id":1}')
+    assert etag_for('{"id":1}') != etag_for('{"id":2}')
+    assert etag_for("x").startswith('"')
+
+
+def test_not_modified_prefers_entity_tags():
+    """Test that If-None-Match wins over If-Modified-Since."""
+    etag = etag_for("body")
+    modified = datetime(2023, 5, 1, 12, 0, 0, 500000, tzinfo=timezone.utc)
+    since = "Mon, 01 May 2023 12:00:00 GMT"
+
+    assert not_modified(make_request(if_none_match=f"{etag}, \"other\""), etag)
+    assert not_modified(make_request(if_none_match="*"), etag)
+    assert not_modified(make_request(if_none_match=f'W/{etag[:-1]}-gzip"'), etag)
+    assert not not_modified(make_request(if_none_match='"other"', if_modified_since=since), etag, modified)
+    assert not_modified(make_request(if_modified_since=since), etag, modified)
+    assert not not_modified(make_request(if_modified_since="Mon, 01 May 2023 11:59:59 GMT"), etag, modified)
+    assert not not_modified(make_request(if_modified_since="yesterday"), etag, modified)
+
+
+def test_detail_validators():
+    """Test reading the ETag and Last-Modified from a serialized product detail."""
+    body = b'{"id":7,"change_seq":3,"created_at":"2023-05-01T12:00:00","updated_at":null,"total_inventory":5}'
+    etag, last_modified = detail_validators(body)
+    assert etag.startswith('"7.3.')
+    assert last_modified == datetime(2023, 5, 1, 12, 0, tzinfo=timezone.utc)
+    # The same row version with different stock is a different representation
+    assert detail_validators(body.replace(b":5}", b":4}"))[0] != etag
+    assert detail_validators(
+        '{"id":7,"change_seq":4,"created_at":"2023-05-01T12:00:00+00:00","updated_at":"2023-05-02T08:30:00+02:00",'
+        '"last_modified":"2023-05-03T00:00:00+00:00"}'
+    )[1] == datetime(2023, 5, 3, tzinfo=timezone.utc)
+
+
+def test_check_if_match_compares_row_version():
+    """Test that If-Match accepts detail tags of the current row version only."""
+    check_if_match(make_request(if_match='"7.3.0123456789abcdef"'), version_etag(7, 3))
+    check_if_match(make_request(if_match='"7.3"'), version_etag(7, 3))
+    with pytest.raises(HTTPException) as exc:
+        check_if_match(make_request(if_match='"7.2.0123456789abcdef"'), version_etag(7, 3))
+    assert exc.value.status_code == 412
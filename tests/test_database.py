@@ -0,0 +1,46 @@
+# tests/test_database.py
+import pytest
+from sqlalchemy import create_engine, text
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+
+from app.config import settings
+from app.database import InstrumentedQueuePool, pool_stats
+
+
+def test_instrumented_pool_records_checkouts(tmp_path):
+    """Test that checkouts, waits and timeouts show up in the pool stats."""
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'pool.db'}",
+        poolclass=InstrumentedQueuePool,
+        pool_size=1,
+        max_overflow=0,
+        pool_timeout=0.01,
+    )
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+        stats = pool_stats(engine.pool)
+        assert stats["checked_out"] == 1
+        assert stats["overflow"] == 0
+
+        with pytest.raises(PoolTimeoutError):
+            engine.connect()
+
+    stats = pool_stats(engine.pool)
+    assert stats["checked_out"] == 0
+    assert stats["timeouts"] == 1
+    assert stats["wait_seconds"]["count"] == 2
+    assert stats["wait_seconds"]["buckets"]["le_inf"] == 2
+    engine.dispose()
+
+
+def test_pool_stats_endpoint(client, monkeypatch):
+    """Test that the internal endpoint reports the application pool, to token holders only."""
+    assert client.get("/api/v1/internal/pool").status_code == 404
+    monkeypatch.setattr(settings, "INTERNAL_API_TOKEN", "secret")
+    assert client.get("/api/v1/internal/pool").status_code == 403
+    assert client.get("/api/v1/internal/pool", headers={"X-Internal-Token": "wrong"}).status_code == 403
+
+    response = client.get("/api/v1/internal/pool", headers={"X-Internal-Token": "secret"})
+
+    assert response.status_code == 200, response.text
+    assert response.json()["sync"]["pool_class"] == "InstrumentedQueuePool"
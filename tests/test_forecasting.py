@@ -0,0 +1,117 @@
+# tests/test_forecasting.py
+from datetime import date, datetime, timedelta
+
+import numpy as np
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+
+from app.models.inventory import StockMovement, Warehouse
+from app.models.product import Product
+from app.services.forecasting import (
+    DemandHistory,
+    croston,
+    demand_changed_since,
+    forecast,
+    holt_winters,
+    load_demand_history,
+    refresh_forecasts,
+    ses,
+)
+
+
+def test_ses_constant_demand():
+    """Test that SES forecasts a constant series at its level."""
+    rate, alpha = ses(np.full((3, 30), 4.0))
+    assert np.allclose(rate, 4.0)
+    assert alpha.shape == (3,)
+
+
+def test_ses_picks_alpha_per_sku():
+    """Test that a shifting series prefers a faster alpha than a noisy one."""
+    rng = np.random.default_rng(0)
+    shifted = np.r_[np.full(50, 2.0), np.full(50, 10.0)]
+    noisy = 5 + rng.normal(0, 2, 100)
+    rate, alpha = ses(np.vstack([shifted, noisy]))
+    assert alpha[0] > alpha[1]
+    assert rate[0] == pytest.approx(10.0, abs=0.1)
+
+
+def test_croston_intermittent_demand():
+    """Test that Croston estimates size over interval, bias corrected."""
+    demand = np.zeros((2, 60))
+    demand[0, ::4] = 8.0  # 8 units every 4 days
+    rate = croston(demand, alpha=0.1)
+    assert rate[0] == pytest.approx(2.0 * 0.95, rel=0.05)
+    assert rate[1] == 0.0
+
+
+def test_holt_winters_weekly_pattern():
+    """Test that Holt-Winters picks up a weekly pattern."""
+    week = np.array([1.0, 1.0, 1.0, 1.0, 1.0, 10.0, 10.0])
+    fitted = holt_winters(np.tile(week, 12)[None, :], horizon=7, period=7, workers=1)
+    assert fitted.shape == (1, 7)
+    assert np.allclose(fitted[0], week, atol=1.0)
+
+
+def test_forecast_auto_methods():
+    """Test that auto picks a method per SKU by demand pattern and history."""
+    demand = np.zeros((3, 120))
+    demand[0] = 5.0
+    demand[1, ::7] = 3.0
+    demand[2, -20:] = 5.0  # Steady but new
+    history = DemandHistory(product_ids=np.array([1, 2, 3]), start=date(2026, 1, 1), demand=demand)
+
+    result = forecast(history, horizon=14, workers=1)
+
+    assert list(result.methods) == ["holt_winters", "croston", "ses"]
+    assert result.daily.shape == (3, 14)
+    assert result.start == date(2026, 1, 1) + timedelta(days=120)
+    assert np.allclose(result.daily[0], 5.0, atol=0.1)
+    assert np.allclose(result.daily[2], 5.0, atol=0.5)
+    with pytest.raises(ValueError):
+        forecast(history, method="arima")
+
+
+def test_load_demand_history(db: Session, test_product: Product, test_warehouse: Warehouse):
+    """Test that shipments load as daily demand, zero filled."""
+    end = date(2026, 3, 1)
+    db.execute(insert(StockMovement), [
+        {"product_id": test_product.id, "warehouse_id": test_warehouse.id, "quantity": quantity,
+         "movement_type": movement_type, "occurred_at": datetime(2026, 2, day, hour)}
+        for day, hour, quantity, movement_type in [
+            (27, 9, -2, "shipment"),
+            (27, 15, -3, "shipment"),
+            (28, 9, 50, "receipt"),
+            (28, 10, -1, "shipment"),
+            (1, 9, -7, "shipment"),  # Outside the window
+        ]
+    ])
+    db.flush()
+
+    history = load_demand_history(db, days=3, end=end)
+
+    assert history.start == date(2026, 2, 26)
+    assert list(history.product_ids) == [test_product.id]
+    assert history.demand.tolist() == [[0.0, 5.0, 1.0]]
+    unknown = load_demand_history(db, product_ids=[test_product.id + 1000], days=3, end=end)
+    assert unknown.demand.tolist() == [[0.0, 0.0, 0.0]]
+
+
+def test_demand_changed_since_late_commit(db: Session, test_product: Product, test_warehouse: Warehouse):
+    """Test that a movement with a lower id than the ledger's latest, committed after a refresh, is picked up."""
+    def ship(movement_id: int):
+        db.execute(insert(StockMovement), [{
+            "id": movement_id, "product_id": test_product.id, "warehouse_id": test_warehouse.id,
+            "quantity": -1, "movement_type": "shipment",
+            "occurred_at": datetime.combine(date.today() - timedelta(days=1), datetime.min.time()),
+        }])
+        db.flush()
+
+    ship(100)
+    run = refresh_forecasts(db, workers=1)
+    assert len(demand_changed_since(db, run, date.today())) == 0
+
+    # Handed its id before 100 but committed only now
+    ship(50)
+    assert demand_changed_since(db, run, date.today()).tolist() == [test_product.id]
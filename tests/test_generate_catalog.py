@@ -0,0 +1,65 @@
+# tests/test_generate_catalog.py
+import csv
+import io
+
+import numpy as np
+import pytest
+
+from scripts.generate_catalog import PAD, _fixed, _integers, generate_catalog, render_products, sku_codes
+from scripts.seed_products import COLUMNS, product_row
+
+HEADER = "sku,name,description,price,weight,length,width,height,is_active\n"
+
+
+def fields(matrix: np.ndarray) -> list:
+    """The rows of a byte matrix as strings, without padding."""
+    return [bytes(row[row != PAD]).decode() for row in matrix]
+
+
+def test_integers():
+    """Test that integers are right aligned, with leading zeros only up to min_digits."""
+    values = np.array([0, 7, 123, 9999])
+    assert fields(_integers(values, 4)) == ["0", "7", "123", "9999"]
+    assert fields(_integers(values, 4, min_digits=3)) == ["000", "007", "123", "9999"]
+    assert fields(_integers(np.array([], dtype=np.int64), 4)) == []
+    with pytest.raises(ValueError):
+        _integers(np.array([1, 10_000]), 4)
+    with pytest.raises(ValueError):
+        _integers(np.array([-1]), 4)
+
+
+def test_fixed():
+    """Test that scaled integers are written with a fixed number of decimals."""
+    assert fields(_fixed(np.array([5, 1234, 999_999]), 4, 2)) == ["0.05", "12.34", "9999.99"]
+    assert fields(_fixed(np.array([1500]), 4, 3)) == ["1.500"]
+
+
+def test_render_products_round_trip():
+    """Test that rendered rows parse as CSV and load as the generated products."""
+    catalog = generate_catalog(np.random.default_rng(7), 500)
+    text = HEADER + render_products(catalog, 0, 500).decode()
+
+    records = list(csv.DictReader(io.StringIO(text)))
+    assert len(records) == 500
+    assert all(None not in record for record in records)  # No row has extra fields
+    rows = [dict(zip(COLUMNS, product_row(record))) for record in records]
+
+    assert [row["sku"] for row in rows] == sku_codes(catalog, np.arange(500))
+    assert np.allclose([row["price"] for row in rows], catalog.price_cents / 100)
+    assert np.allclose([row["weight"] for row in rows], catalog.weight_grams / 1000)
+    assert [row["is_active"] for row in rows] == catalog.active.tolist()
+    assert [row["length"] is not None for row in rows] == catalog.has_dims.tolist()
+    with_dims = catalog.has_dims
+    lengths = [row["length"] for row in rows if row["length"] is not None]
+    assert np.allclose(lengths, catalog.dims_mm[with_dims, 0] / 10)
+    assert [bool(row["description"]) for row in rows] == (catalog.description >= 0).tolist()
+
+
+def test_render_products_deterministic():
+    """Test that a seed always renders the same bytes, however the rows are chunked."""
+    first = generate_catalog(np.random.default_rng(42), 300)
+    second = generate_catalog(np.random.default_rng(42), 300)
+    whole = render_products(first, 0, 300)
+    assert render_products(second, 0, 300) == whole
+    assert render_products(first, 0, 128) + render_products(first, 128, 300) == whole
+    assert render_products(generate_catalog(np.random.default_rng(43), 300), 0, 300) != whole
@@ -0,0 +1,114 @@
+# tests/test_middleware.py
+import gzip
+
+import pytest
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, Response, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.middleware import CompressionMiddleware, brotli, decoded_etag, encoded_etag, negotiate_encoding
+
+BODY = "supply chain " * 500
+
+
+@pytest.fixture(scope="module")
+def compressed_client() -> TestClient:
+    test_app = FastAPI()
+    test_app.add_middleware(CompressionMiddleware, minimum_size=100)
+
+    @test_app.get("/large")
+    def large():
+        return PlainTextResponse(BODY, headers={"ETag": '"abc"'})
+
+    @test_app.get("/unchanged")
+    def unchanged():
+        return Response(status_code=304, headers={"ETag": '"abc"'})
+
+    @test_app.get("/small")
+    def small():
+        return PlainTextResponse("tiny")
+
+    @test_app.get("/stream")
+    def stream():
+        return StreamingResponse(iter([BODY, BODY]), media_type="text/plain")
+
+    return TestClient(test_app)
+
+
+def test_negotiate_encoding():
+    """Test Accept-Encoding negotiation by q-value."""
+    assert negotiate_encoding("") is None
+    assert negotiate_encoding("identity") is None
+    assert negotiate_encoding("gzip, deflate") == "gzip"
+    assert negotiate_encoding("gzip;q=0") is None
+    assert negotiate_encoding("br;q=0.5, gzip;q=0.8") == "gzip"
+    if brotli is not None:
+        assert negotiate_encoding("gzip, br") == "br"
+        assert negotiate_encoding("*") == "br"
+
+
+def test_gzip_response(compressed_client: TestClient):
+    """Test that large responses are gzipped for gzip-only clients."""
+    response = compressed_client.get("/large", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == '"abc-gzip"'
+    assert int(response.headers["content-length"]) < len(BODY)
+    assert response.text == BODY
+
+
+def test_identity_response_varies(compressed_client: TestClient):
+    """Test that responses sent as is still vary on Accept-Encoding and keep their tag."""
+    response = compressed_client.get("/large", headers={"Accept-Encoding": "identity"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.headers["etag"] == '"abc"'
+
+
+def test_not_modified_etag_follows_encoding(compressed_client: TestClient):
+    """Test that a 304 confirming a compressed copy carries that copy's tag."""
+    etag = compressed_client.get("/large", headers={"Accept-Encoding": "gzip"}).headers["etag"]
+    response = compressed_client.get("/unchanged", headers={"Accept-Encoding": "gzip", "If-None-Match": etag})
+    assert response.status_code == 304
+    assert "content-encoding" not in response.headers
+    assert response.headers["etag"] == etag == '"abc-gzip"'
+    assert response.headers["vary"] == "Accept-Encoding"
+
+    # Identity copies, and copies in a coding no longer negotiated, keep the plain tag
+    response = compressed_client.get("/unchanged", headers={"Accept-Encoding": "gzip", "If-None-Match": '"abc"'})
+    assert response.headers["etag"] == '"abc"'
+    response = compressed_client.get("/unchanged", headers={"Accept-Encoding": "identity", "If-None-Match": etag})
+    assert response.headers["etag"] == '"abc"'
+
+
+def test_encoded_etag_round_trip():
+    """Test that coding suffixes are added and stripped again."""
+    assert encoded_etag('"abc"', "br") == '"abc-br"'
+    assert encoded_etag('W/"abc"', "gzip") == 'W/"abc-gzip"'
+    assert decoded_etag('"abc-br"') == decoded_etag('"abc"') == '"abc"'
+    assert decoded_etag('W/"abc-gzip"') == 'W/"abc"'
+
+
+def test_brotli_response(compressed_client: TestClient):
+    """Test that brotli is preferred when the client accepts it."""
+    pytest.importorskip("brotli")
+    response = compressed_client.get("/large", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["content-encoding"] == "br"
+    assert response.text == BODY
+
+
+def test_small_response_not_compressed(compressed_client: TestClient):
+    """Test that bodies under the threshold are sent as is."""
+    response = compressed_client.get("/small", headers={"Accept-Encoding": "gzip"})
+    assert "content-encoding" not in response.headers
+    assert response.headers["vary"] == "Accept-Encoding"
+    assert response.text == "tiny"
+
+
+def test_streaming_response_compressed(compressed_client: TestClient):
+    """Test that streamed bodies are compressed chunk by chunk."""
+    with compressed_client.stream("GET", "/stream", headers={"Accept-Encoding": "gzip"}) as response:
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        raw = b"".join(response.iter_raw())
+    assert gzip.decompress(raw).decode() == BODY * 2
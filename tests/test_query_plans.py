@@ -0,0 +1,47 @@
+# tests/test_query_plans.py
+import pytest
+from sqlalchemy import insert, text
+from sqlalchemy.orm import Session
+
+from app.api.endpoints.products import ProductListParams, products_statement
+from app.models.product import Product
+
+LISTINGS = {
+    "default listing": dict(skip=0, limit=100, name=None, is_active=True, cursor=None, order_by="id", search=None),
+    "id keyset": dict(skip=0, limit=100, name=None, is_active=True, cursor="", order_by="id", search=None),
+    "name keyset": dict(skip=0, limit=100, name=None, is_active=True, cursor="", order_by="name", search=None),
+    "inactive listing": dict(skip=0, limit=100, name=None, is_active=False, cursor=None, order_by="id", search=None),
+}
+
+
+def explain(db: Session, params: dict) -> str:
+    bind = db.get_bind()
+    sql = str(products_statement(ProductListParams(**params)).compile(bind, compile_kwargs={"literal_binds": True}))
+    if bind.dialect.name == "postgresql":
+        # Tiny test tables make a seq scan cheapest; we want to know an index *can* serve the query
+        db.execute(text("SET LOCAL enable_seqscan = off"))
+        return "\n".join(row[0] for row in db.execute(text(f"EXPLAIN {sql}")))
+    return "\n".join(row[-1] for row in db.execute(text(f"EXPLAIN QUERY PLAN {sql}")))
+
+
+@pytest.fixture(scope="function")
+def analyzed_catalog(db: Session):
+    """A catalog with planner statistics, mostly active like production."""
+    db.execute(insert(Product), [
+        {"sku": f"PLAN-{i:04d}", "name": f"Plan Product {i:04d}", "price": 1.0, "is_active": i % 10 != 0}
+        for i in range(200)
+    ])
+    db.execute(text("ANALYZE products" if db.get_bind().dialect.name == "postgresql" else "ANALYZE"))
+
+
+@pytest.mark.parametrize("listing", LISTINGS)
+def test_listing_queries_walk_an_index(db: Session, analyzed_catalog, listing: str):
+    """Test that the product listing queries are served in order by an index."""
+    plan = explain(db, LISTINGS[listing])
+
+    if db.get_bind().dialect.name == "postgresql":
+        assert "Seq Scan" not in plan, plan
+        assert "Index" in plan, plan
+    else:
+        # SQLite scans its rowid b-tree for id order; what matters is that no sort is needed
+        assert "TEMP B-TREE" not in plan, plan
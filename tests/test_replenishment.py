@@ -0,0 +1,44 @@
+# tests/test_replenishment.py
+import numpy as np
+import pytest
+
+from app.services.replenishment import PlanningInputs, plan_replenishment
+
+
+def inputs(**columns) -> PlanningInputs:
+    size = len(next(iter(columns.values())))
+    defaults = {
+        "product_ids": np.arange(size), "warehouse_ids": np.ones(size, dtype=np.int64),
+        "price": np.full(size, 20.0), "available": np.zeros(size, dtype=np.int64),
+        "demand_rate": np.zeros(size), "demand_std": np.zeros(size),
+    }
+    defaults.update({name: np.asarray(values) for name, values in columns.items()})
+    return PlanningInputs(**defaults)
+
+
+def test_plan_replenishment():
+    """Test safety stock, reorder point, EOQ and order quantity per pair."""
+    plan = plan_replenishment(
+        inputs(demand_rate=[10.0, 10.0, 0.0], demand_std=[3.0, 3.0, 0.0], available=[100, 500, 0]),
+        lead_time_days=14, lead_time_std_days=0, service_level=0.95,
+    )
+
+    safety_stock = 1.6449 * 3.0 * np.sqrt(14)
+    assert plan.safety_stock[0] == pytest.approx(safety_stock, rel=1e-3)
+    assert plan.reorder_point[0] == pytest.approx(140 + safety_stock, rel=1e-3)
+    assert plan.economic_order_quantity[0] == pytest.approx(np.sqrt(2 * 3650 * 50 / 5.0))
+    assert plan.order_quantity.tolist() == [
+        int(np.ceil(plan.economic_order_quantity[0] + plan.reorder_point[0] - 100)),
+        0,  # Above the reorder point
+        0,  # No demand
+    ]
+
+
+def test_plan_replenishment_lead_time_variability():
+    """Test that per-pair lead time variability raises safety stock."""
+    plan = plan_replenishment(
+        inputs(demand_rate=[10.0, 10.0], demand_std=[0.0, 0.0]),
+        lead_time_days=np.array([7.0, 7.0]), lead_time_std_days=np.array([0.0, 2.0]), service_level=0.95,
+    )
+    assert plan.safety_stock[0] == 0
+    assert plan.safety_stock[1] == pytest.approx(1.6449 * 10 * 2, rel=1e-3)
@@ -0,0 +1,76 @@
+# tests/test_seed_products.py
+import pytest
+from sqlalchemy import Column, MetaData, Table
+from sqlalchemy.dialects import postgresql
+
+from app.models.product import Product
+from scripts.seed_products import COLUMNS, batches, merge_statement, product_row
+
+
+def stats():
+    return {"read": 0, "invalid": 0, "written": 0}
+
+
+def test_product_row_from_csv_columns():
+    """Test that CSV rows can give dimensions as length, width and height columns."""
+    row = dict(zip(COLUMNS, product_row({
+        "sku": " CSV-1 ", "name": "Crate", "description": "", "price": "12.50", "weight": "",
+        "length": "10", "width": "20", "height": "0.5", "is_active": "no",
+    })))
+    assert (row["sku"], row["price"], row["weight"], row["description"]) == ("CSV-1", 12.5, None, None)
+    assert row["dimensions"] == '{"length":10.0,"width":20.0,"height":0.5}'
+    assert (row["length"], row["width"], row["height"], row["volume"]) == (10.0, 20.0, 0.5, 100.0)
+    assert row["is_active"] is False
+
+    # A dimensions JSON takes precedence, and no dimensions at all is fine
+    row = dict(zip(COLUMNS, product_row({
+        "sku": "N", "name": "Box", "price": 1, "dimensions": '{"length": 1, "width": 2, "height": 3}', "length": "9",
+    })))
+    assert (row["length"], row["volume"], row["is_active"]) == (1.0, 6.0, True)
+    row = dict(zip(COLUMNS, product_row({"sku": "N", "name": "Box", "price": 1, "length": "9"})))
+    assert row["dimensions"] is None and row["volume"] is None
+
+
+@pytest.mark.parametrize("record", [
+    {"name": "No SKU", "price": 1},
+    {"sku": "S", "price": 1},
+    {"sku": "S", "name": "Free", "price": 0},
+    {"sku": "S", "name": "Unpriced"},
+    {"sku": "S", "name": "Flat", "price": 1, "length": "1", "width": "1", "height": "0"},
+    {"sku": "S", "name": "Maybe", "price": 1, "is_active": "sometimes"},
+])
+def test_product_row_rejects_invalid(record):
+    """Test that rows a product create would reject are rejected."""
+    with pytest.raises((TypeError, ValueError)):
+        product_row(record)
+
+
+def test_batches_dedupe_and_skip_invalid(capsys):
+    """Test that batches keep the last row per SKU and report invalid records."""
+    records = [
+        ("a.csv", 2, {"sku": "A", "name": "First", "price": "1"}),
+        ("a.csv", 3, {"sku": "B", "name": "Bad", "price": "-1"}),
+        ("a.csv", 4, {"sku": "A", "name": "Second", "price": "2"}),
+        ("b.ndjson", 1, ValueError("unexpected character")),
+        ("b.ndjson", 2, ["not", "an", "object"]),
+        ("b.ndjson", 3, {"sku": "C", "name": "Third", "price": 3}),
+        ("b.ndjson", 4, {"sku": "D", "name": "Fourth", "price": 4}),
+    ]
+    counts = stats()
+    loaded = [[(row[0], row[1]) for row in batch] for batch in batches(records, 2, counts)]
+
+    assert loaded == [[("A", "Second"), ("C", "Third")], [("D", "Fourth")]]
+    assert (counts["read"], counts["invalid"]) == (7, 3)
+    assert capsys.readouterr().err.splitlines() == [
+        "a.csv:3: price must be greater than 0",
+        "b.ndjson:1: Invalid JSON: unexpected character",
+        "b.ndjson:2: Expected an object",
+    ]
+
+
+def test_merge_statement_returns_ids():
+    """Test that the merge returns the ids of the rows it writes."""
+    staging = Table("product_staging", MetaData(), *(Column(name, Product.__table__.c[name].type) for name in COLUMNS))
+    sql = str(merge_statement(staging).compile(dialect=postgresql.dialect()))
+    assert "ON CONFLICT (sku) DO UPDATE" in sql
+    assert sql.rstrip().endswith("RETURNING products.id")
@@ -0,0 +1,79 @@
+# tests/test_shipping.py
+import numpy as np
+import pytest
+
+from app.config import settings
+from app.dimensions import parse_dimensions
+from app.models.product import Product
+from app.services.shipping import load_cartons, measure, pack_order, rate
+
+CARTONS = [
+    {"name": "S", "length": 20, "width": 20, "height": 10, "max_weight": 5},
+    {"name": "L", "length": 50, "width": 40, "height": 30, "max_weight": 20},
+]
+
+
+def pack(dims, weight, lines):
+    cartons = load_cartons(CARTONS)
+    dims = np.array(dims, dtype=np.float64)
+    m = measure(np.arange(len(dims)), dims[:, 0], dims[:, 1], dims[:, 2], np.array(weight, dtype=np.float64), cartons)
+    return cartons, pack_order(lines, m.volume.tolist(), m.weight.tolist(), m.fits.tolist(), cartons)
+
+
+def test_parse_dimensions():
+    """Test that dimension strings become numbers, and anything unreadable becomes None."""
+    assert parse_dimensions('{"length": 10, "width": 5.5, "height": 2}') == {
+        "length": 10.0, "width": 5.5, "height": 2.0, "volume": 110.0,
+    }
+    assert parse_dimensions('{"length": 10}') == {"length": 10.0, "width": None, "height": None, "volume": None}
+    assert parse_dimensions('{"length": "ten", "width": true}')["length"] is None
+    empty = {"length": None, "width": None, "height": None, "volume": None}
+    assert parse_dimensions("not json") == empty
+    assert parse_dimensions(None) == empty
+
+
+def test_model_syncs_dimension_columns():
+    """Test that setting dimensions on a product sets the numeric columns."""
+    product = Product(sku="DIM", name="Dim", price=1, dimensions='{"length": 3, "width": 2, "height": 1}')
+    assert (product.length, product.width, product.height, product.volume) == (3.0, 2.0, 1.0, 6.0)
+    product.dimensions = None
+    assert product.length is None and product.volume is None
+
+
+def test_units_fit_in_any_orientation():
+    """Test that a long unit fits a carton it only fits rotated."""
+    cartons, bins = pack([[10, 30, 20]], [1.0], [(0, 1)])
+    [b] = bins
+    assert cartons[b[0]].name == "L"
+    cartons, bins = pack([[10, 18, 19]], [1.0], [(0, 1)])
+    assert cartons[bins[0][0]].name == "S"
+
+
+def test_first_fit_decreasing_fills_and_shrinks_cartons():
+    """Test that units share cartons up to the fill factor and cartons shrink to fit their contents."""
+    # 1000 cm³ units: eight fill more than S takes (4000 cm³ * 0.8), three fit it
+    cartons, bins = pack([[10, 10, 10]], [0.1], [(0, 8)])
+    assert [(cartons[b[0]].name, b[5]) for b in bins] == [("L", {0: 8})]
+    cartons, bins = pack([[10, 10, 10]], [0.1], [(0, 3)])
+    assert [(cartons[b[0]].name, b[5]) for b in bins] == [("S", {0: 3})]
+    # Weight limits split cartons too
+    cartons, bins = pack([[10, 10, 10]], [4.0], [(0, 6)])
+    assert [b[5][0] for b in bins] == [5, 1]
+
+
+def test_oversize_and_unmeasured_units():
+    """Test that units too large for every carton ship as is, and units without dimensions pack on weight."""
+    cartons, bins = pack([[100, 10, 10], [np.nan, np.nan, np.nan]], [2.0, 1.0], [(0, 2), (1, 3)])
+    loose = [b for b in bins if b[0] < 0]
+    assert len(loose) == 2 and all(b[5] == {0: 1} for b in loose)
+    [boxed] = [b for b in bins if b[0] >= 0]
+    assert cartons[boxed[0]].name == "S" and boxed[5] == {1: 3}
+
+
+def test_rate_bills_greater_of_actual_and_dimensional_weight():
+    """Test dimensional weight pricing."""
+    dims = np.array([[50.0, 40.0, 30.0], [10.0, 10.0, 10.0]])
+    dimensional, billable, cost = rate(dims, np.array([2.0, 3.0]))
+    assert dimensional.tolist() == pytest.approx([60000 / settings.SHIPPING_DIM_DIVISOR, 1000 / settings.SHIPPING_DIM_DIVISOR])
+    assert billable.tolist() == pytest.approx([dimensional[0], 3.0])
+    assert cost.tolist() == pytest.approx(settings.SHIPPING_BASE_RATE + settings.SHIPPING_RATE_PER_KG * billable)
@@ -0,0 +1,46 @@
+# tests/test_sourcing.py
+import numpy as np
+
+from app.services.sourcing import allocate_greedy, allocate_lp
+
+
+def test_allocate_greedy_fills_cheapest_first():
+    """Test that each product is filled from its cheapest links, within capacity."""
+    demand = np.array([100.0, 30.0, 50.0])
+    link_product = np.array([0, 0, 0, 1, 1, 2])
+    cost = np.array([3.0, 1.0, 2.0, 5.0, 4.0, 1.0])
+    capacity = np.array([np.inf, 40.0, 30.0, np.inf, np.inf, 20.0])
+
+    allocation = allocate_greedy(demand, link_product, cost, capacity)
+
+    assert allocation.tolist() == [30.0, 40.0, 30.0, 0.0, 30.0, 20.0]
+
+
+def test_allocate_lp_matches_greedy_without_supplier_capacity():
+    """Test that the LP and the greedy fill agree when products are independent."""
+    rng = np.random.default_rng(7)
+    demand = rng.integers(1, 100, size=50).astype(float)
+    link_product = np.repeat(np.arange(50), 3)
+    link_supplier = np.tile(np.arange(3), 50)
+    cost = rng.uniform(1, 10, size=150)
+    capacity = rng.integers(10, 60, size=150).astype(float)
+
+    greedy = allocate_greedy(demand, link_product, cost, capacity)
+    lp = allocate_lp(demand, link_product, link_supplier, cost, capacity, np.full(3, np.inf))
+
+    assert np.isclose((greedy * cost).sum(), (lp * cost).sum())
+    assert np.allclose(np.bincount(link_product, weights=lp), np.bincount(link_product, weights=greedy))
+
+
+def test_allocate_lp_supplier_capacity():
+    """Test that a supplier-wide capacity shifts volume to the next cheapest supplier."""
+    demand = np.array([60.0, 60.0])
+    link_product = np.array([0, 0, 1, 1])
+    link_supplier = np.array([0, 1, 0, 1])
+    # Supplier 0 is cheaper for both, but product 1 saves more by using it
+    cost = np.array([1.0, 2.0, 1.0, 5.0])
+    capacity = np.full(4, np.inf)
+
+    allocation = allocate_lp(demand, link_product, link_supplier, cost, capacity, np.array([80.0, np.inf]))
+
+    assert allocation.tolist() == [20.0, 40.0, 60.0, 0.0]